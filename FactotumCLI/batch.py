@@ -0,0 +1,226 @@
+"""
+Run many tasks from a job file inside one process.
+
+A job file lists tasks with their arguments, as JSON lines or YAML (a list,
+or a mapping with a "jobs" list):
+
+    {"task": "download-webpage", "url": "https://example.com", "output": "example.html"}
+    {"name": "org", "task": "organize-files", "args": {"directory": "downloads"}, "after": ["dl"]}
+
+Arguments can be given inline or under "args". Jobs without "after" are
+independent and run concurrently, up to the --jobs limit; a job with "after"
+waits for the named jobs and is skipped if one of them failed. Everything
+runs in the same interpreter, so tools are imported once, HTTP sessions and
+caches are shared, and tools that accept a progress display share one.
+"""
+import json
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from rich.console import Console
+
+from FactotumCLI.logger import log_task
+from FactotumCLI.registry import filter_kwargs
+
+console = Console()
+
+# Keys of a job entry that are not tool arguments
+JOB_KEYS = {"task", "name", "args", "after"}
+
+
+class JobFileError(ValueError):
+    pass
+
+
+def _parse(path):
+    text = Path(path).read_text(encoding="utf-8")
+    if Path(path).suffix.lower() in {".yaml", ".yml"}:
+        try:
+            import yaml
+        except ImportError:
+            raise JobFileError("YAML job files need PyYAML: pip install factotumcli[yaml]") from None
+        data = yaml.safe_load(text) or []
+        return data.get("jobs", []) if isinstance(data, dict) else data
+    if Path(path).suffix.lower() == ".json":
+        data = json.loads(text)
+        return data.get("jobs", []) if isinstance(data, dict) else data
+
+    entries = []
+    for number, line in enumerate(text.splitlines(), 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            entries.append(json.loads(line))
+        except ValueError as e:
+            raise JobFileError(f"line {number}: {e}") from None
+    return entries
+
+
+def load_jobs(path, known_tasks):
+    """Read and validate a job file; returns a list of job dicts with unique names."""
+    jobs = []
+    for index, entry in enumerate(_parse(path), 1):
+        if not isinstance(entry, dict) or "task" not in entry:
+            raise JobFileError(f"job {index}: expected an object with a 'task'")
+        task = str(entry["task"]).lower()
+        if task not in known_tasks:
+            raise JobFileError(f"job {index}: unknown task '{task}'")
+        args = dict(entry.get("args") or {})
+        args.update({k: v for k, v in entry.items() if k not in JOB_KEYS})
+        after = entry.get("after") or []
+        jobs.append({
+            "name": str(entry.get("name") or f"{index}:{task}"),
+            "task": task,
+            "args": {k.replace("-", "_"): v for k, v in args.items()},
+            "after": [after] if isinstance(after, str) else list(after),
+        })
+
+    names = [job["name"] for job in jobs]
+    if len(set(names)) != len(names):
+        raise JobFileError("job names must be unique")
+    for job in jobs:
+        missing = [name for name in job["after"] if name not in names]
+        if missing:
+            raise JobFileError(f"job '{job['name']}': unknown dependency {', '.join(missing)}")
+    cycle = _find_cycle(jobs)
+    if cycle:
+        raise JobFileError(f"dependency cycle: {' -> '.join(cycle)}")
+    return jobs
+
+
+def _find_cycle(jobs):
+    """Return the names along one "after" cycle (first name repeated at the end), or None."""
+    after = {job["name"]: job["after"] for job in jobs}
+    state = {}  # name -> "visiting" while on the current path, "done" once cleared
+    for root in after:
+        if root in state:
+            continue
+        path = [root]
+        stack = [iter(after[root])]
+        state[root] = "visiting"
+        while stack:
+            name = next(stack[-1], None)
+            if name is None:
+                state[path.pop()] = "done"
+                stack.pop()
+            elif state.get(name) == "visiting":
+                return path[path.index(name):] + [name]
+            elif name not in state:
+                state[name] = "visiting"
+                path.append(name)
+                stack.append(iter(after[name]))
+    return None
+
+
+def _run_job(job, tool_functions, progress):
+    func = tool_functions[job["task"]]
+    kwargs = filter_kwargs(func, job["args"])
+    ignored = sorted(set(job["args"]) - set(kwargs))
+    if progress is not None and "progress" not in kwargs and "progress" in filter_kwargs(func, {"progress": True}):
+        kwargs["progress"] = progress
+
+    start = time.perf_counter()
+    try:
+        result = func(**kwargs)
+        # Tools print their own errors and signal them with a non-zero return value
+        if isinstance(result, int) and not isinstance(result, bool) and result != 0:
+            return "failed", time.perf_counter() - start, ignored, f"exit code {result}"
+        return "ok", time.perf_counter() - start, ignored, None
+    except Exception as e:
+        log_task(f"Job {job['name']} failed: {traceback.format_exc()}", task=job["task"], job=job["name"])
+        return "failed", time.perf_counter() - start, ignored, f"{type(e).__name__}: {e}"
+
+
+def run_jobs(jobs, tool_functions, limit=4):
+    """
+    Run the jobs, respecting "after" dependencies, with at most `limit` at once.
+
+    Returns a dict of job name -> (status, seconds, ignored args, error).
+    """
+    from rich.progress import BarColumn, MofNCompleteColumn, Progress, SpinnerColumn, TextColumn
+
+    results = {}
+    pending = list(jobs)
+    running = {}
+
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        console=console,
+    ) as progress, ThreadPoolExecutor(max_workers=max(1, int(limit))) as executor:
+        overall = progress.add_task("📋 Jobs", total=len(jobs))
+
+        while pending or running:
+            for job in list(pending):
+                if len(running) >= max(1, int(limit)):
+                    break
+                states = [results.get(name, (None,))[0] for name in job["after"]]
+                if any(state in {"failed", "skipped"} for state in states):
+                    pending.remove(job)
+                    results[job["name"]] = ("skipped", 0.0, [], "a dependency did not succeed")
+                    progress.advance(overall)
+                elif all(state == "ok" for state in states):
+                    pending.remove(job)
+                    future = executor.submit(_run_job, job, tool_functions, progress)
+                    running[future] = job
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = running.pop(future)
+                results[job["name"]] = future.result()
+                status, elapsed = results[job["name"]][:2]
+                icon = "✅" if status == "ok" else "❌"
+                progress.console.print(f"{icon} {job['name']} ({job['task']}) finished in {elapsed:.2f}s")
+                progress.advance(overall)
+    return results
+
+
+def print_results(jobs, results, elapsed):
+    from rich.table import Table
+
+    table = Table(title="📋 Batch results")
+    table.add_column("Job", style="bold")
+    table.add_column("Task")
+    table.add_column("Status")
+    table.add_column("Time", justify="right")
+    table.add_column("Notes", style="dim")
+    styles = {"ok": "green", "failed": "red", "skipped": "yellow"}
+    for job in jobs:
+        status, seconds, ignored, error = results[job["name"]]
+        notes = error or ""
+        if ignored:
+            notes = (notes + "; " if notes else "") + f"ignored: {', '.join(ignored)}"
+        table.add_row(job["name"], job["task"], f"[{styles[status]}]{status}[/{styles[status]}]", f"{seconds:.2f}s", notes)
+    console.print(table)
+
+    counts = {status: sum(result[0] == status for result in results.values()) for status in styles}
+    console.print(
+        f"✅ {counts['ok']} ok, ❌ {counts['failed']} failed, ⏭️ {counts['skipped']} skipped "
+        f"in [bold magenta]{elapsed:.2f}[/bold magenta] seconds"
+    )
+    log_task(f"Batch: {len(jobs)} job(s) in {elapsed:.2f}s", task="batch", duration=round(elapsed, 3), **counts)
+    return counts
+
+
+def run_job_file(path, tool_functions, limit=4):
+    """Load, run and summarize a job file. Returns the number of jobs that did not succeed."""
+    try:
+        jobs = load_jobs(path, tool_functions)
+    except (OSError, ValueError) as e:
+        console.print(f"❌ Could not load job file {path}: {e}", style="bold red")
+        return 1
+    if not jobs:
+        console.print("🤷 The job file has no jobs.", style="bold yellow")
+        return 0
+
+    start = time.perf_counter()
+    results = run_jobs(jobs, tool_functions, limit)
+    counts = print_results(jobs, results, time.perf_counter() - start)
+    return counts["failed"] + counts["skipped"]
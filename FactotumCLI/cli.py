@@ -1,63 +1,133 @@
 import argparse
-import importlib
-import pkgutil
-from pathlib import Path
 from rich.console import Console
-import questionary
-from questionary import Style
 from rich.panel import Panel
 from rich.text import Text
 from rich.progress import Progress, SpinnerColumn, TextColumn
-from FactotumCLI.config import custom_style
+from FactotumCLI import metrics
+from FactotumCLI.registry import LazyToolMap, filter_kwargs, load_manifest
 from collections import defaultdict
 
 __version__ = "0.1.0"
 
 console = Console()
+# Decorations go to stderr, so piped output (passwords, JSON) stays clean
+err_console = Console(stderr=True)
 
-# Dynamic import of all tools
-from . import tools
+# Tools are described by a cached manifest and only imported when dispatched,
+# so `list`, `help` and the interactive menu never load GitPython, requests, ...
+tool_metadata = load_manifest()["tools"]
+tool_functions = LazyToolMap(tool_metadata)
 
-tool_functions = {}
 
-# Discover and import all tool modules
-tool_functions = {}
-tool_metadata = {}  # New: metadata storage
+def print_task_list():
+    console.print("🧩 Available tasks:", style="bold cyan")
+    for func_name, meta in tool_metadata.items():
+        doc = meta["doc"] or "No description available."
+        # Only show the first line of the docstring for brevity
+        short_doc = doc.split('\n')[0]
+        console.print(f"• [bold green]{func_name}[/bold green] — {short_doc}")
 
-for loader, module_name, is_pkg in pkgutil.iter_modules(tools.__path__):
-    module = importlib.import_module(f"{tools.__name__}.{module_name}")
-    category = getattr(module, "CATEGORY", "Other")
-    description = getattr(module, "DESCRIPTION", "No description provided.")
-
-    for attr in dir(module):
-        if not attr.startswith("_") and callable(getattr(module, attr)):
-            cli_name = attr.replace("_", "-")
-            tool_functions[cli_name] = getattr(module, attr)
-            tool_metadata[cli_name] = {
-                "category": category,
-                "description": description
-            }
-
-# Main function to handle command line arguments
-def main():
-    console.print("[bold blue]🔧 FactotumCLI — Your Personal Assistant[/bold blue]")
 
+def build_parser():
     parser = argparse.ArgumentParser(description="FactotumCLI Tasks")
     parser.add_argument("--task", help="Task to perform")
     parser.add_argument("--interactive", action="store_true", help="Launch interactive mode")
     parser.add_argument("--length", type=int, help="Password length")
     parser.add_argument("--specials", type=str, help="Include special characters: y/n")
+    parser.add_argument("--count", type=int, help="Number of passwords to generate")
+    parser.add_argument("--require", type=str, help="Character classes each password must contain, e.g. lower,upper,digit")
+    parser.add_argument("--words", type=int, help="Generate passphrases with this many words")
+    parser.add_argument("--wordlist", type=str, help="Word file for passphrases")
+    parser.add_argument("--separator", type=str, help="Separator between passphrase words")
+    parser.add_argument("--no-log", dest="log", action="store_false", default=None, help="Keep generated passwords out of factotum.log")
     parser.add_argument("--directory", type=str, help="Directory for file operations")
     parser.add_argument("--coin", type=str, help="Crypto coin ID")
     parser.add_argument("--url", type=str, help="URL of the web page")
     parser.add_argument("--output", type=str, help="Output filename")
     parser.add_argument("--tool", type=str, help="Specific tool to show help for")
+    parser.add_argument("--username", type=str, help="GitHub username")
+    parser.add_argument("--token", type=str, help="GitHub Personal Access Token")
+    parser.add_argument("--output-dir", type=str, help="Directory to write results into")
+    parser.add_argument("--jobs", type=int, help="Number of parallel jobs")
+    parser.add_argument("--job-file", type=str, help="Run the tasks listed in this JSON lines/YAML file")
+    parser.add_argument("--mode", type=str, help="Cloner action: clone/pull/both")
+    parser.add_argument("--repos", type=str, help="Repositories to sync: 'all' or comma-separated names")
+    parser.add_argument("--clone-mode", type=str, help="Clone mode: full/shallow/blobless/single-branch")
+    parser.add_argument("--depth", type=int, help="History depth for shallow clones, link depth for mirroring")
+    parser.add_argument("--update-mode", type=str, help="Update mode: pull/fetch")
+    parser.add_argument("--coins", type=str, help="Comma-separated crypto coin IDs")
+    parser.add_argument("--vs-currencies", type=str, help="Comma-separated currencies to price in")
+    parser.add_argument("--format", dest="output_format", type=str, help="Output format: text/table/json")
+    parser.add_argument("--ttl", type=int, help="Seconds a cached result stays fresh")
+    parser.add_argument("--watch", action="store_true", help="Keep running and refresh periodically")
+    parser.add_argument("--interval", type=float, help="Seconds between refreshes in watch mode")
+    parser.add_argument("--days", type=int, help="Days of price history to cover")
+    parser.add_argument("--window", type=int, help="Rolling window in days")
+    parser.add_argument("--no-resume", dest="resume", action="store_false", default=None, help="Restart downloads instead of resuming")
+    parser.add_argument("--checksum", type=str, help="Expected checksum, e.g. sha256:<hex>")
+    parser.add_argument("--url-file", type=str, help="File with one URL per line ('-' for stdin)")
+    parser.add_argument("--per-host", type=int, help="Maximum concurrent downloads per host")
+    parser.add_argument("--rate", type=float, help="Maximum requests per second per host")
+    parser.add_argument("--retries", type=int, help="Retries for failed requests")
+    parser.add_argument("--manifest", type=str, help="Results manifest file (JSON lines)")
+    parser.add_argument("--no-cache", dest="cache", action="store_false", default=None, help="Bypass the local HTTP cache")
+    parser.add_argument("--max-bytes", type=int, help="Stop mirroring after this many bytes")
+    parser.add_argument("--recursive", action="store_true", default=None, help="Include subdirectories")
+    parser.add_argument("--dry-run", action="store_true", default=None, help="Show the plan without changing anything")
+    parser.add_argument("--full-scan", action="store_false", dest="incremental", default=None,
+                        help="Ignore the organizer journal and look at every file")
+    parser.add_argument("--undo", action="store_true", default=None, help="Revert the last organize run")
+    parser.add_argument("--target-dir", help="Where the organizer creates its extension folders")
+    parser.add_argument("--dedup", choices=["report", "hardlink", "quarantine"],
+                        help="What to do with duplicate files before organizing")
+
+    parser.add_argument("--serve", action="store_true", help="Run as a background daemon for factotum-client")
+    parser.add_argument("--socket", type=str, help="Unix socket path of the daemon")
+    parser.add_argument("--profile", nargs="?", const="factotum.prof",
+                        help="Profile the task (all its threads) with cProfile and dump the stats (default: factotum.prof)")
+    parser.add_argument("--metrics", nargs="?", const="-",
+                        help="Emit task metrics as JSON to stderr, or append them to this file")
+    parser.add_argument("--log-file", type=str, help="Log file (default: $FACTOTUM_LOG_FILE or ./factotum.log)")
+    parser.add_argument("--log-format", choices=["text", "json"], help="Log record format")
+    return parser
+
+
+# Main function to handle command line arguments
+def main(argv=None):
+    """Run the CLI on `argv` (default: sys.argv[1:]) and return the exit code."""
+    err_console.print("[bold blue]🔧 FactotumCLI — Your Personal Assistant[/bold blue]")
+
+    parser = build_parser()
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:
+        # argparse exits on --help and on usage errors
+        return e.code or 0
+
+    if args.log_file or args.log_format:
+        from FactotumCLI.logger import configure_logging
+
+        configure_logging(path=args.log_file, fmt=args.log_format)
+
+    if args.serve:
+        from FactotumCLI.daemon import serve
 
-    args = parser.parse_args()
+        return serve(args.socket)
 
     if args.interactive:
-        run_interactive_mode()
-        return
+        run_interactive_mode(metrics_output=args.metrics, profile=args.profile)
+        return 0
+
+    if args.job_file:
+        from FactotumCLI.batch import run_job_file
+
+        with metrics.instrument("batch", args.metrics, args.profile):
+            failed = run_job_file(args.job_file, tool_functions, limit=args.jobs or 4)
+        return 1 if failed else 0
+
+    if not args.task:
+        parser.print_help()
+        return 2
 
     task = args.task.lower()
 
@@ -66,41 +136,40 @@ def main():
         kwargs = vars(args)
         del kwargs['task']  # Remove task name from kwargs
         # Filter kwargs to only those accepted by the function
-        from inspect import signature
-        sig = signature(tool_functions[task])
-        filtered_kwargs = {k: v for k, v in kwargs.items() if k in sig.parameters and v is not None}
+        filtered_kwargs = filter_kwargs(tool_functions[task], kwargs)
+
+        with metrics.instrument(task, args.metrics, args.profile):
+            result = tool_functions[task](**filtered_kwargs)
+        # Tools print their errors and return a non-zero exit code on failure (None means success)
+        return result if isinstance(result, int) and not isinstance(result, bool) else 0
 
-        tool_functions[task](**filtered_kwargs)
-    
     elif task == "list":
-        console.print("🧩 Available tasks:", style="bold cyan")
-        for func_name, func in tool_functions.items():
-            doc = func.__doc__.strip() if func.__doc__ else "No description available."
-            short_doc = doc.split('\n')[0]
-            console.print(f"• [bold green]{func_name}[/bold green] — {short_doc}")
+        print_task_list()
+        return 0
 
     elif task == "help":
         if not args.tool:
             console.print("Please specify a tool with --tool", style="bold red")
-        elif args.tool in tool_functions:
-            func = tool_functions[args.tool]
-            doc = func.__doc__.strip() if func.__doc__ else "No documentation available."
+            return 2
+        elif args.tool in tool_metadata:
+            doc = tool_metadata[args.tool]["doc"] or "No documentation available."
             console.print(f"🧩 [bold cyan]{args.tool}[/bold cyan] documentation:\n")
             console.print(doc)
+            return 0
         else:
             console.print(f"Tool '{args.tool}' not found.", style="bold red")
-
+            return 1
 
     else:
         console.print(f"❌ Unknown task: '{task}'", style="bold red")
-        console.print("🧩 Available tasks:", style="bold cyan")
-        for func_name, func in tool_functions.items():
-            doc = func.__doc__.strip() if func.__doc__ else "No description available."
-            # Only show the first line of the docstring for brevity
-            short_doc = doc.split('\n')[0]
-            console.print(f"• [bold green]{func_name}[/bold green] — {short_doc}")
-
-def run_interactive_mode():
+        print_task_list()
+        return 1
+
+
+def run_interactive_mode(metrics_output=None, profile=None):
+    import questionary
+    from FactotumCLI.config import custom_style
+
     console = Console()
 
     # Build your splash screen text properly
@@ -206,10 +275,14 @@ def run_interactive_mode():
             sig = signature(selected_func)
             filtered_kwargs = {k: v for k, v in kwargs.items() if k in sig.parameters}
 
-            selected_func(**filtered_kwargs)
+            with metrics.instrument(task_choice, metrics_output, profile):
+                result = selected_func(**filtered_kwargs)
 
 
-        console.print("\n✅ [bold green]Task completed successfully![/bold green] 🚀\n")
+        if isinstance(result, int) and not isinstance(result, bool) and result != 0:
+            console.print("\n❌ [bold red]Task failed.[/bold red]\n")
+        else:
+            console.print("\n✅ [bold green]Task completed successfully![/bold green] 🚀\n")
 
         # Ask to run another task
         another = questionary.confirm("Would you like to run another task?", style=custom_style).ask()
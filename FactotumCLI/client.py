@@ -0,0 +1,125 @@
+"""
+Thin client for a running `factotum --serve` daemon.
+
+    factotum-client --task generate-password --length 20
+
+The argv, working directory and environment are forwarded over the daemon's
+Unix socket (`--socket`, else $FACTOTUM_SOCKET, ...) and the output and exit
+code are streamed back, so a call costs a socket round trip instead of an
+interpreter start plus imports. Only the standard library is imported here.
+Interrupting the client (Ctrl+C) interrupts the task in the daemon.
+
+The command runs in-process, like `factotum` would, when no daemon is
+listening or when the daemon answers LOCAL: tasks that prompt, read stdin or
+watch until Ctrl+C need this terminal, and settings the daemon only reads at
+start-up (cache directory, API URLs, ...) may differ from this environment.
+
+Wire format: frames of a 1-byte kind, a 4-byte big-endian length and a
+payload. The client sends one REQUEST frame (JSON); the daemon answers with
+STDOUT/STDERR frames and ends with an EXIT frame holding the exit code, or
+with a single LOCAL frame.
+"""
+import json
+import os
+import re
+import socket
+import struct
+import sys
+
+REQUEST, STDOUT, STDERR, EXIT, LOCAL = b"r", b"o", b"e", b"x", b"l"
+HEADER = struct.Struct(">cI")
+
+# Arguments that certainly need the caller's own terminal or stdin (the daemon checks the rest)
+LOCAL_ONLY = {"--interactive", "--serve", "--watch", "-"}
+ANSI_ESCAPE = re.compile(rb"\x1b\[[0-9;?]*[A-Za-z]")
+
+
+def send_frame(sock, kind, payload):
+    sock.sendall(HEADER.pack(kind, len(payload)) + payload)
+
+
+def _recv_exact(sock, size):
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("daemon closed the connection")
+        data += chunk
+    return bytes(data)
+
+
+def recv_frame(sock):
+    kind, length = HEADER.unpack(_recv_exact(sock, HEADER.size))
+    return kind, _recv_exact(sock, length)
+
+
+def _run_in_process(argv):
+    from FactotumCLI.cli import main as cli_main
+
+    return cli_main(argv)
+
+
+def _socket_argument(argv):
+    """The value of --socket in `argv`, if any."""
+    for index, arg in enumerate(argv):
+        if arg == "--socket" and index + 1 < len(argv):
+            return argv[index + 1]
+        if arg.startswith("--socket="):
+            return arg.split("=", 1)[1]
+    return None
+
+
+def _run_remote(sock, argv):
+    """Run `argv` in the daemon; returns the exit code, or None if it must run here."""
+    request = {
+        "argv": argv,
+        "cwd": os.getcwd(),
+        "tty": sys.stdout.isatty(),
+        "env": dict(os.environ),
+    }
+    send_frame(sock, REQUEST, json.dumps(request).encode("utf-8"))
+
+    outputs = {STDOUT: sys.stdout.buffer, STDERR: sys.stderr.buffer}
+    strip = {STDOUT: not sys.stdout.isatty(), STDERR: not sys.stderr.isatty()}
+    while True:
+        kind, payload = recv_frame(sock)
+        if kind == EXIT:
+            return int(payload or 0)
+        if kind == LOCAL:
+            return None
+        if kind in outputs:
+            if strip[kind]:
+                payload = ANSI_ESCAPE.sub(b"", payload)
+            outputs[kind].write(payload)
+            outputs[kind].flush()
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if LOCAL_ONLY.intersection(argv):
+        return _run_in_process(argv)
+
+    from FactotumCLI.config import socket_path
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(_socket_argument(argv) or socket_path()))
+    except OSError:
+        # No daemon: behave exactly like `factotum`
+        sock.close()
+        return _run_in_process(argv)
+
+    with sock:
+        try:
+            code = _run_remote(sock, argv)
+        except ConnectionError as e:
+            print(f"factotum-client: {e}", file=sys.stderr)
+            return 1
+        except KeyboardInterrupt:
+            # Closing the socket tells the daemon to interrupt the task
+            return 130
+    return _run_in_process(argv) if code is None else code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,48 @@
-from questionary import Style
-
-custom_style = Style([
-    ('qmark', 'fg:#00c0ff bold'),     # Question mark
-    ('question', 'bold'),             # Question text
-    ('answer', 'fg:#00c0ff bold'),    # User's answer
-    ('pointer', 'fg:#00c0ff bold'),   # Pointer for select
-    ('highlighted', 'fg:#00c0ff bold'), # Highlighted choice
-    ('selected', 'fg:#00ff00'),       # Style for a selected item
-    ('separator', 'fg:#4AF626'),
-    ('instruction', ''),              # User instructions
-    ('text', ''),                     # Plain text
-    ('disabled', 'fg:#858585 italic') # Disabled choices
-])
\ No newline at end of file
+import os
+from pathlib import Path
+
+# Where FactotumCLI keeps its caches (tool manifest, API listings, ...)
+CACHE_DIR = Path(
+    os.getenv("FACTOTUM_CACHE_DIR")
+    or Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "factotum"
+)
+
+
+def cache_path(*parts):
+    """Return a path inside the cache directory, creating its parent folders."""
+    path = CACHE_DIR.joinpath(*parts)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def socket_path():
+    """Unix socket used by `factotum --serve` and factotum-client."""
+    if os.getenv("FACTOTUM_SOCKET"):
+        return Path(os.getenv("FACTOTUM_SOCKET"))
+    if os.getenv("XDG_RUNTIME_DIR"):
+        return Path(os.getenv("XDG_RUNTIME_DIR")) / "factotum.sock"
+    return cache_path("daemon.sock")
+
+
+# questionary pulls in prompt_toolkit, so the style is only built the first
+# time something actually asks for it (interactive mode, cloner prompts).
+def __getattr__(name):
+    if name == "custom_style":
+        from questionary import Style
+
+        global custom_style
+        custom_style = Style([
+            ('qmark', 'fg:#00c0ff bold'),     # Question mark
+            ('question', 'bold'),             # Question text
+            ('answer', 'fg:#00c0ff bold'),    # User's answer
+            ('pointer', 'fg:#00c0ff bold'),   # Pointer for select
+            ('highlighted', 'fg:#00c0ff bold'), # Highlighted choice
+            ('selected', 'fg:#00ff00'),       # Style for a selected item
+            ('separator', 'fg:#4AF626'),
+            ('instruction', ''),              # User instructions
+            ('text', ''),                     # Plain text
+            ('disabled', 'fg:#858585 italic') # Disabled choices
+        ])
+        return custom_style
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
@@ -0,0 +1,283 @@
+"""
+`factotum --serve`: keep a warm process for factotum-client.
+
+Every tool module is imported up front and the shared HTTP client is opened
+(plus each tool's `_session()` hook, when it has one, for per-host settings),
+so requests skip both interpreter start-up and imports. Each request is
+served by a forked child of that warm process: requests run side by side,
+each with the caller's working directory and environment, and with
+sys.stdout / sys.stderr replaced by streams that forward to the client, which
+the process-wide Rich consoles of the tools write through. When the client
+disconnects (Ctrl+C), its task is interrupted like a local Ctrl+C would.
+
+Some requests are handed back to the client to run in its own terminal (the
+LOCAL answer): tasks that prompt, read stdin or watch until interrupted, and
+calls whose environment differs from the daemon's in a setting that is only
+read when the tools are imported.
+"""
+import contextlib
+import inspect
+import io
+import json
+import os
+import select
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+import traceback
+import _thread
+
+from rich.console import Console
+
+from FactotumCLI import http_client
+from FactotumCLI.client import EXIT, LOCAL, REQUEST, STDERR, STDOUT, recv_frame, send_frame
+from FactotumCLI.config import socket_path
+from FactotumCLI.logger import log_task, shutdown_logging
+
+console = Console()
+
+# Read once when the tool modules are imported, so the daemon cannot honour other values
+IMPORT_TIME_ENV = (
+    "HOME", "XDG_CACHE_HOME", "FACTOTUM_CACHE_DIR", "FACTOTUM_HTTP_CACHE_MAX",
+    "GITHUB_API_URL", "COINGECKO_API_URL", "COINGECKO_RATE",
+)
+
+# Seconds an interrupted task gets to wind down before its process is ended
+ABORT_GRACE = 5
+
+
+class _ClientStream(io.TextIOBase):
+    """Text stream that forwards writes to the client as frames."""
+
+    def __init__(self, sock, kind, tty):
+        self.sock = sock
+        self.kind = kind
+        self.tty = tty
+        self.connected = True
+
+    @property
+    def encoding(self):
+        return "utf-8"
+
+    def writable(self):
+        return True
+
+    def isatty(self):
+        return self.tty
+
+    def write(self, text):
+        if self.connected and text:
+            try:
+                send_frame(self.sock, self.kind, text.encode("utf-8", "replace"))
+            except OSError:
+                # Client went away (Ctrl+C); let the task finish quietly
+                self.connected = False
+        return len(text)
+
+
+def _warm_up(tool_functions):
+    """Import every tool and open the shared HTTP client."""
+    http_client.get_session()
+    for name in list(tool_functions):
+        func = tool_functions[name]
+        module = sys.modules[func.__module__]
+        if callable(getattr(module, "_session", None)):
+            module._session()
+
+
+def _task_needs_terminal(task, kwargs, tool_functions):
+    """Whether the task would prompt, read stdin or run until Ctrl+C with these arguments."""
+    parameters = inspect.signature(tool_functions[task]).parameters
+
+    def value(name):
+        if name in kwargs:
+            return kwargs[name]
+        return parameters[name].default if name in parameters else None
+
+    if value("watch") or value("url_file") == "-":
+        return True
+    # The cloner asks which repositories to sync and what to do unless both are given
+    return task == "github-repo-cloner" and not (value("mode") and value("repos"))
+
+
+def _needs_terminal(argv):
+    from FactotumCLI.cli import build_parser, tool_functions
+    from FactotumCLI.registry import filter_kwargs
+
+    # Usage errors and --help are printed by main() itself, on the client's streams
+    try:
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            args = build_parser().parse_args(argv)
+    except SystemExit:
+        return False
+
+    if args.interactive or args.serve:
+        return True
+    if args.job_file:
+        from FactotumCLI.batch import load_jobs
+
+        try:
+            jobs = load_jobs(args.job_file, tool_functions)
+        except (OSError, ValueError):
+            return False
+        return any(_task_needs_terminal(job["task"], job["args"], tool_functions) for job in jobs)
+    task = (args.task or "").lower()
+    if task in tool_functions:
+        return _task_needs_terminal(task, filter_kwargs(tool_functions[task], vars(args)), tool_functions)
+    return False
+
+
+def _watch_disconnect(sock, streams, running):
+    """
+    Interrupt the task once the client hangs up.
+
+    The client sends nothing after its request, so the socket only becomes
+    readable when it is closed. The task gets a KeyboardInterrupt, like a
+    local Ctrl+C, and the process ends anyway after ABORT_GRACE seconds.
+    """
+    select.select([sock], [], [])
+    for stream in streams:
+        stream.connected = False
+    with running["lock"]:
+        if not running["task"]:
+            return
+        _thread.interrupt_main()
+    time.sleep(ABORT_GRACE)
+    os._exit(130)
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        try:
+            self._handle()
+        finally:
+            # The child leaves through os._exit, which skips atexit
+            shutdown_logging()
+
+    def _handle(self):
+        from FactotumCLI.cli import main
+
+        try:
+            kind, payload = recv_frame(self.request)
+            if kind != REQUEST:
+                return
+            request = json.loads(payload)
+        except (ConnectionError, ValueError):
+            return
+
+        argv = list(request.get("argv") or [])
+        env = request.get("env")
+        # Each request has its own process, so it can take over the cwd and environment
+        try:
+            os.chdir(request.get("cwd") or os.getcwd())
+        except OSError:
+            send_frame(self.request, LOCAL, b"")
+            return
+        if env is not None:
+            if any(env.get(name) != self.server.startup_env.get(name) for name in IMPORT_TIME_ENV):
+                send_frame(self.request, LOCAL, b"")
+                return
+            os.environ.clear()
+            os.environ.update(env)
+        if _needs_terminal(argv):
+            send_frame(self.request, LOCAL, b"")
+            return
+
+        stdout = _ClientStream(self.request, STDOUT, bool(request.get("tty")))
+        stderr = _ClientStream(self.request, STDERR, bool(request.get("tty")))
+        running = {"task": True, "lock": threading.Lock()}
+        threading.Thread(
+            target=_watch_disconnect, args=(self.request, (stdout, stderr), running), daemon=True,
+        ).start()
+
+        start = time.perf_counter()
+        code = 1
+        try:
+            sys.stdout, sys.stderr = stdout, stderr
+            try:
+                code = main(argv)
+            finally:
+                with running["lock"]:
+                    running["task"] = False
+        except KeyboardInterrupt:
+            code = 130
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else 1
+        except Exception:
+            stderr.write(traceback.format_exc())
+        finally:
+            sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
+
+        try:
+            send_frame(self.request, EXIT, str(code or 0).encode())
+        except OSError:
+            pass
+        log_task(
+            f"Daemon request {' '.join(argv)}",
+            task="daemon", exit_code=code or 0, duration=round(time.perf_counter() - start, 3),
+        )
+
+
+class _Server(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    # A child per request: a slow or stuck task never holds up other clients
+    request_queue_size = 64
+    block_on_close = False
+
+    def __init__(self, path, handler):
+        super().__init__(path, handler)
+        self.startup_env = dict(os.environ)
+
+
+def _stop(signum, frame):
+    raise KeyboardInterrupt
+
+
+def serve(path=None):
+    """Listen on the daemon socket until interrupted; returns the exit code."""
+    from FactotumCLI.cli import tool_functions
+
+    path = str(path or socket_path())
+    if os.path.exists(path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+            console.print(f"❌ A daemon is already listening on {path}", style="bold red")
+            return 1
+        except OSError:
+            # Left over from a daemon that did not shut down cleanly
+            os.remove(path)
+        finally:
+            probe.close()
+
+    start = time.perf_counter()
+    _warm_up(tool_functions)
+    # Socket readable and writable by the owner only
+    previous_umask = os.umask(0o177)
+    try:
+        server = _Server(path, _Handler)
+    finally:
+        os.umask(previous_umask)
+
+    signal.signal(signal.SIGTERM, _stop)
+    # Also when started in the background (SIGINT ignored): children rely on it to abort tasks
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    console.print(
+        f"🛰️ Serving {len(tool_functions)} tool(s) on [bold]{path}[/bold] "
+        f"(warm-up {time.perf_counter() - start:.2f}s). Press [bold]Ctrl+C[/bold] to stop.",
+        style="cyan",
+    )
+    log_task(f"Daemon listening on {path}", task="daemon")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        console.print("\n👋 Daemon stopped.", style="bold yellow")
+    finally:
+        server.server_close()
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    return 0
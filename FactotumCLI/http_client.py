@@ -0,0 +1,238 @@
+"""
+Shared HTTP client for the network tools.
+
+Every tool goes through one process-wide `Client`, so connections are pooled
+per host and reused across tasks (batch runs and the daemon run many tasks in
+one process). On top of a plain requests session, the client adds:
+
+    - default (connect, read) timeouts, so a hung server cannot block forever
+    - retries of idempotent requests on connection errors, timeouts, 429 and
+      5xx, with exponential backoff and full jitter, honouring Retry-After
+    - optional per-host token buckets limiting the request rate
+
+    from FactotumCLI import http_client
+
+    client = http_client.get_session()
+    client.limit("api.coingecko.com", rate=0.5, burst=5)
+    response = client.get(url, params={...})
+
+`AsyncClient` offers the same behaviour to asyncio code; requests run on
+worker threads through the shared client. requests is only imported when the
+first client is created, so importing this module is cheap.
+"""
+import functools
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+from FactotumCLI import metrics
+from FactotumCLI.logger import log_task
+
+# (connect, read) timeouts in seconds, used when a call does not pass its own
+DEFAULT_TIMEOUT = (10, 30)
+DEFAULT_RETRIES = 3
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+# Longer Retry-After answers are handed back to the caller instead of slept through
+MAX_RETRY_AFTER = 120
+
+# Hosts with a connection pool kept open, and connections kept per host
+POOL_HOSTS = 32
+POOL_SIZE = 32
+
+
+def retry_delay(attempt, response=None, base=0.5, cap=30.0):
+    """Exponential backoff with full jitter, or the server's Retry-After when given."""
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            # Retry-After may also be an HTTP date
+            return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+        except (TypeError, ValueError):
+            pass
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class TokenBucket:
+    """Allow `rate` acquisitions per second on average, with bursts of up to `burst`."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(burst if burst is not None else rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until one is available; returns the seconds waited."""
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+
+class Client:
+    """Pooled requests session with default timeouts, retries and per-host rate limits."""
+
+    def __init__(self, pool_size=POOL_SIZE, timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES):
+        import requests
+
+        self.session = requests.Session()
+        self.timeout = timeout
+        self.retries = retries
+        self.buckets = {}
+        self.pool_size = 0
+        self.lock = threading.Lock()
+        self.ensure_pool(pool_size)
+
+    def ensure_pool(self, size):
+        """Keep at least `size` connections per host, e.g. one per worker thread."""
+        from requests.adapters import HTTPAdapter
+
+        with self.lock:
+            if size <= self.pool_size:
+                return
+            adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=size)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+            self.pool_size = size
+
+    def limit(self, host, rate, burst=None):
+        """Allow at most `rate` requests per second to `host` ("name[:port]"); 0 removes the limit."""
+        with self.lock:
+            current = self.buckets.get(host)
+            if rate and rate > 0:
+                bucket = TokenBucket(rate, burst)
+                # Setting the same limit again keeps the bucket's state
+                if current is None or (current.rate, current.capacity) != (bucket.rate, bucket.capacity):
+                    self.buckets[host] = bucket
+            else:
+                self.buckets.pop(host, None)
+
+    def request(self, method, url, retries=None, **kwargs):
+        """
+        Send a request through the pool; keyword arguments are those of requests.
+
+        Idempotent requests are retried up to `retries` times (the client's
+        default when None). Once the retries are spent, the last 429/5xx
+        response is returned and the last connection error or timeout raised,
+        just like requests would.
+        """
+        import requests
+
+        kwargs.setdefault("timeout", self.timeout)
+        retries = self.retries if retries is None else retries
+        can_retry = method.upper() in IDEMPOTENT_METHODS
+        bucket = self.buckets.get(urlsplit(url).netloc)
+
+        attempt = 0
+        while True:
+            if bucket is not None:
+                waited = bucket.acquire()
+                if waited:
+                    metrics.count("rate_limit_seconds", waited)
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if not can_retry or attempt >= retries:
+                    raise
+                response, reason = None, type(e).__name__
+            else:
+                if response.status_code not in RETRY_STATUSES or not can_retry or attempt >= retries:
+                    return response
+                reason = f"HTTP {response.status_code}"
+
+            delay = retry_delay(attempt, response)
+            if response is not None:
+                if delay > MAX_RETRY_AFTER:
+                    return response
+                response.close()
+            metrics.count("http_retries")
+            log_task(f"Retrying {method} {url} in {delay:.1f}s after {reason}", attempt=attempt + 1)
+            time.sleep(delay)
+            attempt += 1
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url, **kwargs):
+        kwargs.setdefault("allow_redirects", False)
+        return self.request("HEAD", url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_session(pool_size=0):
+    """The process-wide Client, created on first use and grown to `pool_size` connections per host."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = Client()
+    if pool_size:
+        _client.ensure_pool(pool_size)
+    return _client
+
+
+class AsyncClient:
+    """
+    asyncio front end to the shared client.
+
+        async with AsyncClient(concurrency=16) as client:
+            responses = await asyncio.gather(*(client.get(url) for url in urls))
+
+    Each request runs on a worker thread with the shared client's pooling,
+    timeouts, retries and rate limits; at most `concurrency` run at once.
+    """
+
+    def __init__(self, concurrency=8, client=None):
+        self.concurrency = max(1, int(concurrency))
+        self.client = client or get_session(self.concurrency)
+        self.client.ensure_pool(self.concurrency)
+        self._semaphore = None
+
+    async def request(self, method, url, **kwargs):
+        import asyncio
+
+        if self._semaphore is None:
+            # Created here so it belongs to the running event loop
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, functools.partial(self.client.request, method, url, **kwargs))
+
+    async def get(self, url, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def head(self, url, **kwargs):
+        kwargs.setdefault("allow_redirects", False)
+        return await self.request("HEAD", url, **kwargs)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        # The pooled connections belong to the shared client and stay open
+        self._semaphore = None
@@ -1,10 +1,134 @@
+"""
+Logging backend for FactotumCLI tasks.
+
+Nothing is configured at import time. The first log_task call sets up a
+"factotum" logger whose handler only puts records on a queue; a
+QueueListener thread formats them and writes them to a size-rotated file,
+so worker threads never wait on disk I/O. Records are plain text by default
+or JSON lines, one object per record, with any structured fields merged in.
+
+Configuration (environment variables, or configure_logging()):
+    FACTOTUM_LOG_FILE       log file path (default: factotum.log in the current directory)
+    FACTOTUM_LOG_FORMAT     "text" or "json" (default: text)
+    FACTOTUM_LOG_MAX_BYTES  rotate after this many bytes (default: 5 MB, 0 disables rotation)
+    FACTOTUM_LOG_BACKUPS    rotated files to keep (default: 3)
+"""
+import atexit
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import threading
+
+LOGGER_NAME = "factotum"
+TEXT_FORMAT = "%(asctime)s — %(levelname)s — %(message)s"
+
+_lock = threading.RLock()
+_listener = None
+
+
+class _TextFormatter(logging.Formatter):
+    """The classic format, with structured fields appended as key=value."""
+
+    def format(self, record):
+        line = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " [" + " ".join(f"{key}={value}" for key, value in fields.items()) + "]"
+        return line
+
+
+class _JSONFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+def configure_logging(path=None, fmt=None, max_bytes=None, backups=None):
+    """
+    (Re)build the logging pipeline; arguments override the environment.
+
+    Safe to call more than once: a running listener is flushed and replaced.
+    """
+    global _listener
+
+    path = path or os.getenv("FACTOTUM_LOG_FILE") or "factotum.log"
+    fmt = (fmt or os.getenv("FACTOTUM_LOG_FORMAT") or "text").lower()
+    max_bytes = int(max_bytes if max_bytes is not None else os.getenv("FACTOTUM_LOG_MAX_BYTES", 5 * 1024 * 1024))
+    backups = int(backups if backups is not None else os.getenv("FACTOTUM_LOG_BACKUPS", 3))
+
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # delay=True: the file is only created once something is logged
+        file_handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8", delay=True,
+        )
+        file_handler.setFormatter(_JSONFormatter() if fmt == "json" else _TextFormatter(TEXT_FORMAT))
+
+        log_queue = queue.SimpleQueue()
+        logger = logging.getLogger(LOGGER_NAME)
+        logger.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+        _listener = logging.handlers.QueueListener(log_queue, file_handler)
+        _listener.start()
+    return logger
+
+
+def shutdown_logging():
+    """Drain the queue and close the log file (at exit, or before os._exit in a child)."""
+    global _listener
+
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+            _listener = None
+
+
+def _after_fork_in_child():
+    # The listener thread does not survive fork(); the next log_task starts a new one
+    global _listener, _lock
+
+    _lock = threading.RLock()
+    _listener = None
+    logging.getLogger(LOGGER_NAME).handlers[:] = []
+
+
+atexit.register(shutdown_logging)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def _logger():
+    if _listener is None:
+        with _lock:
+            if _listener is None:
+                configure_logging()
+    return logging.getLogger(LOGGER_NAME)
+
 
-logging.basicConfig(
-    filename="factotum.log",
-    level=logging.INFO,
-    format="%(asctime)s — %(levelname)s — %(message)s",
-)
+def log_task(message, level=logging.INFO, **fields):
+    """
+    Log a task event without blocking on file I/O.
 
-def log_task(message):
-    logging.info(message)
+    Keyword arguments are recorded as structured fields, e.g.
+    log_task("Moved files", task="organize-files", count=12, duration=0.4).
+    """
+    _logger().log(level, message, extra={"fields": fields} if fields else None)
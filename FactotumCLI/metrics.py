@@ -0,0 +1,180 @@
+"""
+Lightweight instrumentation for tasks.
+
+Tools mark interesting sections with `span()` and report quantities with
+`count()`; both are cheap enough to leave in permanently and work from any
+thread. The CLI wraps each dispatched task in `instrument()`, which resets
+the collector and, on request, profiles the task with cProfile and/or writes
+a metrics summary:
+
+    with metrics.span("organizer.plan"):
+        plan = _plan_moves(root)
+    metrics.count("files", len(plan))
+
+    with metrics.span("crypto.fetch", network=True):
+        response = session.get(url)
+    metrics.count("bytes", len(response.content))
+
+Spans are aggregated per name (count and total seconds). Network spans also
+add to the task's network time; since tools run requests concurrently, that
+sum can exceed the wall time.
+"""
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+_lock = threading.Lock()
+_spans = {}
+_counters = {}
+
+
+def reset():
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+
+
+@contextmanager
+def span(name, network=False):
+    """Time the enclosed block under `name` (and as network time if `network`)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        with _lock:
+            entry = _spans.setdefault(name, [0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed
+            if network:
+                _counters["network_seconds"] = _counters.get("network_seconds", 0.0) + elapsed
+
+
+def count(name, value=1):
+    """Add `value` to a counter, e.g. count("bytes", n) or count("files")."""
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def _peak_rss():
+    """Peak resident set size of this process in bytes, or None where unsupported."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def snapshot(task, wall, cpu):
+    with _lock:
+        counters = dict(_counters)
+        spans = {name: {"count": n, "seconds": round(seconds, 6)} for name, (n, seconds) in sorted(_spans.items())}
+    return {
+        "task": task,
+        "wall_seconds": round(wall, 6),
+        "cpu_seconds": round(cpu, 6),
+        "network_seconds": round(counters.pop("network_seconds", 0.0), 6),
+        "bytes": counters.pop("bytes", 0),
+        "files": counters.pop("files", 0),
+        "peak_rss_bytes": _peak_rss(),
+        "counters": counters,
+        "spans": spans,
+    }
+
+
+def _write_metrics(report, destination):
+    line = json.dumps(report)
+    if destination in ("", "-"):
+        # stderr keeps stdout usable for the task's own output
+        print(line, file=sys.stderr)
+        return
+    with open(destination, "a", encoding="utf-8") as file:
+        file.write(line + "\n")
+
+
+class _ThreadProfilers:
+    """
+    Give every thread started during the task its own cProfile profiler.
+
+    A profiler only sees the thread that enabled it, and the tools do their
+    work on pool threads. Installed with threading.setprofile, the hook runs
+    first thing in each new thread and hands the thread over to a fresh
+    profiler. On Python 3.12+ cProfile already covers all threads and a
+    second profiler cannot be enabled, so the hook just steps aside.
+    """
+
+    def __init__(self):
+        self.profilers = []
+        self.lock = threading.Lock()
+
+    def __call__(self, frame, event, arg):
+        import cProfile
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            sys.setprofile(None)
+            return
+        with self.lock:
+            self.profilers.append(profiler)
+
+
+def _write_profile(profilers, destination):
+    import pstats
+
+    from rich.console import Console
+
+    stats = pstats.Stats(profilers[0], stream=sys.stderr)
+    for profiler in profilers[1:]:
+        stats.add(profiler)
+    stats.dump_stats(destination)
+    console = Console(stderr=True)
+    console.print(
+        f"🔬 Profile of {len(profilers)} thread(s) written to [bold]{destination}[/bold] "
+        "(top functions by cumulative time):"
+    )
+    stats.sort_stats("cumulative").print_stats(15)
+
+
+@contextmanager
+def instrument(task, metrics=None, profile=None):
+    """
+    Measure one task dispatch.
+
+    `metrics`: None to skip, "-" for a JSON line on stderr, or a file that
+    gets one JSON line appended per task. `profile`: None to skip, or the
+    file the cProfile stats are dumped to (readable with pstats/snakeviz),
+    merged over the calling thread and every thread the task starts.
+    """
+    if metrics is None and profile is None:
+        yield
+        return
+
+    reset()
+    profiler = threads = None
+    if profile is not None:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        threads = _ThreadProfilers()
+    start, cpu_start = time.perf_counter(), time.process_time()
+    if profiler is not None:
+        threading.setprofile(threads)
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            threading.setprofile(None)
+        wall, cpu = time.perf_counter() - start, time.process_time() - cpu_start
+        if profiler is not None:
+            with threads.lock:
+                _write_profile([profiler] + threads.profilers, profile)
+        if metrics is not None:
+            _write_metrics(snapshot(task, wall, cpu), metrics)
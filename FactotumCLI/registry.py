@@ -0,0 +1,164 @@
+import ast
+import importlib
+import json
+import os
+from collections.abc import Mapping
+from pathlib import Path
+
+from FactotumCLI.config import cache_path
+
+TOOLS_DIR = Path(__file__).parent / "tools"
+TOOLS_PACKAGE = "FactotumCLI.tools"
+MANIFEST_VERSION = 1
+
+
+def _fingerprint():
+    """Name, size and mtime of every tool module; any change invalidates the manifest."""
+    files = {}
+    with os.scandir(TOOLS_DIR) as entries:
+        for entry in entries:
+            if entry.name.endswith(".py") and not entry.name.startswith("_"):
+                stat = entry.stat()
+                files[entry.name] = [stat.st_size, stat.st_mtime_ns]
+    return files
+
+
+def _literal(node):
+    if node is None:
+        return None
+    try:
+        return ast.literal_eval(node)
+    except ValueError:
+        return None
+
+
+def _annotation(node):
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    return None
+
+
+def _scan_module(module_name, source):
+    """Extract CATEGORY, DESCRIPTION and public functions without importing the module."""
+    tree = ast.parse(source)
+    category = "Other"
+    description = "No description provided."
+    functions = []
+
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1:
+            target = node.targets[0]
+            if isinstance(target, ast.Name) and target.id == "CATEGORY":
+                category = _literal(node.value) or category
+            elif isinstance(target, ast.Name) and target.id == "DESCRIPTION":
+                description = _literal(node.value) or description
+        elif isinstance(node, ast.FunctionDef) and not node.name.startswith("_"):
+            args = node.args.args
+            defaults = [None] * (len(args) - len(node.args.defaults)) + list(node.args.defaults)
+            params = [
+                {
+                    "name": arg.arg,
+                    "annotation": _annotation(arg.annotation),
+                    "default": _literal(default),
+                    "required": default is None,
+                }
+                for arg, default in zip(args, defaults)
+            ]
+            functions.append({
+                "function": node.name,
+                "doc": ast.get_docstring(node),
+                "params": params,
+            })
+
+    return {
+        f["function"].replace("_", "-"): {
+            "module": module_name,
+            "category": category,
+            "description": description,
+            **f,
+        }
+        for f in functions
+    }
+
+
+def build_manifest(fingerprint=None):
+    """Parse every tool module and return the manifest dict."""
+    fingerprint = fingerprint or _fingerprint()
+    tools = {}
+    for filename in sorted(fingerprint):
+        module_name = filename[:-3]
+        source = (TOOLS_DIR / filename).read_text(encoding="utf-8")
+        tools.update(_scan_module(module_name, source))
+    return {
+        "version": MANIFEST_VERSION,
+        "files": fingerprint,
+        "tools": dict(sorted(tools.items())),
+    }
+
+
+def load_manifest():
+    """
+    Return the tool manifest, rebuilding the cached copy when a tool file changed.
+
+    The cache is best-effort: an unreadable or unwritable cache directory just
+    means the manifest gets rebuilt in memory every time.
+    """
+    fingerprint = _fingerprint()
+    try:
+        manifest_file = cache_path("tool_manifest.json")
+    except OSError:
+        manifest_file = None
+
+    if manifest_file is not None and manifest_file.exists():
+        try:
+            cached = json.loads(manifest_file.read_text(encoding="utf-8"))
+            if cached.get("version") == MANIFEST_VERSION and cached.get("files") == fingerprint:
+                return cached
+        except (OSError, ValueError):
+            pass
+
+    manifest = build_manifest(fingerprint)
+
+    if manifest_file is not None:
+        try:
+            tmp_file = manifest_file.with_suffix(f".{os.getpid()}.tmp")
+            tmp_file.write_text(json.dumps(manifest), encoding="utf-8")
+            os.replace(tmp_file, manifest_file)
+        except OSError:
+            pass
+
+    return manifest
+
+
+class LazyToolMap(Mapping):
+    """Map of CLI task name -> tool function; a module is imported on first lookup only."""
+
+    def __init__(self, specs):
+        self._specs = specs
+        self._loaded = {}
+
+    def __getitem__(self, name):
+        if name not in self._loaded:
+            spec = self._specs[name]
+            module = importlib.import_module(f"{TOOLS_PACKAGE}.{spec['module']}")
+            self._loaded[name] = getattr(module, spec["function"])
+        return self._loaded[name]
+
+    def __contains__(self, name):
+        return name in self._specs
+
+    def __iter__(self):
+        return iter(self._specs)
+
+    def __len__(self):
+        return len(self._specs)
+
+
+def filter_kwargs(func, kwargs):
+    """Keep the keyword arguments `func` accepts, dropping unset (None) values."""
+    from inspect import signature
+
+    parameters = signature(func).parameters
+    return {k: v for k, v in kwargs.items() if k in parameters and v is not None}
@@ -0,0 +1,222 @@
+"""
+Duplicate-file detection for organize_files.
+
+Candidates are narrowed down in stages so most files are never read in full:
+
+1. group by size (from the directory listing, no reads at all);
+2. hash the first and last few KB of files that share a size;
+3. hash the full content of what is still ambiguous, memory-mapped, with
+   large files spread over a process pool.
+
+Hashes are cached in SQLite keyed by (device, inode) and only trusted while
+size and mtime still match, so reruns over an unchanged drop folder only stat.
+"""
+import hashlib
+import mmap
+import os
+import sqlite3
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from FactotumCLI import metrics
+from FactotumCLI.config import cache_path
+from FactotumCLI.tools._file_mover import _numbered, _place
+
+EDGE_SIZE = 4096
+# Files at least this large are hashed in worker processes
+LARGE_FILE = 8 * 1024 * 1024
+QUARANTINE_DIR = ".factotum-quarantine"
+ACTIONS = {"report", "hardlink", "quarantine"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashes (
+    device INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    partial TEXT,
+    full TEXT,
+    PRIMARY KEY (device, inode)
+);
+"""
+
+
+class HashCache:
+    """(device, inode) -> hashes, valid only while size and mtime are unchanged."""
+
+    def __init__(self, path=None):
+        self.db = sqlite3.connect(str(path or cache_path("organizer", "hashes.sqlite3")), timeout=30)
+        self.db.executescript(SCHEMA)
+        self.updates = {}
+
+    def get(self, info):
+        row = self.db.execute(
+            "SELECT size, mtime_ns, partial, full FROM hashes WHERE device = ? AND inode = ?",
+            (info.device, info.inode),
+        ).fetchone()
+        if row is None or (row[0], row[1]) != (info.size, info.mtime_ns):
+            return None, None
+        return row[2], row[3]
+
+    def put(self, info):
+        self.updates[(info.device, info.inode)] = (info.size, info.mtime_ns, info.partial, info.full)
+
+    def close(self):
+        """Write the new hashes in one transaction."""
+        with self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO hashes (device, inode, size, mtime_ns, partial, full)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                [key + value for key, value in self.updates.items()],
+            )
+        self.db.close()
+
+
+class FileInfo:
+    __slots__ = ("path", "size", "device", "inode", "mtime_ns", "partial", "full")
+
+    def __init__(self, path, stat):
+        self.path = path
+        self.size = stat.st_size
+        self.device = stat.st_dev
+        self.inode = stat.st_ino
+        self.mtime_ns = stat.st_mtime_ns
+        self.partial = None
+        self.full = None
+
+
+def scan_files(root):
+    """Every regular file under root (quarantine and journal files excluded)."""
+    files = []
+    pending = [root]
+    while pending:
+        current = pending.pop()
+        with os.scandir(current) as entries:
+            for entry in entries:
+                if entry.name.startswith(".factotum"):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    files.append(FileInfo(entry.path, entry.stat(follow_symlinks=False)))
+    return files
+
+
+def _partial_hash(path, size):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as file:
+        digest.update(os.pread(file.fileno(), EDGE_SIZE, 0))
+        if size > EDGE_SIZE:
+            digest.update(os.pread(file.fileno(), EDGE_SIZE, max(EDGE_SIZE, size - EDGE_SIZE)))
+    return digest.hexdigest()
+
+
+def _full_hash(path):
+    # Top-level so it can run in a worker process
+    digest = hashlib.blake2b()
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return digest.hexdigest()
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            digest.update(mapped)
+    return digest.hexdigest()
+
+
+def _groups(files, key):
+    grouped = defaultdict(list)
+    for info in files:
+        grouped[key(info)].append(info)
+    return [group for group in grouped.values() if len(group) > 1]
+
+
+def find_duplicates(files, jobs=8, cache=None):
+    """
+    Return groups of identical files (each a list of FileInfo, 2+ long).
+
+    Hardlinks to the same inode count as a single file, since they share
+    their storage already. Zero-length files are ignored.
+    """
+    unique = {}
+    for info in files:
+        if info.size > 0:
+            unique.setdefault((info.device, info.inode), info)
+    candidates = [info for group in _groups(unique.values(), lambda i: i.size) for info in group]
+
+    if cache is not None:
+        for info in candidates:
+            info.partial, info.full = cache.get(info)
+
+    # Stage 2: first/last EDGE_SIZE bytes
+    missing = [info for info in candidates if info.partial is None]
+    metrics.count("dedup_partial_hashes", len(missing))
+    with metrics.span("dedup.partial_hash"), ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        for info, partial in zip(missing, executor.map(lambda i: _partial_hash(i.path, i.size), missing)):
+            info.partial = partial
+            if cache is not None:
+                cache.put(info)
+    candidates = [info for group in _groups(candidates, lambda i: (i.size, i.partial)) for info in group]
+
+    # Stage 3: whole content; files that fit in the edges were read entirely already
+    for info in candidates:
+        if info.full is None and info.size <= 2 * EDGE_SIZE:
+            info.full = info.partial
+    missing = [info for info in candidates if info.full is None]
+    small = [info for info in missing if info.size < LARGE_FILE]
+    large = [info for info in missing if info.size >= LARGE_FILE]
+    metrics.count("dedup_bytes_hashed", sum(info.size for info in missing))
+    with metrics.span("dedup.full_hash"):
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+            for info, full in zip(small, executor.map(lambda i: _full_hash(i.path), small)):
+                info.full = full
+        if large:
+            with ProcessPoolExecutor(max_workers=max(1, min(jobs, os.cpu_count() or 1))) as executor:
+                for info, full in zip(large, executor.map(_full_hash, [i.path for i in large])):
+                    info.full = full
+    if cache is not None:
+        for info in missing:
+            cache.put(info)
+
+    groups = _groups(candidates, lambda i: (i.size, i.full))
+    for group in groups:
+        # Keep the oldest copy, then the shortest path
+        group.sort(key=lambda i: (i.mtime_ns, len(i.path), i.path))
+    groups.sort(key=lambda group: group[0].path)
+    return groups
+
+
+def _hardlink(keeper, duplicate):
+    tmp_link = f"{duplicate.path}.{os.getpid()}.tmp"
+    os.link(keeper.path, tmp_link)
+    os.replace(tmp_link, duplicate.path)
+
+
+def _quarantine(root, duplicate):
+    """
+    Move a duplicate under QUARANTINE_DIR, keeping its relative path.
+
+    Files quarantined by earlier runs are never replaced: the new one gets the
+    first free "name (n).ext", and a name taken in the meantime fails the item.
+    """
+    target = os.path.join(root, QUARANTINE_DIR, os.path.relpath(duplicate.path, root))
+    folder, name = os.path.split(target)
+    os.makedirs(folder, exist_ok=True)
+    number = 0
+    while os.path.lexists(target):
+        number += 1
+        target = os.path.join(folder, _numbered(name, number))
+    _place(duplicate.path, target)
+
+
+def apply_action(root, groups, action):
+    """Hardlink or quarantine every copy but the first of each group; returns failures."""
+    failures = []
+    for keeper, *duplicates in groups:
+        for duplicate in duplicates:
+            try:
+                if action == "hardlink":
+                    _hardlink(keeper, duplicate)
+                elif action == "quarantine":
+                    _quarantine(root, duplicate)
+            except OSError as e:
+                failures.append((duplicate.path, str(e)))
+    return failures
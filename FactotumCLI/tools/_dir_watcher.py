@@ -0,0 +1,103 @@
+"""
+Wait for new files in a set of directories.
+
+On Linux the kernel's inotify API is used through ctypes (no extra
+dependency); everywhere else, or when inotify is unavailable, the directories'
+mtimes are polled instead. Both only answer "did something change?" — the
+incremental planner works out what.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+import time
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+
+class _InotifyWatcher:
+    name = "inotify"
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watched = set()
+
+    def watch(self, paths):
+        for path in paths:
+            if path not in self.watched:
+                if self._add_watch(self.fd, os.fsencode(path), WATCH_MASK) >= 0:
+                    self.watched.add(path)
+
+    def wait(self, timeout):
+        """Block until at least one event arrives (True) or `timeout` passes (False)."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        # Drain the queue; the events themselves are not needed
+        while True:
+            try:
+                if not os.read(self.fd, 64 * 1024):
+                    break
+            except BlockingIOError:
+                break
+        return True
+
+    def close(self):
+        os.close(self.fd)
+
+
+class _PollingWatcher:
+    name = "polling"
+
+    def __init__(self, interval=2.0):
+        self.interval = interval
+        self.mtimes = {}
+
+    def _snapshot(self, path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def watch(self, paths):
+        for path in paths:
+            if path not in self.mtimes:
+                self.mtimes[path] = self._snapshot(path)
+
+    def wait(self, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            changed = False
+            for path, mtime in list(self.mtimes.items()):
+                current = self._snapshot(path)
+                if current != mtime:
+                    self.mtimes[path] = current
+                    changed = True
+            if changed:
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.interval, remaining))
+
+    def close(self):
+        pass
+
+
+def create_watcher(poll_interval=2.0):
+    """inotify when the platform supports it, mtime polling otherwise."""
+    if sys.platform.startswith("linux"):
+        try:
+            return _InotifyWatcher()
+        except (OSError, AttributeError):
+            pass
+    return _PollingWatcher(poll_interval)
@@ -0,0 +1,228 @@
+"""
+Move engine for organize_files.
+
+Moves within one filesystem never copy data: the file is linked under its new
+name and the old name is removed. Moves to another filesystem (e.g. an
+NFS-mounted archive) are copies: they use the kernel's zero-copy paths
+(copy_file_range, then sendfile) where available, write to a temporary name
+first, and only remove the source once the copy has been checked, flushed to
+disk and put in place.
+
+Name collisions are resolved when the plan is made, so a run always picks the
+same names. Files are put in place with a hard link (or a re-checked rename
+where the filesystem has no hard links), so a file that appears at a target
+name after planning makes that move fail instead of being overwritten.
+"""
+import errno
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from FactotumCLI import metrics
+
+COPY_CHUNK = 64 * 1024 * 1024
+
+# link() errors meaning the filesystem does not do hard links
+NO_HARDLINK_ERRNOS = {errno.EPERM, errno.EOPNOTSUPP, errno.ENOTSUP, errno.ENOSYS, errno.EMLINK}
+
+
+def _numbered(name, number):
+    stem, ext = os.path.splitext(name)
+    return f"{stem} ({number}){ext}"
+
+
+def resolve_collisions(plan):
+    """
+    Rename planned targets that would clash, "name (1).ext", "name (2).ext", ...
+
+    Clashes are checked against what is already in each target folder and
+    against earlier entries of the (sorted) plan, so the result is the same
+    for the same tree. Returns a new plan.
+    """
+    taken = {}
+    resolved = []
+    for source, folder, name in plan:
+        if folder not in taken:
+            try:
+                taken[folder] = set(os.listdir(folder))
+            except FileNotFoundError:
+                taken[folder] = set()
+        names = taken[folder]
+        candidate, number = name, 0
+        while candidate in names:
+            number += 1
+            candidate = _numbered(name, number)
+        names.add(candidate)
+        resolved.append((source, folder, candidate))
+    return resolved
+
+
+def _copy_fd(source_fd, target_fd, size):
+    """
+    Copy `size` bytes between two descriptors, kernel-side when possible.
+
+    A method that fails as unsupported, or that returns 0 before `size` bytes
+    were copied (some FUSE/NFS setups do that silently), hands over to the
+    next one from the current offset, ending with a plain buffered copy.
+    Returns the bytes copied; callers still check the result's size.
+    """
+    copied = 0
+    for copy in (getattr(os, "copy_file_range", None), getattr(os, "sendfile", None)):
+        if copy is None:
+            continue
+        try:
+            # sendfile writes at the target's file position, copy_file_range at explicit offsets
+            os.lseek(target_fd, copied, os.SEEK_SET)
+            while copied < size:
+                if copy is os.sendfile:
+                    sent = copy(target_fd, source_fd, copied, min(COPY_CHUNK, size - copied))
+                else:
+                    sent = copy(source_fd, target_fd, min(COPY_CHUNK, size - copied), copied, copied)
+                if sent == 0:
+                    break
+                copied += sent
+            if copied >= size:
+                return copied
+        except OSError as e:
+            # Not supported for this pair of filesystems: try the next method
+            if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP):
+                raise
+    with os.fdopen(os.dup(source_fd), "rb") as source, os.fdopen(os.dup(target_fd), "wb") as target:
+        source.seek(copied)
+        target.seek(copied)
+        while copied < size:
+            chunk = source.read(min(1024 * 1024, size - copied))
+            if not chunk:
+                break
+            target.write(chunk)
+            copied += len(chunk)
+    return copied
+
+
+def _place(source, destination):
+    """
+    Rename `source` to `destination`, failing with FileExistsError instead of replacing a file.
+
+    A hard link cannot replace an existing name, so the file is linked into
+    place and the old name removed. Filesystems without hard links fall back
+    to a rename after checking the name is still free.
+    """
+    try:
+        os.link(source, destination, follow_symlinks=False)
+    except OSError as e:
+        if e.errno not in NO_HARDLINK_ERRNOS:
+            raise
+        if os.path.lexists(destination):
+            raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), destination) from None
+        os.rename(source, destination)
+        return
+    os.unlink(source)
+
+
+def _fsync_dir(path):
+    """Persist directory entries (the new name) where the platform allows it."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def copy_across(source, destination):
+    """
+    Copy then delete `source`; returns the bytes copied.
+
+    The source is only removed once the copy has the source's size, has been
+    fsync'ed and sits at `destination`; any failure leaves the source intact.
+    """
+    tmp_file = f"{destination}.{os.getpid()}.{threading.get_ident()}.tmp"
+    source_fd = os.open(source, os.O_RDONLY)
+    try:
+        size = os.fstat(source_fd).st_size
+        target_fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        try:
+            _copy_fd(source_fd, target_fd, size)
+            copied = os.fstat(target_fd).st_size
+            if copied != size:
+                raise OSError(errno.EIO, f"short copy ({copied} of {size} bytes)", source)
+            os.fsync(target_fd)
+        finally:
+            os.close(target_fd)
+        shutil.copystat(source, tmp_file)
+        _place(tmp_file, destination)
+    except BaseException:
+        try:
+            os.remove(tmp_file)
+        except FileNotFoundError:
+            pass
+        raise
+    finally:
+        os.close(source_fd)
+
+    _fsync_dir(os.path.dirname(destination) or ".")
+    os.remove(source)
+    return size
+
+
+def _move(source, destination, same_device):
+    """Move one file; returns ("renamed", 0) or ("copied", bytes)."""
+    if same_device:
+        try:
+            _place(source, destination)
+            return "renamed", 0
+        except OSError as e:
+            # e.g. a bind mount of the same device: fall back to copying
+            if e.errno != errno.EXDEV:
+                raise
+    return "copied", copy_across(source, destination)
+
+
+@metrics.span("organizer.move")
+def execute(plan, jobs):
+    """
+    Run a (collision-free) move plan on a worker pool.
+
+    Target folders are created once and each directory's device is looked up
+    once to decide between a rename and a copy. Returns (failures, stats) with
+    stats holding renamed/copied counts, bytes copied and the run's duration.
+    """
+    devices = {}
+
+    def device(path):
+        if path not in devices:
+            devices[path] = os.stat(path).st_dev
+        return devices[path]
+
+    for folder in {folder for _, folder, _ in plan}:
+        os.makedirs(folder, exist_ok=True)
+
+    failures = []
+    stats = {"renamed": 0, "copied": 0, "bytes": 0, "seconds": 0.0}
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        futures = {}
+        for source, folder, name in plan:
+            try:
+                same_device = device(os.path.dirname(source)) == device(folder)
+            except OSError:
+                same_device = False
+            futures[executor.submit(_move, source, os.path.join(folder, name), same_device)] = source
+        for future, source in futures.items():
+            try:
+                kind, size = future.result()
+            except OSError as e:
+                failures.append((source, str(e)))
+                continue
+            stats[kind] += 1
+            stats["bytes"] += size
+    metrics.count("files", stats["renamed"] + stats["copied"])
+    metrics.count("bytes", stats["bytes"])
+    stats["seconds"] = time.perf_counter() - start
+    return failures, stats
@@ -0,0 +1,222 @@
+"""
+Content-addressed HTTP cache used by the downloader.
+
+Bodies live in a blob store keyed by their SHA-256, so the same content served
+under several URLs is stored once. A small SQLite index maps each URL to its
+blob and validators (ETag, Last-Modified) plus an expiry time derived from
+Cache-Control/Expires. Entries are evicted least-recently-used first when the
+blobs exceed the size limit; a blob is deleted once no URL references it.
+"""
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from FactotumCLI.config import cache_path
+
+# Total size of cached bodies before least-recently-used entries are evicted
+MAX_CACHE_BYTES = int(os.getenv("FACTOTUM_HTTP_CACHE_MAX", 1024 ** 3))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    url TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    expires REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_digest ON entries (digest);
+CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+"""
+
+
+def _hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _expiry(headers, now):
+    """
+    Absolute expiry time for a response, or None if it must not be stored.
+
+    max-age wins over Expires; anything without freshness information
+    expires immediately and is revalidated on the next request.
+    """
+    cache_control = {
+        directive.strip().split("=", 1)[0].lower(): directive.strip().partition("=")[2]
+        for directive in headers.get("Cache-Control", "").split(",")
+        if directive.strip()
+    }
+    if "no-store" in cache_control:
+        return None
+    if "no-cache" in cache_control:
+        return now
+    if "max-age" in cache_control:
+        try:
+            return now + int(cache_control["max-age"].strip('"'))
+        except ValueError:
+            return now
+    if "Expires" in headers:
+        try:
+            return parsedate_to_datetime(headers["Expires"]).timestamp()
+        except (TypeError, ValueError):
+            return now
+    return now
+
+
+class HTTPCache:
+    """Thread-safe handle on the on-disk cache; share one instance between workers."""
+
+    def __init__(self, root=None, max_bytes=MAX_CACHE_BYTES):
+        self.root = root or cache_path("http", "index.sqlite3").parent
+        self.blob_dir = os.path.join(self.root, "blobs")
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self.db = sqlite3.connect(
+            os.path.join(self.root, "index.sqlite3"), check_same_thread=False, timeout=30,
+        )
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+    def _blob_path(self, digest):
+        return os.path.join(self.blob_dir, digest[:2], digest)
+
+    def lookup(self, url):
+        """Return the entry for `url` as a dict, or None if missing or its blob is gone."""
+        with self.lock:
+            row = self.db.execute(
+                "SELECT digest, size, etag, last_modified, expires FROM entries WHERE url = ?", (url,),
+            ).fetchone()
+        if row is None:
+            return None
+        entry = dict(zip(["digest", "size", "etag", "last_modified", "expires"], row))
+        if not os.path.exists(self._blob_path(entry["digest"])):
+            self._delete(url)
+            return None
+        return entry
+
+    def is_fresh(self, entry):
+        return entry["expires"] > time.time()
+
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def materialize(self, url, entry, output):
+        """Copy the cached body of `url` to `output` and mark it as recently used."""
+        tmp_file = f"{output}.{os.getpid()}.{threading.get_ident()}.tmp"
+        shutil.copyfile(self._blob_path(entry["digest"]), tmp_file)
+        os.replace(tmp_file, output)
+        with self.lock, self.db:
+            self.db.execute("UPDATE entries SET last_access = ? WHERE url = ?", (time.time(), url))
+
+    def revalidated(self, url, headers):
+        """Record a 304: refresh expiry and validators without touching the blob."""
+        now = time.time()
+        expires = _expiry(headers, now)
+        with self.lock, self.db:
+            if expires is None:
+                self.db.execute("DELETE FROM entries WHERE url = ?", (url,))
+                return
+            self.db.execute(
+                "UPDATE entries SET expires = ?, last_access = ?,"
+                " etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) WHERE url = ?",
+                (expires, now, headers.get("ETag"), headers.get("Last-Modified"), url),
+            )
+
+    def store(self, url, path, headers, digest=None):
+        """
+        Add the downloaded file at `path` to the cache for `url`.
+
+        Returns the content digest, or None when the response forbids storing
+        or the body alone is larger than the cache (storing it would only evict
+        everything else, itself included). Identical content already in the
+        blob store is not written again.
+        """
+        now = time.time()
+        expires = _expiry(headers, now)
+        size = os.path.getsize(path)
+        if expires is None or size > self.max_bytes:
+            self._delete(url)
+            return None
+
+        digest = digest or _hash_file(path)
+        blob = self._blob_path(digest)
+        if not os.path.exists(blob):
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            # Copy rather than hardlink so later edits to the output cannot corrupt the cache
+            tmp_blob = f"{blob}.{os.getpid()}.{threading.get_ident()}.tmp"
+            shutil.copyfile(path, tmp_blob)
+            os.replace(tmp_blob, blob)
+
+        with self.lock, self.db:
+            previous = self.db.execute("SELECT digest FROM entries WHERE url = ?", (url,)).fetchone()
+            self.db.execute(
+                "INSERT OR REPLACE INTO entries (url, digest, size, etag, last_modified, expires, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, digest, size, headers.get("ETag"), headers.get("Last-Modified"), expires, now),
+            )
+            if previous and previous[0] != digest:
+                self._drop_blob_if_unused(previous[0])
+
+        self.evict()
+        return digest
+
+    def _drop_blob_if_unused(self, digest):
+        # Caller holds the lock
+        (refs,) = self.db.execute("SELECT COUNT(*) FROM entries WHERE digest = ?", (digest,)).fetchone()
+        if refs == 0:
+            try:
+                os.remove(self._blob_path(digest))
+            except FileNotFoundError:
+                pass
+
+    def _delete(self, url):
+        with self.lock, self.db:
+            row = self.db.execute("SELECT digest FROM entries WHERE url = ?", (url,)).fetchone()
+            self.db.execute("DELETE FROM entries WHERE url = ?", (url,))
+            if row:
+                self._drop_blob_if_unused(row[0])
+
+    def total_size(self):
+        """Bytes used by blobs (each distinct digest counted once)."""
+        with self.lock:
+            (total,) = self.db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT digest, size FROM entries)"
+            ).fetchone()
+        return total
+
+    def evict(self):
+        """Drop least-recently-used URLs until the blob store fits in max_bytes."""
+        total = self.total_size()
+        if total <= self.max_bytes:
+            return
+        with self.lock, self.db:
+            rows = self.db.execute("SELECT url, digest, size FROM entries ORDER BY last_access").fetchall()
+            for url, digest, size in rows:
+                if total <= self.max_bytes:
+                    break
+                self.db.execute("DELETE FROM entries WHERE url = ?", (url,))
+                (refs,) = self.db.execute("SELECT COUNT(*) FROM entries WHERE digest = ?", (digest,)).fetchone()
+                if refs == 0:
+                    total -= size
+                    try:
+                        os.remove(self._blob_path(digest))
+                    except FileNotFoundError:
+                        pass
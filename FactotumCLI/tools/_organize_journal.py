@@ -0,0 +1,112 @@
+"""
+State journal for organize_files.
+
+The journal lives in the cache directory, one file per organized root, and
+records, for every scanned directory, its mtime and the entries already seen.
+Keeping it out of the root matters: writing it there would change the root's
+mtime on every save, so the root could never be skipped (and a watcher on it
+would wake itself up).
+A directory whose mtime has not changed cannot contain anything new, so it is
+not listed again; a changed one is listed but only unknown names are planned.
+The moves of the last run are kept as well so they can be undone.
+"""
+import hashlib
+import json
+import os
+import time
+
+from FactotumCLI import metrics
+from FactotumCLI.config import cache_path
+
+# Where earlier versions kept the journal, inside the organized directory
+LEGACY_JOURNAL_NAME = ".factotum-organize.json"
+JOURNAL_VERSION = 1
+
+
+def journal_path(root):
+    key = hashlib.sha256(os.path.abspath(root).encode("utf-8", "surrogateescape")).hexdigest()[:32]
+    return cache_path("organizer", f"journal_{key}.json")
+
+
+def load_journal(root):
+    for path in (journal_path(root), os.path.join(root, LEGACY_JOURNAL_NAME)):
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                journal = json.load(file)
+        except (OSError, ValueError):
+            continue
+        if journal.get("version") == JOURNAL_VERSION:
+            for record in journal["dirs"].values():
+                record["files"] = set(record["files"])
+            return journal
+    return {"version": JOURNAL_VERSION, "dirs": {}, "last_run": None}
+
+
+@metrics.span("organizer.journal_save")
+def save_journal(root, journal):
+    path = journal_path(root)
+    tmp_file = f"{path}.{os.getpid()}.tmp"
+    serializable = dict(journal, dirs={
+        rel: dict(record, files=sorted(record["files"])) for rel, record in journal["dirs"].items()
+    })
+    with open(tmp_file, "w", encoding="utf-8") as file:
+        json.dump(serializable, file)
+    os.replace(tmp_file, path)
+    try:
+        os.remove(os.path.join(root, LEGACY_JOURNAL_NAME))
+    except FileNotFoundError:
+        pass
+
+
+def forget_dirs(journal, root, paths):
+    """Drop the records of these directories so the next run lists them again."""
+    for path in paths:
+        journal["dirs"].pop(os.path.relpath(path, root), None)
+
+
+def record_run(journal, root, plan, failures):
+    """
+    Fold a finished run into the journal.
+
+    Moved files leave their source directory's entries and join their target
+    folder's, failed ones stay unknown so the next run retries them. Only the
+    mtime seen at scan time is kept: our own moves bump the mtime, which just
+    means the directory is listed (cheaply) once more on the next run.
+    """
+    relative_dirs = {}
+
+    def relative_dir(path):
+        # relpath is costly and a plan only has a handful of distinct directories
+        if path not in relative_dirs:
+            relative_dirs[path] = os.path.relpath(path, root)
+        return relative_dirs[path]
+
+    def relative(directory, name):
+        rel = relative_dir(directory)
+        return name if rel == "." else os.path.join(rel, name)
+
+    failed = {source for source, _ in failures}
+    moves = []
+    for source, folder, name in plan:
+        if source in failed:
+            continue
+        source_dir, source_name = os.path.split(source)
+        moves.append([relative(source_dir, source_name), relative(folder, name)])
+
+        source_record = journal["dirs"].get(relative_dir(source_dir))
+        if source_record is not None:
+            source_record["files"].discard(source_name)
+
+        target_record = journal["dirs"].get(relative_dir(folder))
+        if target_record is not None:
+            target_record["files"].add(name)
+
+    for source in failed:
+        record = journal["dirs"].get(relative_dir(os.path.dirname(source)))
+        if record is not None:
+            # Force a relisting even if nothing else changes in that directory
+            record["files"].discard(os.path.basename(source))
+            record["mtime_ns"] = None
+
+    if moves:
+        journal["last_run"] = {"time": time.time(), "moves": moves}
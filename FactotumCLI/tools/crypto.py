@@ -1,45 +1,578 @@
 from rich.console import Console
+from .. import http_client, metrics
 from ..logger import log_task
+from ..config import cache_path
+
+import json
+import os
+import shutil
+import time
+from urllib.parse import urlsplit
 
 CATEGORY = "Investment"
-DESCRIPTION = "Check the current price of a cryptocurrency (in CAD)."
+DESCRIPTION = "Check current cryptocurrency prices (in CAD by default)."
+
+# Overridable so lookups can be exercised against a local stub server
+COINGECKO_API_URL = os.getenv("COINGECKO_API_URL", "https://api.coingecko.com/api/v3").rstrip("/")
+
+# Requests per second to the API (0 for no limit); the keyless public API allows about 30 a minute
+COINGECKO_RATE = float(os.getenv("COINGECKO_RATE", "0.5"))
+COINGECKO_BURST = 5
+
+# Keep each simple/price URL comfortably below common URL length limits
+MAX_IDS_LENGTH = 1500
+
+# Longest pause between polls when the API keeps answering 429/5xx
+MAX_BACKOFF = 600
 
 console = Console()
 
+def _session():
+    """The shared HTTP client, with the CoinGecko host rate-limited."""
+    client = http_client.get_session()
+    client.limit(urlsplit(COINGECKO_API_URL).netloc, COINGECKO_RATE, COINGECKO_BURST)
+    return client
+
+
+def _split_list(value):
+    return [item.strip().lower() for item in value.split(",") if item.strip()]
+
+
+def _load_price_cache(cache_file):
+    try:
+        with open(cache_file, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_price_cache(cache_file, updates):
+    # Merge with whatever other invocations wrote in the meantime
+    cache = _load_price_cache(cache_file)
+    cache.update(updates)
+    tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_file, "w", encoding="utf-8") as file:
+            json.dump(cache, file)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        log_task(f"Could not write price cache: {e}")
+
+
+def _batches(coins):
+    """Group coin IDs so every comma-separated `ids` parameter stays under MAX_IDS_LENGTH."""
+    batch, length = [], 0
+    for coin in coins:
+        if batch and length + len(coin) + 1 > MAX_IDS_LENGTH:
+            yield batch
+            batch, length = [], 0
+        batch.append(coin)
+        length += len(coin) + 1
+    if batch:
+        yield batch
+
+
+def _fetch_prices(session, coins, vs_currencies):
+    """Resolve every coin/currency pair with as few simple/price calls as possible."""
+    prices = {}
+    for batch in _batches(coins):
+        with metrics.span("crypto.simple_price", network=True):
+            response = session.get(
+                f"{COINGECKO_API_URL}/simple/price",
+                params={"ids": ",".join(batch), "vs_currencies": ",".join(vs_currencies)},
+            )
+        metrics.count("bytes", len(response.content))
+        metrics.count("requests")
+        response.raise_for_status()
+        data = response.json()
+        for coin in batch:
+            for vs in vs_currencies:
+                prices[f"{coin}|{vs}"] = data.get(coin, {}).get(vs)
+    return prices
+
+
+def _get_prices(coins, vs_currencies, ttl=60, session=None):
+    """
+    Return {(coin, vs_currency): price or None}, served from the on-disk cache when fresh.
+
+    Only pairs that are missing or older than `ttl` seconds are requested, and
+    unknown coins are cached as None so they do not cost a request every run.
+    """
+    cache_file = cache_path("crypto", "prices.json")
+    cache = _load_price_cache(cache_file)
+    now = time.time()
+
+    stale = {
+        (coin, vs)
+        for coin in coins
+        for vs in vs_currencies
+        if f"{coin}|{vs}" not in cache or now - cache[f"{coin}|{vs}"][1] > ttl
+    }
+
+    if stale:
+        stale_coins = [coin for coin in coins if any((coin, vs) in stale for vs in vs_currencies)]
+        stale_vs = [vs for vs in vs_currencies if any((coin, vs) in stale for coin in coins)]
+        fetched = _fetch_prices(session or _session(), stale_coins, stale_vs)
+        updates = {key: [price, now] for key, price in fetched.items()}
+        cache.update(updates)
+        _save_price_cache(cache_file, updates)
+
+    return {(coin, vs): cache[f"{coin}|{vs}"][0] for coin in coins for vs in vs_currencies}
+
+
+def _format_price(price):
+    return f"{price:,.2f}" if price >= 1 else f"{price:.8g}"
+
+
+def _price_table(prices, coins, vs_currencies, title="💰 Crypto prices", caption=None):
+    from rich.table import Table
+
+    table = Table(title=title, caption=caption)
+    table.add_column("Coin", style="bold")
+    for vs in vs_currencies:
+        table.add_column(vs.upper(), justify="right")
+    for coin in coins:
+        table.add_row(coin, *[
+            _format_price(prices[(coin, vs)]) if prices.get((coin, vs)) is not None else "[yellow]n/a[/yellow]"
+            for vs in vs_currencies
+        ])
+    return table
+
+
+def _retry_after(response, delay):
+    """Next polling delay after a 429/5xx: honour Retry-After, otherwise double."""
+    try:
+        return min(MAX_BACKOFF, max(delay, float(response.headers["Retry-After"])))
+    except (KeyError, TypeError, ValueError):
+        return min(MAX_BACKOFF, delay * 2)
+
+
+def _watch_prices(coins, vs_currencies, interval):
+    """
+    Poll prices every `interval` seconds and redraw a live table in place.
+
+    Each poll goes through the shared pooled client, which already retries
+    briefly; 429 and 5xx answers that outlast those retries stretch the delay
+    until a poll succeeds again.
+    """
+    import requests
+    from rich.live import Live
+
+    interval = max(1.0, float(interval))
+    delay = interval
+    prices = {}
+    polls = 0
+    status = "starting..."
+
+    with Live(_price_table(prices, coins, vs_currencies), console=console, auto_refresh=False) as live:
+        try:
+            while True:
+                try:
+                    prices = _get_prices(coins, vs_currencies, ttl=0)
+                    polls += 1
+                    delay = interval
+                    status = f"updated {time.strftime('%H:%M:%S')}"
+                except requests.HTTPError as e:
+                    code = e.response.status_code if e.response is not None else None
+                    if code != 429 and (code is None or code < 500):
+                        raise
+                    delay = _retry_after(e.response, delay)
+                    status = f"[yellow]HTTP {code}, backing off[/yellow]"
+                    log_task(f"Crypto watch: HTTP {code}, next poll in {delay:.0f}s")
+                except requests.ConnectionError as e:
+                    delay = min(MAX_BACKOFF, delay * 2)
+                    status = "[yellow]connection error, backing off[/yellow]"
+                    log_task(f"Crypto watch: {e}, next poll in {delay:.0f}s")
+
+                caption = f"{status} · poll #{polls} · next in {delay:.0f}s · Ctrl+C to stop"
+                live.update(_price_table(prices, coins, vs_currencies, caption=caption), refresh=True)
+                time.sleep(delay)
+        except KeyboardInterrupt:
+            pass
+
+    console.print(f"👋 Stopped watching after {polls} poll(s).", style="bold cyan")
+    log_task(f"Crypto watch stopped after {polls} poll(s) for {', '.join(coins)}")
+
+
+def _print_prices(prices, coins, vs_currencies, output_format):
+    if output_format == "json":
+        result = {
+            coin: {vs: prices[(coin, vs)] for vs in vs_currencies}
+            for coin in coins
+        }
+        print(json.dumps(result, indent=2))
+        return
+
+    if output_format == "table":
+        console.print(_price_table(prices, coins, vs_currencies))
+        return
+
+    for coin in coins:
+        for vs in vs_currencies:
+            price = prices[(coin, vs)]
+            if price is None:
+                console.print(f"⚠️ Coin '{coin}' not found. Please check the coin ID.", style="bold yellow")
+                log_task(f"Coin '{coin}' not found.")
+                continue
+            if vs == "cad":
+                message = f"The current price of {coin.capitalize()} is: ${price:.2f} CAD"
+            else:
+                message = f"The current price of {coin.capitalize()} is: {_format_price(price)} {vs.upper()}"
+            console.print(f"💰 {message}", style="bold green")
+            log_task(message)
+
+
 # Function to check the current price of a cryptocurrency
-def check_crypto_price(coin: str = "bitcoin"):
+def check_crypto_price(
+    coin: str = "bitcoin",
+    coins: str = "",
+    vs_currencies: str = "cad",
+    output_format: str = "",
+    ttl: int = 60,
+    watch: bool = False,
+    interval: float = 30,
+):
     """
     Check the current price of a cryptocurrency (in CAD).
 
     Args:
         coin (str): The coin ID to check. Defaults to 'bitcoin'.
+        coins (str): Comma-separated coin IDs to check in one go (overrides 'coin').
+        vs_currencies (str): Comma-separated currencies to price in. Defaults to 'cad'.
+        output_format (str): 'text', 'table' or 'json'. Defaults to text for a single
+            price and a table otherwise.
+        ttl (int): Seconds a cached price stays fresh. Defaults to 60.
+        watch (bool): Keep polling and redraw a live table until Ctrl+C. Defaults to False.
+        interval (float): Seconds between polls in watch mode. Defaults to 30.
 
     Example:
         factotum --task check-crypto-price --coin ethereum
+        factotum --task check-crypto-price --coins bitcoin,ethereum,dogecoin --vs-currencies cad,usd --format json
+        factotum --task check-crypto-price --coins bitcoin,ethereum --watch --interval 15
 
     Description:
         Fetches real-time cryptocurrency prices using the CoinGecko API.
-        Displays the current price in Canadian Dollars (CAD).
+        Displays the current price in Canadian Dollars (CAD) unless other currencies are given.
         Supports any coin ID recognized by CoinGecko (e.g., 'bitcoin', 'ethereum', 'dogecoin').
+        All coins are resolved with as few batched requests as possible, and results are
+        cached on disk for 'ttl' seconds so repeated invocations share them.
+        Watch mode keeps one pooled connection open and backs off on 429/5xx responses.
     """
-    
+
     import requests
 
-    url = f"https://api.coingecko.com/api/v3/simple/price?ids={coin}&vs_currencies=cad"
+    coin_ids = _split_list(coins) if coins else _split_list(coin)
+    vs_list = _split_list(vs_currencies) or ["cad"]
 
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
+    if not output_format:
+        output_format = "text" if len(coin_ids) == 1 and len(vs_list) == 1 else "table"
+    if output_format not in ["text", "table", "json"]:
+        console.print(f"❌ Unknown output format '{output_format}'. Use text, table or json.", style="bold red")
+        return 1
 
-        data = response.json()
-        if coin in data:
-            price = data[coin]['cad']
-            message = f"The current price of {coin.capitalize()} is: ${price:.2f} CAD"
-            console.print(f"💰 {message}", style="bold green")
-            log_task(message)
-        else:
-            console.print(f"⚠️ Coin '{coin}' not found. Please check the coin ID.", style="bold yellow")
-            log_task(f"Coin '{coin}' not found.")
+    if watch:
+        try:
+            _watch_prices(coin_ids, vs_list, interval)
+        except requests.RequestException as e:
+            console.print(f"❌ Error fetching price: {e}", style="bold red")
+            log_task(f"Error fetching price: {e}")
+            return 1
+        return
+
+    try:
+        prices = _get_prices(coin_ids, vs_list, ttl=ttl)
     except requests.RequestException as e:
         console.print(f"❌ Error fetching price: {e}", style="bold red")
-        log_task(f"Error fetching price: {e}")
\ No newline at end of file
+        log_task(f"Error fetching price: {e}")
+        return 1
+
+    _print_prices(prices, coin_ids, vs_list, output_format)
+
+    if output_format != "text":
+        found = sum(price is not None for price in prices.values())
+        log_task(f"Checked {found} price(s) for {len(coin_ids)} coin(s) in {', '.join(vs_list).upper()}",
+                 task="check-crypto-price", coins=len(coin_ids), prices=found)
+
+
+def _history_dir(coin, vs):
+    return cache_path("crypto", "history", f"{coin}-{vs}", "current").parent
+
+
+def _history_files(coin, vs):
+    """
+    The (timestamps, prices) column files in use for one pair.
+
+    They live in the generation directory named by the pair's `current`
+    pointer (see _rewrite_history), or directly in the pair directory
+    until the first backfill.
+    """
+    pair_dir = _history_dir(coin, vs)
+    try:
+        generation = (pair_dir / "current").read_text().strip()
+    except OSError:
+        generation = ""
+    folder = pair_dir / generation if generation else pair_dir
+    return folder / "timestamps.i8", folder / "prices.f8"
+
+
+def _coverage_file(coin, vs):
+    return cache_path("crypto", "history", f"{coin}-{vs}", "covered_from")
+
+
+def _load_coverage(coin, vs):
+    """Earliest unix time (seconds) already requested: nothing older than the stored data exists after it."""
+    try:
+        return float(_coverage_file(coin, vs).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _save_coverage(coin, vs, start):
+    tmp_file = f"{_coverage_file(coin, vs)}.{os.getpid()}.tmp"
+    with open(tmp_file, "w") as file:
+        file.write(str(int(start)))
+    os.replace(tmp_file, _coverage_file(coin, vs))
+
+
+def _load_history(np, coin, vs):
+    """
+    Memory-map the stored (timestamp ms, price) columns for one pair.
+
+    Columns are raw little-endian int64/float64 files. If an append was cut
+    short the longer column is trimmed so both stay aligned.
+    """
+    ts_file, price_file = _history_files(coin, vs)
+    if not ts_file.exists() or not price_file.exists():
+        return np.empty(0, dtype="<i8"), np.empty(0, dtype="<f8")
+
+    count = min(ts_file.stat().st_size // 8, price_file.stat().st_size // 8)
+    for column in (ts_file, price_file):
+        if column.stat().st_size != count * 8:
+            os.truncate(column, count * 8)
+    if count == 0:
+        return np.empty(0, dtype="<i8"), np.empty(0, dtype="<f8")
+
+    return (
+        np.memmap(ts_file, dtype="<i8", mode="r", shape=(count,)),
+        np.memmap(price_file, dtype="<f8", mode="r", shape=(count,)),
+    )
+
+
+def _append_history(np, coin, vs, timestamps, prices):
+    ts_file, price_file = _history_files(coin, vs)
+    with open(ts_file, "ab") as file:
+        np.asarray(timestamps, dtype="<i8").tofile(file)
+    with open(price_file, "ab") as file:
+        np.asarray(prices, dtype="<f8").tofile(file)
+
+
+def _rewrite_history(np, coin, vs, timestamps, prices):
+    """
+    Replace both columns (only needed when backfilling older data).
+
+    Two renames cannot be atomic together, so both columns are written to a
+    new generation directory and a single rename of the `current` pointer
+    switches to it: a crash leaves either the old pair or the new one.
+    """
+    pair_dir = _history_dir(coin, vs)
+    generation = f"gen-{time.time_ns()}-{os.getpid()}"
+    folder = pair_dir / generation
+    folder.mkdir()
+    np.asarray(timestamps, dtype="<i8").tofile(folder / "timestamps.i8")
+    np.asarray(prices, dtype="<f8").tofile(folder / "prices.f8")
+    tmp_pointer = pair_dir / f"current.{os.getpid()}.tmp"
+    tmp_pointer.write_text(generation)
+    os.replace(tmp_pointer, pair_dir / "current")
+
+    # Older generations (and columns from before the first backfill) are no longer read
+    for entry in os.scandir(pair_dir):
+        if entry.name.startswith("gen-") and entry.name != generation:
+            shutil.rmtree(entry.path, ignore_errors=True)
+        elif entry.name in ("timestamps.i8", "prices.f8"):
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+
+def _fetch_range(np, coin, vs, start, end):
+    """Fetch market_chart/range points between two unix timestamps (seconds)."""
+    with metrics.span("crypto.market_chart_range", network=True):
+        response = _session().get(
+            f"{COINGECKO_API_URL}/coins/{coin}/market_chart/range",
+            params={"vs_currency": vs, "from": int(start), "to": int(end)},
+        )
+    metrics.count("bytes", len(response.content))
+    metrics.count("requests")
+    response.raise_for_status()
+    points = np.asarray(response.json().get("prices", []), dtype="<f8").reshape(-1, 2)
+    return points[:, 0].astype("<i8"), points[:, 1]
+
+
+def _update_history(np, coin, vs, days, refresh=3600):
+    """
+    Make sure the store covers the last `days` days and return its columns.
+
+    Only the missing ranges are downloaded: newer points are appended, and a
+    request reaching further back than the store triggers a one-off backfill.
+    The earliest time already asked for is remembered (`covered_from`), so a
+    coin younger than `days`, or a range the API caps, is not asked for again.
+    The tail is not refetched if it is less than `refresh` seconds old.
+    """
+    now = time.time()
+    start = now - days * 86400
+    timestamps, prices = _load_history(np, coin, vs)
+    fetched = 0
+
+    if len(timestamps) == 0:
+        new_ts, new_prices = _fetch_range(np, coin, vs, start, now)
+        _append_history(np, coin, vs, new_ts, new_prices)
+        if len(new_ts):
+            _save_coverage(coin, vs, start)
+        fetched += len(new_ts)
+    else:
+        first, last = timestamps[0] / 1000, timestamps[-1] / 1000
+        covered = min(first, _load_coverage(coin, vs) or first)
+        if start < covered - 86400:
+            old_ts, old_prices = _fetch_range(np, coin, vs, start, first)
+            keep = old_ts < timestamps[0]
+            if keep.any():
+                _rewrite_history(
+                    np, coin, vs,
+                    np.concatenate([old_ts[keep], timestamps]),
+                    np.concatenate([old_prices[keep], prices]),
+                )
+            _save_coverage(coin, vs, start)
+            fetched += int(keep.sum())
+        if now - last > refresh:
+            new_ts, new_prices = _fetch_range(np, coin, vs, last + 1, now)
+            keep = new_ts > timestamps[-1]
+            _append_history(np, coin, vs, new_ts[keep], new_prices[keep])
+            fetched += int(keep.sum())
+
+    if fetched:
+        log_task(f"Stored {fetched} new price point(s) for {coin}/{vs}")
+        timestamps, prices = _load_history(np, coin, vs)
+
+    first_kept = np.searchsorted(timestamps, int(start * 1000))
+    return timestamps[first_kept:], prices[first_kept:], fetched
+
+
+def _history_stats(np, timestamps, prices, window):
+    """
+    Vectorized statistics over daily closes.
+
+    The store mixes granularities (CoinGecko returns 5-minute, hourly or daily
+    points depending on the range), so the series is first reduced to the last
+    price of every UTC day; every statistic, period ones included, is computed
+    on those closes so densely sampled recent days do not outweigh older ones.
+    Rolling min/max/mean use a sliding window view and volatility is the
+    annualized standard deviation of daily log returns.
+    """
+    from numpy.lib.stride_tricks import sliding_window_view
+
+    days = timestamps // 86_400_000
+    # np.unique keeps the first occurrence, so scan backwards to get each day's last price
+    _, last_index = np.unique(days[::-1], return_index=True)
+    closes = np.asarray(prices[::-1][last_index], dtype="<f8")
+
+    window = max(2, min(int(window), len(closes)))
+    stats = {
+        "points": int(len(prices)),
+        "days": int(len(closes)),
+        "latest": float(closes[-1]),
+        "period_min": float(closes.min()),
+        "period_max": float(closes.max()),
+        "period_mean": float(closes.mean()),
+        "window": window,
+    }
+
+    if len(closes) >= 2:
+        rolling = sliding_window_view(closes, window)
+        stats["rolling_min"] = float(rolling[-1].min())
+        stats["rolling_max"] = float(rolling[-1].max())
+        stats["rolling_mean"] = float(rolling[-1].mean())
+        log_returns = np.diff(np.log(closes))
+        if len(log_returns) >= window - 1 >= 2:
+            returns_window = sliding_window_view(log_returns, window - 1)
+            volatility = returns_window.std(axis=1, ddof=1) * np.sqrt(365)
+            stats["rolling_volatility"] = float(volatility[-1])
+
+    return stats
+
+
+def crypto_price_history(coin: str = "bitcoin", coins: str = "", vs_currencies: str = "cad", days: int = 365, window: int = 30, output_format: str = ""):
+    """
+    Fetch historical prices and show rolling statistics.
+
+    Args:
+        coin (str): The coin ID to analyse. Defaults to 'bitcoin'.
+        coins (str): Comma-separated coin IDs to analyse in one go (overrides 'coin').
+        vs_currencies (str): Comma-separated currencies. Defaults to 'cad'.
+        days (int): How many days of history to cover. Defaults to 365.
+        window (int): Rolling window, in days. Defaults to 30.
+        output_format (str): 'table' or 'json'. Defaults to 'table'.
+
+    Example:
+        factotum --task crypto-price-history --coins bitcoin,ethereum --days 1095 --window 30
+
+    Description:
+        Downloads CoinGecko market_chart data into a compact local store (one
+        binary column per field, memory-mapped on read). Later runs only fetch
+        the time range that is missing, so repeated or overlapping queries are
+        answered locally. Statistics are computed with NumPy: period min/max/mean,
+        plus rolling min/max/mean and annualized volatility over the last window.
+    """
+
+    import requests
+
+    try:
+        import numpy as np
+    except ImportError:
+        console.print("❌ This task needs NumPy. Install it with: pip install numpy", style="bold red")
+        return 1
+
+    coin_ids = _split_list(coins) if coins else _split_list(coin)
+    vs_list = _split_list(vs_currencies) or ["cad"]
+    output_format = output_format or "table"
+    if output_format not in ["table", "json"]:
+        console.print(f"❌ Unknown output format '{output_format}'. Use table or json.", style="bold red")
+        return 1
+
+    results = {}
+    errors = 0
+    for coin_id in coin_ids:
+        for vs in vs_list:
+            try:
+                timestamps, prices, _ = _update_history(np, coin_id, vs, days)
+            except requests.RequestException as e:
+                console.print(f"❌ Error fetching history for {coin_id}/{vs}: {e}", style="bold red")
+                log_task(f"Error fetching history for {coin_id}/{vs}: {e}")
+                errors += 1
+                continue
+            if len(prices) == 0:
+                console.print(f"⚠️ No history found for '{coin_id}' in {vs.upper()}.", style="bold yellow")
+                continue
+            results[(coin_id, vs)] = _history_stats(np, timestamps, prices, window)
+
+    if output_format == "json":
+        print(json.dumps({f"{coin_id}/{vs}": stats for (coin_id, vs), stats in results.items()}, indent=2))
+    elif results:
+        from rich.table import Table
+
+        table = Table(title=f"📈 Price history — last {days} days, {window}-day rolling window")
+        for column in ["Pair", "Latest", "Min", "Max", "Mean", "Roll. min", "Roll. max", "Roll. mean", "Volatility"]:
+            table.add_column(column, justify="left" if column == "Pair" else "right")
+        for (coin_id, vs), stats in results.items():
+            cells = [
+                _format_price(stats[key]) if key in stats else "n/a"
+                for key in ["latest", "period_min", "period_max", "period_mean", "rolling_min", "rolling_max", "rolling_mean"]
+            ]
+            volatility = f"{stats['rolling_volatility']:.1%}" if "rolling_volatility" in stats else "n/a"
+            table.add_row(f"{coin_id}/{vs}", *cells, volatility)
+        console.print(table)
+
+    log_task(f"Price history: {len(results)} pair(s), {days} days, window {window}")
+    if errors:
+        return 1
+
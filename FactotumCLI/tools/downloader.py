@@ -1,40 +1,845 @@
 from rich.console import Console
+from .. import http_client, metrics
 from ..logger import log_task
 
+import codecs
+import hashlib
+import html
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from html.parser import HTMLParser
+from urllib.parse import quote, unquote, urldefrag, urljoin, urlsplit
+
+from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, MofNCompleteColumn, TimeElapsedColumn
+
+from ._http_cache import HTTPCache
+
 CATEGORY = "File Management"
 DESCRIPTION = "Download a webpage and save it locally."
 
+# Bytes read from the socket and written to disk at a time
+CHUNK_SIZE = 256 * 1024
+
 console = Console()
 
+def _parse_checksum(checksum):
+    """Split 'sha256:<hex>' (or a bare sha256 hex digest) into (algorithm, digest)."""
+    algorithm, _, digest = checksum.rpartition(":")
+    algorithm = (algorithm or "sha256").lower()
+    if algorithm not in hashlib.algorithms_available:
+        raise ValueError(f"Unsupported checksum algorithm '{algorithm}'")
+    return algorithm, digest.strip().lower()
+
+
+def _hash_file(path, algorithm):
+    digest = hashlib.new(algorithm)
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest
+
+
+def _download_progress():
+    from rich.progress import DownloadColumn, TransferSpeedColumn, TimeRemainingColumn
+
+    return Progress(
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        DownloadColumn(),
+        TransferSpeedColumn(),
+        TimeRemainingColumn(),
+        console=console,
+        transient=True,
+    )
+
+
+def _validator(response):
+    """The response's strong ETag, else its Last-Modified date: what If-Range accepts."""
+    etag = response.headers.get("ETag", "")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return response.headers.get("Last-Modified", "")
+
+
+def _read_validator(path):
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return file.read().strip()
+    except OSError:
+        return ""
+
+
+def _remove(*paths):
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _stream_to_file(session, url, output, resume=True, algorithm=None, progress=None, quiet=False, headers=None, retries=None):
+    """
+    Stream `url` into `output` through `<output>.part` and rename it into place.
+
+    If a partial file is left over from an interrupted run and `resume` is set,
+    only the missing bytes are requested, with a Range header and an If-Range
+    validator (the ETag or Last-Modified of the first response, kept in
+    `<output>.part.validator`). If the resource changed since, or the server
+    ignores the range, the answer is a plain 200 and the download restarts
+    from zero; a partial file without a validator is never resumed. `quiet`
+    skips the per-file progress bar (bulk mode tracks files, not bytes).
+    A 304 answer to conditional `headers` leaves every file untouched.
+    `retries` overrides the client's retry count for the request.
+
+    Returns a dict with the bytes written this run, the total size on disk,
+    the hash object (or None), the HTTP status, the time to first byte and
+    the response headers.
+    """
+    part_file = f"{output}.part"
+    validator_file = f"{part_file}.validator"
+    validator = _read_validator(validator_file) if resume and os.path.exists(part_file) else ""
+    offset = os.path.getsize(part_file) if validator else 0
+
+    headers = dict(headers or {})
+    if offset:
+        headers["Range"] = f"bytes={offset}-"
+        headers["If-Range"] = validator
+    restart = False
+    with metrics.span("downloader.request", network=True), \
+            session.get(url, headers=headers, stream=True, retries=retries) as response:
+        metrics.count("requests")
+        status = response.status_code
+        latency = response.elapsed.total_seconds()
+        if status == 304:
+            return {"written": 0, "size": 0, "digest": None, "status": status,
+                    "latency": latency, "headers": response.headers}
+        if status == 416 and offset:
+            # Only complete if the server's size ("bytes */N") is what we already have
+            written = 0
+            restart = response.headers.get("Content-Range", "").strip() != f"bytes */{offset}"
+        else:
+            response.raise_for_status()
+            if offset and status != 206:
+                offset = 0
+            if not offset:
+                # Written before the body, so an interrupted download can be resumed safely
+                validator = _validator(response)
+                if validator:
+                    with open(validator_file, "w", encoding="utf-8") as file:
+                        file.write(validator)
+                else:
+                    _remove(validator_file)
+
+            length = response.headers.get("Content-Length")
+            total = offset + int(length) if length is not None else None
+            written = 0
+
+            if quiet:
+                progress_context = nullcontext(None)
+            elif progress is not None:
+                progress_context = nullcontext(progress)
+            else:
+                progress_context = _download_progress()
+
+            with progress_context as progress:
+                task = progress.add_task(
+                    description=f"⬇️ {os.path.basename(output)}", total=total, completed=offset,
+                ) if progress is not None else None
+                with open(part_file, "ab" if offset else "wb") as file:
+                    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                        file.write(chunk)
+                        written += len(chunk)
+                        metrics.count("bytes", len(chunk))
+                        if task is not None:
+                            progress.advance(task, len(chunk))
+                if task is not None:
+                    progress.remove_task(task)
+
+    if restart:
+        _remove(part_file, validator_file)
+        return _stream_to_file(
+            session, url, output, resume=False, algorithm=algorithm, progress=progress, quiet=quiet,
+            headers={k: v for k, v in headers.items() if k not in ("Range", "If-Range")}, retries=retries,
+        )
+
+    with metrics.span("downloader.hash"):
+        digest = _hash_file(part_file, algorithm) if algorithm else None
+    size = os.path.getsize(part_file)
+    os.replace(part_file, output)
+    _remove(validator_file)
+    metrics.count("files")
+    return {"written": written, "size": size, "digest": digest, "status": status,
+            "latency": latency, "headers": response.headers}
+
+
+def _fetch(session, url, output, cache=None, algorithm=None, **options):
+    """
+    Download `url` to `output` through the HTTP cache.
+
+    Fresh entries are copied from the blob store without any request, stale
+    ones are revalidated with If-None-Match/If-Modified-Since, and new bodies
+    are added to the store. The result gains a "cache" key: hit, revalidated,
+    miss or None when caching is off.
+    """
+    entry = cache.lookup(url) if cache is not None else None
+
+    if entry is not None and cache.is_fresh(entry):
+        with metrics.span("downloader.cache_hit"):
+            cache.materialize(url, entry, output)
+        metrics.count("files")
+        result = {"written": 0, "size": entry["size"], "digest": None, "status": 200,
+                  "latency": 0.0, "headers": {}, "cache": "hit"}
+    else:
+        # A leftover .part file means we are resuming a body, not revalidating one
+        conditional = entry is not None and not os.path.exists(f"{output}.part")
+        result = _stream_to_file(
+            session, url, output, algorithm=algorithm,
+            headers=cache.conditional_headers(entry) if conditional else None, **options,
+        )
+        if result["status"] == 304:
+            cache.revalidated(url, result["headers"])
+            with metrics.span("downloader.cache_revalidated"):
+                cache.materialize(url, entry, output)
+            metrics.count("files")
+            result.update(size=entry["size"], status=200, cache="revalidated")
+        elif cache is not None:
+            known = result["digest"].hexdigest() if algorithm == "sha256" and result["digest"] else None
+            try:
+                with metrics.span("downloader.cache_store"):
+                    cache.store(url, output, result["headers"], digest=known)
+            except (OSError, sqlite3.Error) as e:
+                log_task(f"Could not cache {url}: {e}")
+            result["cache"] = "miss"
+        else:
+            result["cache"] = None
+
+    if algorithm and result["digest"] is None:
+        result["digest"] = _hash_file(output, algorithm)
+    return result
+
+
 # Function to download a webpage
-def download_webpage(url: str, output: str = "downloaded_page.html"):
+def download_webpage(url: str, output: str = "downloaded_page.html", resume: bool = True, checksum: str = "", cache: bool = True, progress=None):
     """
     Download a webpage and save it locally.
 
     Args:
         url (str): The URL of the webpage to download.
-        output_file (str): The name of the output HTML file. Defaults to 'downloaded_page.html'.
+        output (str): The name of the output file. Defaults to 'downloaded_page.html'.
+        resume (bool): Continue an interrupted download from its '.part' file. Defaults to True.
+        checksum (str): Expected digest as 'sha256:<hex>' (any hashlib algorithm works).
+        cache (bool): Serve and revalidate through the local HTTP cache. Defaults to True.
 
     Example:
         factotum --task download-webpage --url https://example.com --output example.html
+        factotum --task download-webpage --url https://example.com/big.iso --output big.iso --checksum sha256:9f86d0...
 
     Description:
-        Downloads the HTML content of the given webpage and saves it to a local file.
+        Downloads the content of the given URL and saves it to a local file.
+        The body is streamed to disk as raw bytes (so binary files are kept intact)
+        through a temporary '.part' file that is renamed into place once complete.
+        Bodies are kept in a content-addressed local cache, so downloading the same
+        page again only costs a conditional request (or nothing while it is fresh).
         Useful for offline reading, backups, or basic web archiving.
     """
-    
+
     import requests
-    
+
     try:
-        response = requests.get(url)
-        response.raise_for_status()
+        algorithm, expected = _parse_checksum(checksum) if checksum else (None, None)
+    except ValueError as e:
+        console.print(f"❌ {e}", style="bold red")
+        return 1
 
-        with open(output, 'w', encoding='utf-8') as file:
-            file.write(response.text)
+    http_cache = HTTPCache() if cache else None
+    try:
+        result = _fetch(
+            http_client.get_session(), url, output, cache=http_cache, resume=resume, algorithm=algorithm, progress=progress,
+        )
+        written, size, digest = result["written"], result["size"], result["digest"]
 
-        console.print(f"✅ Webpage downloaded successfully: {output}", style="bold green")
-        log_task(f"Webpage downloaded: {url} -> {output}")
+        if digest is not None and digest.hexdigest() != expected:
+            os.replace(output, f"{output}.corrupt")
+            console.print(
+                f"❌ Checksum mismatch for {output}: expected {expected}, got {digest.hexdigest()}",
+                style="bold red",
+            )
+            log_task(f"Checksum mismatch: {url} -> {output}")
+            return 1
+
+        if result["cache"] == "hit":
+            note = ", from cache"
+        elif result["cache"] == "revalidated":
+            note = ", unchanged on server (304)"
+        elif written < size:
+            note = f", resumed after {size - written} bytes"
+        else:
+            note = ""
+        console.print(f"✅ Webpage downloaded successfully: {output} ({size} bytes{note})", style="bold green")
+        if digest is not None:
+            console.print(f"🔒 {algorithm} verified: {digest.hexdigest()}", style="bold green")
+        log_task(f"Webpage downloaded: {url} -> {output} ({size} bytes)", task="download-webpage", url=url, bytes=size)
 
     except requests.RequestException as e:
         console.print(f"❌ Error downloading webpage: {e}", style="bold red")
-        log_task(f"Error downloading webpage: {e}")
\ No newline at end of file
+        if resume and os.path.exists(f"{output}.part"):
+            console.print("↩️ Run the same command again to resume the download.", style="yellow")
+        log_task(f"Error downloading webpage: {e}")
+        return 1
+    finally:
+        if http_cache is not None:
+            http_cache.close()
+
+
+class _HostLimiter:
+    """Per-host concurrency cap plus a token bucket allowing `rate` requests per second."""
+
+    def __init__(self, concurrency, rate):
+        self.slots = threading.BoundedSemaphore(max(1, concurrency))
+        self.bucket = http_client.TokenBucket(rate)
+
+    def wait_for_token(self):
+        self.bucket.acquire()
+
+
+def _read_urls(source):
+    """URLs from a file (or stdin for '-'), one per line; blank lines and # comments are skipped."""
+    if source == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(source, "r", encoding="utf-8") as file:
+            lines = file.read().splitlines()
+    urls = [line.strip() for line in lines if line.strip() and not line.strip().startswith("#")]
+    # Keep the first occurrence of every URL
+    return list(dict.fromkeys(urls))
+
+
+def _output_path(output_dir, url):
+    """
+    Deterministic `<output_dir>/<host>/<path>` location for a URL.
+
+    Directory-like paths (a trailing slash or no extension) are saved as
+    `<path>/index.html`, so `/docs` and `/docs/intro` can both be stored.
+    """
+    parts = urlsplit(url)
+    path = unquote(parts.path).lstrip("/")
+    if path and not path.endswith("/") and not os.path.splitext(path.rsplit("/", 1)[-1])[1]:
+        path += "/"
+    if not path or path.endswith("/"):
+        path += "index.html"
+    if parts.query:
+        stem, ext = os.path.splitext(path)
+        path = f"{stem}-{hashlib.sha1(parts.query.encode('utf-8')).hexdigest()[:8]}{ext}"
+    safe = [re.sub(r"[^\w.\-]", "_", segment) or "_" for segment in path.split("/") if segment not in ("", ".", "..")]
+    return os.path.join(output_dir, re.sub(r"[^\w.\-]", "_", parts.netloc) or "_", *safe)
+
+
+def _parents(path):
+    parent = os.path.dirname(path)
+    while parent and parent != os.path.dirname(parent):
+        yield parent
+        parent = os.path.dirname(parent)
+
+
+class _Destinations:
+    """
+    Hands out one local path per URL.
+
+    Different URLs can sanitise to the same path, or need a file where another
+    URL needs a directory (`/a.txt` and `/a.txt/b`); the later URL gets a
+    hash suffix on the clashing name instead, so no two downloads share a file.
+    """
+
+    def __init__(self):
+        self.files = {}     # path -> URL
+        self.dirs = set()
+
+    def claim(self, url, path):
+        if self.files.get(path) == url:
+            return path
+        candidate, attempt = path, 0
+        while True:
+            # Deepest parent first: that is the name to change
+            clash = next((parent for parent in _parents(candidate) if parent in self.files), None)
+            if clash is None and (candidate in self.files or candidate in self.dirs):
+                clash = candidate
+            if clash is None:
+                break
+            attempt += 1
+            stem, ext = os.path.splitext(clash)
+            suffix = hashlib.sha1(f"{url}#{attempt}".encode("utf-8")).hexdigest()[:8]
+            candidate = f"{stem}-{suffix}{ext}{candidate[len(clash):]}"
+        self.files[candidate] = url
+        self.dirs.update(_parents(candidate))
+        return candidate
+
+
+def _download_one(session, limiter, url, destination, retries, cache=None):
+    """Download one URL with retries; never raises, returns a manifest record."""
+    import requests
+
+    record = {"url": url, "path": destination, "status": "error", "http_status": None,
+              "bytes": 0, "latency": None, "elapsed": None, "attempts": 0, "cache": None, "error": None}
+    start = time.perf_counter()
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+
+    for attempt in range(retries + 1):
+        record["attempts"] = attempt + 1
+        response = None
+        with limiter.slots:
+            try:
+                entry = cache.lookup(url) if cache is not None else None
+                # Fresh cache hits never reach the network, so they skip the rate limit
+                if entry is None or not cache.is_fresh(entry):
+                    limiter.wait_for_token()
+                # Retries happen here, where an interrupted body can be resumed
+                result = _fetch(session, url, destination, cache=cache, quiet=True, retries=0)
+                record.update(status="ok", http_status=result["status"], bytes=result["size"],
+                              latency=round(result["latency"], 4), cache=result["cache"], error=None)
+                break
+            except requests.HTTPError as e:
+                response = e.response
+                record.update(http_status=response.status_code if response is not None else None, error=str(e))
+                if response is None or response.status_code not in http_client.RETRY_STATUSES:
+                    break
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                record["error"] = str(e)
+            except (requests.RequestException, OSError) as e:
+                record["error"] = str(e)
+                break
+        if attempt < retries:
+            time.sleep(http_client.retry_delay(attempt, response))
+
+    record["elapsed"] = round(time.perf_counter() - start, 4)
+    return record
+
+
+def download_webpages(url_file: str = "-", output_dir: str = "downloads", jobs: int = 8, per_host: int = 4, rate: float = 0, retries: int = 3, manifest: str = "", cache: bool = True, progress=None):
+    """
+    Download many URLs concurrently.
+
+    Args:
+        url_file (str): File with one URL per line, or '-' to read from stdin. Defaults to '-'.
+        output_dir (str): Directory to save files into (as <host>/<path>). Defaults to 'downloads'.
+        jobs (int): Total number of concurrent downloads. Defaults to 8.
+        per_host (int): Maximum concurrent downloads per host. Defaults to 4.
+        rate (float): Maximum requests per second per host, 0 for no limit. Defaults to 0.
+        retries (int): Retries for connection errors, 429 and 5xx. Defaults to 3.
+        manifest (str): JSON-lines results file. Defaults to '<output_dir>/manifest.jsonl'.
+        cache (bool): Serve and revalidate through the local HTTP cache. Defaults to True.
+
+    Example:
+        factotum --task download-webpages --url-file urls.txt --jobs 16 --per-host 4 --rate 10
+        cat urls.txt | factotum --task download-webpages --output-dir archive
+
+    Description:
+        Runs a thread pool over one pooled keep-alive session, so connections to
+        the same host are reused. Downloads are streamed and resumable like
+        download-webpage, retried with jittered exponential backoff (honouring
+        Retry-After), and every URL gets a manifest record with its status,
+        bytes, latency, elapsed time and cache outcome (hit, revalidated, miss).
+    """
+
+    try:
+        urls = _read_urls(url_file)
+    except OSError as e:
+        console.print(f"❌ Could not read URL list: {e}", style="bold red")
+        return 1
+    if not urls:
+        console.print("❌ No URLs to download.", style="bold red")
+        return 1
+
+    jobs = max(1, int(jobs))
+    manifest = manifest or os.path.join(output_dir, "manifest.jsonl")
+    os.makedirs(output_dir, exist_ok=True)
+
+    destinations = _Destinations()
+    paths = {url: destinations.claim(url, _output_path(output_dir, url)) for url in urls}
+    hosts = {urlsplit(url).netloc for url in urls}
+    limiters = {host: _HostLimiter(per_host, float(rate)) for host in hosts}
+    counts = {"ok": 0, "error": 0}
+    cache_counts = {"hit": 0, "revalidated": 0, "miss": 0}
+    total_bytes = 0
+    start = time.perf_counter()
+    http_cache = HTTPCache() if cache else None
+
+    session = http_client.get_session(jobs)
+
+    with open(manifest, "w", encoding="utf-8") as manifest_file:
+        with (nullcontext(progress) if progress is not None else Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            TimeElapsedColumn(),
+            console=console,
+        )) as progress:
+            task = progress.add_task(description="⬇️ Downloading...", total=len(urls))
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                futures = [
+                    executor.submit(
+                        _download_one, session, limiters[urlsplit(url).netloc],
+                        url, paths[url], retries, http_cache,
+                    )
+                    for url in urls
+                ]
+                for future in as_completed(futures):
+                    record = future.result()
+                    counts[record["status"]] += 1
+                    if record["cache"]:
+                        cache_counts[record["cache"]] += 1
+                    total_bytes += record["bytes"]
+                    manifest_file.write(json.dumps(record) + "\n")
+                    if record["status"] != "ok":
+                        console.print(f"❌ {record['url']}: {record['error']}", style="bold red")
+                    progress.advance(task)
+            progress.remove_task(task)
+
+    if http_cache is not None:
+        http_cache.close()
+
+    elapsed = time.perf_counter() - start
+    console.print("\n[bold cyan]📊 Download Summary:[/bold cyan]")
+    console.print(f"✅ Downloaded: [bold green]{counts['ok']}[/bold green]")
+    console.print(f"❌ Failed: [bold red]{counts['error']}[/bold red]")
+    if http_cache is not None:
+        console.print(
+            f"🗄️ Cache: {cache_counts['hit']} hit(s), {cache_counts['revalidated']} revalidated, "
+            f"{cache_counts['miss']} miss(es)"
+        )
+    console.print(f"📦 Total: [bold magenta]{total_bytes / 1e6:.2f}[/bold magenta] MB "
+                  f"at [bold magenta]{total_bytes / 1e6 / elapsed:.2f}[/bold magenta] MB/s, "
+                  f"[bold magenta]{len(urls) / elapsed:.1f}[/bold magenta] URLs/s")
+    console.print(f"🕒 Total time: [bold magenta]{elapsed:.2f}[/bold magenta] seconds")
+    console.print(f"🧾 Manifest: {manifest}\n")
+    log_task(
+        f"Bulk download: {counts['ok']} ok, {counts['error']} failed, "
+        f"{total_bytes} bytes in {elapsed:.2f}s -> {manifest}",
+        task="download-webpages", urls=len(urls), ok=counts["ok"], failed=counts["error"],
+        bytes=total_bytes, duration=round(elapsed, 3),
+    )
+    if counts["error"]:
+        return 1
+
+
+# Tag/attribute pairs that point at page assets
+ASSET_ATTRIBUTES = {
+    ("img", "src"), ("img", "srcset"), ("script", "src"), ("source", "src"), ("source", "srcset"),
+    ("video", "poster"), ("audio", "src"), ("video", "src"), ("input", "src"), ("embed", "src"),
+}
+ASSET_LINK_RELS = {"stylesheet", "icon", "shortcut", "apple-touch-icon", "preload", "manifest"}
+HTML_EXTENSIONS = (".html", ".htm")
+CSS_URL = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)|@import\s+(['"])([^'"]+)\3""")
+HTML_URL_ATTRIBUTE = re.compile(r"""\b(src|href|srcset|poster)(\s*=\s*)(["'])(.*?)\3""", re.IGNORECASE | re.DOTALL)
+CONTENT_TYPE_CHARSET = re.compile(r"""charset\s*=\s*["']?([\w.:\-]+)""", re.IGNORECASE)
+DOCUMENT_CHARSET = re.compile(rb"""<meta\b[^>]*?charset\s*=\s*["']?([\w.:\-]+)|@charset\s+["']([\w.:\-]+)""", re.IGNORECASE)
+
+
+class _LinkParser(HTMLParser):
+    """Collects asset URLs and page links while the HTML is fed to it chunk by chunk."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.base = None
+        self.assets = []
+        self.links = []
+        self.styles = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {name: value for name, value in attrs if value}
+        if tag == "base" and "href" in attrs and self.base is None:
+            self.base = attrs["href"]
+        elif tag == "link" and "href" in attrs:
+            rels = set(attrs.get("rel", "").lower().split())
+            if rels & ASSET_LINK_RELS:
+                self.assets.append(attrs["href"])
+        elif tag == "a" and "href" in attrs:
+            self.links.append(attrs["href"])
+        for name, value in attrs.items():
+            if (tag, name) in ASSET_ATTRIBUTES:
+                if name == "srcset":
+                    self.assets.extend(candidate.split()[0] for candidate in value.split(",") if candidate.strip())
+                else:
+                    self.assets.append(value)
+            elif name == "style":
+                self.styles.append(value)
+
+
+def _charset(path, headers):
+    """
+    Encoding of a saved page or stylesheet: the Content-Type charset, then a
+    <meta charset> or @charset near the top of the file, then UTF-8.
+    """
+    candidates = CONTENT_TYPE_CHARSET.findall(headers.get("Content-Type", ""))
+    with open(path, "rb") as file:
+        match = DOCUMENT_CHARSET.search(file.read(4096))
+    if match:
+        candidates.append((match.group(1) or match.group(2)).decode("ascii"))
+    for candidate in candidates:
+        try:
+            return codecs.lookup(candidate).name
+        except LookupError:
+            continue
+    return "utf-8"
+
+
+def _parse_html(path, charset="utf-8"):
+    """Parse a saved page in 64 KiB chunks; returns the filled _LinkParser."""
+    parser = _LinkParser()
+    with open(path, "r", encoding=charset, errors="replace") as file:
+        for chunk in iter(lambda: file.read(64 * 1024), ""):
+            parser.feed(chunk)
+    parser.close()
+    return parser
+
+
+def _css_urls(text):
+    return [match.group(2) or match.group(4) for match in CSS_URL.finditer(text)]
+
+
+def _absolute(base, reference):
+    """Resolve a reference against its page; None for data:, javascript:, mailto:, ..."""
+    reference = reference.strip()
+    if not reference or reference.startswith("#"):
+        return None
+    url = urldefrag(urljoin(base, reference))[0]
+    return url if urlsplit(url).scheme in ("http", "https") else None
+
+
+def _page_path(output_dir, url):
+    path = _output_path(output_dir, url)
+    return path if path.lower().endswith(HTML_EXTENSIONS) else f"{path}.html"
+
+
+def _is_css(url, headers):
+    return "text/css" in headers.get("Content-Type", "") or urlsplit(url).path.lower().endswith(".css")
+
+
+def _rewrite(path, base, local_files, is_html, charset="utf-8"):
+    """
+    Point every fetched URL referenced by `path` at its local copy.
+
+    The file is edited as bytes (read as latin-1, which maps each byte to one
+    character and back), so text in any ASCII-compatible encoding is written
+    back untouched. References are decoded with `charset` only to look them
+    up, and replaced by percent-encoded, ASCII-only relative paths.
+    """
+    if "a".encode(charset, errors="ignore") != b"a":
+        # UTF-16 and friends: the byte-level patterns below cannot match
+        return
+    directory = os.path.dirname(path)
+
+    def local(reference):
+        text = reference.encode("latin-1").decode(charset, errors="replace")
+        url = _absolute(base, html.unescape(text) if is_html else text)
+        if url is None or url not in local_files:
+            return reference
+        return quote(os.path.relpath(local_files[url], directory).replace(os.sep, "/"), safe="/")
+
+    def rewrite_css(match):
+        if match.group(2):
+            return f"url({match.group(1)}{local(match.group(2))}{match.group(1)})"
+        return f"@import {match.group(3)}{local(match.group(4))}{match.group(3)}"
+
+    def rewrite_attribute(match):
+        name, equals, quote, value = match.groups()
+        if name.lower() == "srcset":
+            value = ", ".join(
+                " ".join([local(candidate.split()[0]), *candidate.split()[1:]])
+                for candidate in value.split(",") if candidate.strip()
+            )
+        else:
+            value = local(value)
+        return f"{name}{equals}{quote}{value}{quote}"
+
+    with open(path, "r", encoding="latin-1") as file:
+        text = file.read()
+    rewritten = CSS_URL.sub(rewrite_css, text)
+    if is_html:
+        rewritten = HTML_URL_ATTRIBUTE.sub(rewrite_attribute, rewritten)
+    if rewritten != text:
+        with open(path, "w", encoding="latin-1") as file:
+            file.write(rewritten)
+
+
+class _Budget:
+    """Shared byte budget; workers stop fetching once it is spent."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.used = 0
+        self.lock = threading.Lock()
+
+    def exhausted(self):
+        with self.lock:
+            return self.max_bytes > 0 and self.used >= self.max_bytes
+
+    def spend(self, size):
+        with self.lock:
+            self.used += size
+
+
+def _mirror_fetch(session, cache, budget, url, destination):
+    """Fetch one page or asset; returns (url, destination, result or None, error)."""
+    import requests
+
+    if budget.exhausted():
+        return url, destination, None, "size budget exhausted"
+    try:
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        result = _fetch(session, url, destination, cache=cache, resume=False, quiet=True)
+        budget.spend(result["size"])
+        return url, destination, result, None
+    except (requests.RequestException, OSError) as e:
+        return url, destination, None, str(e)
+
+
+def mirror_webpage(url: str = "", url_file: str = "", output_dir: str = "mirror", depth: int = 0, max_bytes: int = 100_000_000, jobs: int = 8, cache: bool = True, progress=None):
+    """
+    Save web pages together with their stylesheets, scripts and images.
+
+    Args:
+        url (str): Page to mirror.
+        url_file (str): File with one page URL per line ('-' for stdin), mirrored as one batch.
+        output_dir (str): Directory to write the mirror into. Defaults to 'mirror'.
+        depth (int): How many levels of same-site links to follow. Defaults to 0 (only the given pages).
+        max_bytes (int): Stop fetching once this many bytes were downloaded (0 for no limit).
+            Defaults to 100 MB.
+        jobs (int): Number of concurrent downloads. Defaults to 8.
+        cache (bool): Serve and revalidate through the local HTTP cache. Defaults to True.
+
+    Example:
+        factotum --task mirror-webpage --url https://example.com --depth 1 --output-dir example_mirror
+
+    Description:
+        Each saved page is parsed incrementally to discover stylesheets, scripts,
+        images (including srcset) and CSS url()/@import references, which are then
+        fetched concurrently. Every URL is fetched at most once per batch, even when
+        many pages share the same assets. Links in pages and stylesheets are rewritten
+        to relative local paths so the copy works offline.
+    """
+
+    try:
+        start_urls = ([url] if url else []) + (_read_urls(url_file) if url_file else [])
+    except OSError as e:
+        console.print(f"❌ Could not read URL list: {e}", style="bold red")
+        return 1
+    start_urls = [u for u in (_absolute(u, u) for u in start_urls) if u]
+    if not start_urls:
+        console.print("❌ Please provide a page with --url or --url-file.", style="bold red")
+        return 1
+
+    jobs = max(1, int(jobs))
+    budget = _Budget(int(max_bytes))
+    http_cache = HTTPCache() if cache else None
+    seen = set()
+    destinations = _Destinations()
+    local_files = {}      # absolute URL -> saved path
+    documents = []        # (path, base URL, is_html, charset) to rewrite at the end
+    failures = []
+    start = time.perf_counter()
+
+    def run_wave(executor, targets):
+        """Fetch {url: destination} concurrently, skipping anything already seen."""
+        futures = []
+        for target_url, destination in targets.items():
+            if target_url in seen:
+                continue
+            seen.add(target_url)
+            destination = destinations.claim(target_url, destination)
+            futures.append(executor.submit(_mirror_fetch, session, http_cache, budget, target_url, destination))
+        for future in as_completed(futures):
+            fetched_url, destination, result, error = future.result()
+            if result is None:
+                failures.append((fetched_url, error))
+                log_task(f"Mirror: failed {fetched_url}: {error}")
+            else:
+                local_files[fetched_url] = destination
+                yield fetched_url, destination, result
+            progress.advance(task)
+
+    session = http_client.get_session(jobs)
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        with (nullcontext(progress) if progress is not None else Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            MofNCompleteColumn(),
+            TimeElapsedColumn(),
+            console=console,
+        )) as progress:
+            task = progress.add_task(description="🪞 Mirroring...", total=None)
+            pages = {page: _page_path(output_dir, page) for page in start_urls}
+            sites = {urlsplit(page).netloc for page in start_urls}
+
+            for level in range(max(0, int(depth)) + 1):
+                assets, next_pages = {}, {}
+                for page_url, page_path, result in run_wave(executor, pages):
+                    charset = _charset(page_path, result["headers"])
+                    parsed = _parse_html(page_path, charset)
+                    base = urljoin(page_url, parsed.base) if parsed.base else page_url
+                    documents.append((page_path, base, True, charset))
+                    references = parsed.assets + [ref for style in parsed.styles for ref in _css_urls(style)]
+                    for reference in references:
+                        asset_url = _absolute(base, reference)
+                        if asset_url and asset_url not in seen:
+                            assets[asset_url] = _output_path(output_dir, asset_url)
+                    if level < depth:
+                        for reference in parsed.links:
+                            link_url = _absolute(base, reference)
+                            if link_url and urlsplit(link_url).netloc in sites and link_url not in seen:
+                                next_pages[link_url] = _page_path(output_dir, link_url)
+
+                # Stylesheets can pull in more assets (fonts, images, @import), so keep going until done
+                while assets:
+                    nested = {}
+                    for asset_url, asset_path, result in run_wave(executor, assets):
+                        if _is_css(asset_url, result["headers"]):
+                            charset = _charset(asset_path, result["headers"])
+                            documents.append((asset_path, asset_url, False, charset))
+                            with open(asset_path, "r", encoding=charset, errors="replace") as file:
+                                for reference in _css_urls(file.read()):
+                                    nested_url = _absolute(asset_url, reference)
+                                    if nested_url and nested_url not in seen:
+                                        nested[nested_url] = _output_path(output_dir, nested_url)
+                    assets = nested
+
+                pages = {page: path for page, path in next_pages.items() if page not in seen}
+                if not pages:
+                    break
+
+            progress.remove_task(task)
+
+    if http_cache is not None:
+        http_cache.close()
+
+    for path, base, is_html, charset in documents:
+        _rewrite(path, base, local_files, is_html, charset)
+
+    elapsed = time.perf_counter() - start
+    html_count = sum(1 for _, _, is_html, _ in documents if is_html)
+    console.print("\n[bold cyan]📊 Mirror Summary:[/bold cyan]")
+    console.print(f"📄 Pages: [bold green]{html_count}[/bold green]")
+    console.print(f"🧩 Assets: [bold green]{len(local_files) - html_count}[/bold green]")
+    console.print(f"❌ Failed or skipped: [bold red]{len(failures)}[/bold red]")
+    console.print(f"📦 Downloaded: [bold magenta]{budget.used / 1e6:.2f}[/bold magenta] MB")
+    console.print(f"🕒 Total time: [bold magenta]{elapsed:.2f}[/bold magenta] seconds")
+    if start_urls[0] in local_files:
+        console.print(f"🪞 Open: {local_files[start_urls[0]]}\n")
+    log_task(
+        f"Mirror: {html_count} page(s), {len(local_files) - html_count} asset(s), "
+        f"{len(failures)} failed, {budget.used} bytes in {elapsed:.2f}s -> {output_dir}",
+        task="mirror-webpage", pages=html_count, assets=len(local_files) - html_count,
+        failed=len(failures), bytes=budget.used, duration=round(elapsed, 3),
+    )
+    # Missing assets leave a usable copy; a page that could not be saved does not
+    if any(page not in local_files for page in start_urls):
+        return 1
+
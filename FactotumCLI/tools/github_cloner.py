@@ -1,13 +1,20 @@
 import requests
 from git import Repo
 from rich.console import Console
-from rich.progress import track
+from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, MofNCompleteColumn, TimeElapsedColumn
+from rich.table import Table
 import questionary
 from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
+import hashlib
+import json
 import os
 import time
 from FactotumCLI.logger import log_task  # adjust import based on your structure
-from FactotumCLI.config import custom_style
+from FactotumCLI import http_client, metrics
+from FactotumCLI.config import cache_path, custom_style
 
 CATEGORY = "Developer Tools"
 DESCRIPTION = "Clone and update multiple GitHub repositories."
@@ -20,7 +27,291 @@ load_dotenv()
 # Later, use:
 token = os.getenv("GITHUB_TOKEN", "")
 
-def github_repo_cloner(username: str, token: str = "", output_dir: str = "cloned_repos", progress=None):
+MODE_CLONE = "Clone only missing repositories"
+MODE_PULL = "Pull updates for existing repositories"
+MODE_BOTH = "Both clone and pull updates"
+MODES = {"clone": MODE_CLONE, "pull": MODE_PULL, "both": MODE_BOTH}
+
+CLONE_MODES = ["full", "shallow", "blobless", "single-branch"]
+UPDATE_MODES = ["pull", "fetch"]
+
+# Per-output-directory record of the remote state seen at the last successful sync
+SYNC_MANIFEST = ".factotum-sync.json"
+
+# Overridable so the listing can be exercised against a local stub server
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+
+
+def _listing_cache_file(username, token):
+    key = hashlib.sha256(f"{username}\0{token}".encode("utf-8")).hexdigest()[:32]
+    return cache_path("github", f"repos_{key}.json")
+
+
+def _load_listing_cache(cache_file):
+    try:
+        with open(cache_file, "r", encoding="utf-8") as file:
+            return json.load(file).get("pages", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_listing_cache(cache_file, pages):
+    tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_file, "w", encoding="utf-8") as file:
+            json.dump({"pages": pages}, file)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        log_task(f"⚠️ Could not write repository listing cache: {e}")
+
+
+def _fetch_page(session, url, headers, cached):
+    """
+    Fetch one listing page, revalidating the cached copy with If-None-Match.
+
+    Returns the cache entry for the page and whether it came back as a 304.
+    """
+    request_headers = dict(headers)
+    if cached and cached.get("etag"):
+        request_headers["If-None-Match"] = cached["etag"]
+
+    with metrics.span("cloner.list_page", network=True):
+        response = session.get(url, headers=request_headers)
+    metrics.count("requests")
+    metrics.count("bytes", len(response.content))
+    if response.status_code == 304 and cached:
+        return cached, True
+
+    response.raise_for_status()
+    return {
+        "etag": response.headers.get("ETag"),
+        "links": {rel: link["url"] for rel, link in response.links.items()},
+        "data": response.json(),
+    }, False
+
+
+def _page_url(url, page):
+    parts = urlparse(url)
+    query = parse_qs(parts.query)
+    query["page"] = [str(page)]
+    return urlunparse(parts._replace(query=urlencode(query, doseq=True)))
+
+
+@metrics.span("cloner.listing")
+def _fetch_repo_listing(username, token, jobs=4):
+    """
+    Return every repository visible to the user, following `Link` pagination.
+
+    The first page tells us the last page number, the remaining pages are then
+    fetched concurrently. Every page is cached on disk with its ETag, so an
+    unchanged listing only costs 304 responses, which GitHub does not count
+    against the rate limit.
+    """
+    headers = {"Accept": "application/vnd.github+json"}
+    if token:
+        headers["Authorization"] = f"token {token}"
+        first_url = f"{GITHUB_API_URL}/user/repos?per_page=100&type=all&page=1"
+    else:
+        # /user/repos needs a token; fall back to the user's public repositories
+        first_url = f"{GITHUB_API_URL}/users/{username}/repos?per_page=100&type=all&page=1"
+
+    cache_file = _listing_cache_file(username, token)
+    cached_pages = _load_listing_cache(cache_file)
+    pages = {}
+    not_modified = 0
+
+    # Pages are fetched concurrently, one pooled connection per worker
+    session = http_client.get_session(jobs)
+
+    first, hit = _fetch_page(session, first_url, headers, cached_pages.get(first_url))
+    pages[first_url] = first
+    not_modified += hit
+
+    links = first.get("links", {})
+    if "last" in links:
+        last_page = int(parse_qs(urlparse(links["last"]).query).get("page", ["1"])[0])
+        urls = [_page_url(first_url, page) for page in range(2, last_page + 1)]
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+            results = executor.map(
+                lambda url: _fetch_page(session, url, headers, cached_pages.get(url)), urls
+            )
+            for url, (page, hit) in zip(urls, results):
+                pages[url] = page
+                not_modified += hit
+    else:
+        # No "last" relation: walk the "next" links one by one
+        url = links.get("next")
+        while url and url not in pages:
+            page, hit = _fetch_page(session, url, headers, cached_pages.get(url))
+            pages[url] = page
+            not_modified += hit
+            url = page.get("links", {}).get("next")
+
+    if not_modified < len(pages) or set(pages) != set(cached_pages):
+        _save_listing_cache(cache_file, pages)
+
+    log_task(f"📄 Repository listing: {len(pages)} page(s), {not_modified} unchanged (304)")
+    return [repo for page in pages.values() for repo in page["data"]]
+
+
+def _clone_kwargs(clone_mode, depth):
+    """GitPython keyword arguments for `Repo.clone_from`, turned into git flags."""
+    if clone_mode == "shallow":
+        return {"depth": max(1, int(depth))}
+    if clone_mode == "blobless":
+        return {"filter": "blob:none"}
+    if clone_mode == "single-branch":
+        return {"single_branch": True}
+    return {}
+
+
+def _dir_size(path):
+    """Total size in bytes of every file below `path`."""
+    total = 0
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        total += entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            continue
+    return total
+
+
+def _sync_repo(repo_url, destination, mode, clone_mode="full", depth=1, update_mode="pull"):
+    """
+    Clone, pull or fetch a single repository.
+
+    Runs on a worker thread, so it never raises: every outcome is returned as
+    a (status, message, operation) tuple with status one of "success", "skip"
+    or "fail", and operation the sync mode that ran (None when nothing ran).
+    """
+    repo_name = os.path.basename(destination)
+
+    try:
+        if os.path.exists(destination):
+            # If repo already exists
+            if mode in [MODE_PULL, MODE_BOTH]:
+                repo = Repo(destination)
+                if update_mode == "fetch":
+                    # Only update remote-tracking refs; the worktree stays untouched
+                    console.print(f"🔄 Fetching updates for '{repo_name}'...", style="bold blue")
+                    for remote in repo.remotes:
+                        remote.fetch()
+                    console.print(f"✅ Fetched latest changes for '{repo_name}'", style="bold green")
+                    return "success", f"🔄 Fetched updates: {repo_name}", "fetch"
+
+                console.print(f"🔄 Pulling updates for '{repo_name}'...", style="bold blue")
+                for remote in repo.remotes:
+                    remote.pull()
+                console.print(f"✅ Pulled latest changes for '{repo_name}'", style="bold green")
+                return "success", f"🔄 Pulled updates: {repo_name}", "pull"
+
+            console.print(f"⚠️ Repository '{repo_name}' already exists. Skipping.", style="yellow")
+            return "skip", f"⚠️ Skipped (already exists): {repo_name}", None
+
+        # Repo doesn't exist — clone if mode allows
+        if mode in [MODE_CLONE, MODE_BOTH]:
+            console.print(f"📥 Cloning '{repo_name}' ({clone_mode})...", style="bold blue")
+            Repo.clone_from(repo_url, destination, **_clone_kwargs(clone_mode, depth))
+            console.print(f"✅ Cloned '{repo_name}' successfully!", style="bold green")
+            return "success", f"✅ Cloned ({clone_mode}): {repo_name}", f"clone ({clone_mode})"
+
+        console.print(f"⚠️ Repository '{repo_name}' does not exist locally. Skipping.", style="yellow")
+        return "skip", f"⚠️ Skipped (missing locally): {repo_name}", None
+
+    except Exception as e:
+        console.print(f"❌ Failed to process '{repo_name}': {e}", style="bold red")
+        return "fail", f"❌ Failed to process {repo_name}: {e}", None
+
+
+def _load_sync_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, SYNC_MANIFEST), "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_sync_manifest(output_dir, manifest):
+    manifest_file = os.path.join(output_dir, SYNC_MANIFEST)
+    tmp_file = f"{manifest_file}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_file, "w", encoding="utf-8") as file:
+            json.dump(manifest, file, indent=2, sort_keys=True)
+        os.replace(tmp_file, manifest_file)
+    except OSError as e:
+        log_task(f"⚠️ Could not write sync manifest: {e}")
+
+
+def _remote_state(repo):
+    """The parts of the API listing that change whenever something is pushed."""
+    return {"pushed_at": repo.get("pushed_at"), "default_branch": repo.get("default_branch")}
+
+
+def _is_unchanged(manifest, repo_name, remote_state, need_worktree=True):
+    last_seen = manifest.get(repo_name)
+    if not last_seen or not remote_state["pushed_at"]:
+        return False
+    # A fetch-only sync leaves the worktree behind, so a later pull still has work to do
+    if need_worktree and not last_seen.get("worktree", True):
+        return False
+    return all(last_seen.get(key) == value for key, value in remote_state.items())
+
+
+def _timed_sync(repo_url, destination, mode, **options):
+    """
+    Run `_sync_repo` and measure it.
+
+    Bytes transferred are approximated by the growth of `.git/objects`, which is
+    where every fetched pack lands; on-disk size covers the whole checkout.
+    """
+    objects_dir = os.path.join(destination, ".git", "objects")
+    objects_before = _dir_size(objects_dir) if os.path.isdir(objects_dir) else 0
+
+    start = time.perf_counter()
+    with metrics.span("cloner.sync", network=True):
+        status, message, operation = _sync_repo(repo_url, destination, mode, **options)
+    elapsed = time.perf_counter() - start
+
+    stats = None
+    if operation is not None:
+        with metrics.span("cloner.measure"):
+            stats = {
+                "operation": operation,
+                "transferred": max(0, _dir_size(objects_dir) - objects_before),
+                "disk": _dir_size(destination),
+            }
+        metrics.count("bytes", stats["transferred"])
+        metrics.count(f"repos_{operation}")
+    return status, message, elapsed, stats
+
+
+def _format_bytes(size):
+    if size < 1024:
+        return f"{size} B"
+    for unit in ["KiB", "MiB", "GiB"]:
+        size /= 1024
+        if size < 1024 or unit == "GiB":
+            return f"{size:.1f} {unit}"
+
+
+def github_repo_cloner(
+    username: str,
+    token: str = "",
+    output_dir: str = "cloned_repos",
+    jobs: int = 4,
+    mode: str = "",
+    repos: str = "",
+    clone_mode: str = "full",
+    depth: int = 1,
+    update_mode: str = "pull",
+    progress=None,
+):
     """
     Clone multiple GitHub repositories from a user.
 
@@ -28,125 +319,216 @@ def github_repo_cloner(username: str, token: str = "", output_dir: str = "cloned
         username (str): GitHub username.
         token (str): Optional GitHub Personal Access Token (for private repos).
         output_dir (str): Directory to clone repositories into.
+        jobs (int): Number of repositories cloned or pulled at the same time. Defaults to 4.
+        mode (str): 'clone', 'pull' or 'both'. Asked interactively when empty.
+        repos (str): 'all' or comma-separated repository names. Asked interactively when empty.
+        clone_mode (str): 'full', 'shallow' (--depth), 'blobless' (--filter=blob:none)
+            or 'single-branch'. Defaults to 'full'.
+        depth (int): History depth for shallow clones. Defaults to 1.
+        update_mode (str): 'pull' to update the worktree, or 'fetch' to only update
+            remote-tracking refs. Defaults to 'pull'.
+
+    Example:
+        factotum --task github-repo-cloner --username octocat --jobs 8
+        factotum --task github-repo-cloner --username octocat --repos all --mode both --clone-mode blobless --update-mode fetch
+
+    Description:
+        Repositories whose `pushed_at` and default branch match the last successful
+        sync (recorded in `<output_dir>/.factotum-sync.json`) are skipped without
+        any git network operation when pulling updates.
     """
 
     # Use token from environment if not provided
     if not token:
         token = os.getenv("GITHUB_TOKEN", "")
 
-    headers = {}
-    if token:
-        headers["Authorization"] = f"token {token}"
-
-    url = "https://api.github.com/user/repos?per_page=100&type=all"
+    if mode and mode not in MODES:
+        console.print(f"❌ Unknown mode '{mode}'. Choose from: {', '.join(MODES)}", style="bold red")
+        return 1
+    if clone_mode not in CLONE_MODES:
+        console.print(f"❌ Unknown clone mode '{clone_mode}'. Choose from: {', '.join(CLONE_MODES)}", style="bold red")
+        return 1
+    if update_mode not in UPDATE_MODES:
+        console.print(f"❌ Unknown update mode '{update_mode}'. Choose from: {', '.join(UPDATE_MODES)}", style="bold red")
+        return 1
 
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        repos = response.json()
+        listing = _fetch_repo_listing(username, token, jobs=max(1, int(jobs)))
 
-        if not repos:
+        if not listing:
             console.print("❌ No repositories found.", style="bold red")
-            return
-
-        console.print("\n[bold cyan]Use ↑ ↓ arrows to navigate, spacebar to select, and enter to confirm.[/bold cyan]\n")
-
-        # Interactive checkbox list
-        repo_choices = [questionary.Choice(repo["name"], value=repo["clone_url"]) for repo in repos]
-        selected_repos = questionary.checkbox(
-            "🧩 Select repositories to clone:",
-            choices=repo_choices,
-        ).ask()
+            return 1
+
+        if repos == "all":
+            selected_repos = [repo["clone_url"] for repo in listing]
+        elif repos:
+            wanted = {name.strip() for name in repos.split(",") if name.strip()}
+            selected_repos = [repo["clone_url"] for repo in listing if repo["name"] in wanted]
+            missing = wanted - {repo["name"] for repo in listing}
+            if missing:
+                console.print(f"⚠️ Not found in listing: {', '.join(sorted(missing))}", style="yellow")
+        else:
+            console.print("\n[bold cyan]Use ↑ ↓ arrows to navigate, spacebar to select, and enter to confirm.[/bold cyan]\n")
+
+            # Interactive checkbox list
+            repo_choices = [questionary.Choice(repo["name"], value=repo["clone_url"]) for repo in listing]
+            selected_repos = questionary.checkbox(
+                "🧩 Select repositories to clone:",
+                choices=repo_choices,
+            ).ask()
 
         if not selected_repos:
             console.print("❌ No repositories selected. Exiting.", style="bold red")
-            return
+            return 1
 
         os.makedirs(output_dir, exist_ok=True)
 
+        repos_by_url = {repo["clone_url"]: repo for repo in listing}
+        sync_manifest = _load_sync_manifest(output_dir)
+
         # Track stats
-        success_count = 0
-        skip_count = 0
-        fail_count = 0
+        counts = {"success": 0, "skip": 0, "unchanged": 0, "fail": 0}
+        timings = []
+        mode_stats = {}
 
         # Track time
         start_time = time.time()
 
-        mode = questionary.select(
-            "🛠️ What would you like to do with the selected repositories?",
-            choices=[
-                "Clone only missing repositories",
-                "Pull updates for existing repositories",
-                "Both clone and pull updates"
-            ],
-            style=custom_style
-        ).ask()
-
-
-        # Clone with progress
-        task = progress.add_task(description="🚀 Processing repositories...", total=len(selected_repos))
-
-        for repo_url in selected_repos:
-            repo_name = repo_url.split("/")[-1].replace(".git", "")
-            destination = os.path.join(output_dir, repo_name)
-
-            try:
-                if os.path.exists(destination):
-                    # If repo already exists
-                    if mode in ["Pull updates for existing repositories", "Both clone and pull updates"]:
-                        console.print(f"🔄 Pulling updates for '{repo_name}'...", style="bold blue")
-                        repo = Repo(destination)
-                        for remote in repo.remotes:
-                            remote.pull()
-                        console.print(f"✅ Pulled latest changes for '{repo_name}'", style="bold green")
-                        log_task(f"🔄 Pulled updates: {repo_name}")
-                        success_count += 1
-                    else:
-                        console.print(f"⚠️ Repository '{repo_name}' already exists. Skipping.", style="yellow")
-                        log_task(f"⚠️ Skipped (already exists): {repo_name}")
-                        skip_count += 1
-
-                else:
-                    # Repo doesn't exist — clone if mode allows
-                    if mode in ["Clone only missing repositories", "Both clone and pull updates"]:
-                        console.print(f"📥 Cloning '{repo_name}'...", style="bold blue")
-                        Repo.clone_from(repo_url, destination)
-                        console.print(f"✅ Cloned '{repo_name}' successfully!", style="bold green")
-                        log_task(f"✅ Cloned: {repo_name}")
-                        success_count += 1
-                    else:
-                        console.print(f"⚠️ Repository '{repo_name}' does not exist locally. Skipping.", style="yellow")
-                        log_task(f"⚠️ Skipped (missing locally): {repo_name}")
-                        skip_count += 1
-
-            except Exception as e:
-                console.print(f"❌ Failed to process '{repo_name}': {e}", style="bold red")
-                log_task(f"❌ Failed to process {repo_name}: {e}")
-                fail_count += 1
-
-            progress.advance(task)
-
-        progress.remove_task(task)
+        if mode:
+            mode = MODES[mode]
+        else:
+            mode = questionary.select(
+                "🛠️ What would you like to do with the selected repositories?",
+                choices=[MODE_CLONE, MODE_PULL, MODE_BOTH],
+                style=custom_style
+            ).ask()
+
+        sync_options = {"clone_mode": clone_mode, "depth": depth, "update_mode": update_mode}
+
+        jobs = max(1, int(jobs))
+
+        with (nullcontext(progress) if progress is not None else Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            TimeElapsedColumn(),
+            console=console,
+        )) as progress:
+            # Clone with progress
+            task = progress.add_task(description="🚀 Processing repositories...", total=len(selected_repos))
+
+            # Clones and pulls are network/subprocess bound, so threads overlap them well
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                futures = {}
+                for repo_url in selected_repos:
+                    repo_name = repo_url.split("/")[-1].replace(".git", "")
+                    destination = os.path.join(output_dir, repo_name)
+                    remote_state = _remote_state(repos_by_url[repo_url])
+
+                    # Nothing was pushed since the last sync: no need to touch the network
+                    if (
+                        mode in [MODE_PULL, MODE_BOTH]
+                        and os.path.exists(destination)
+                        and _is_unchanged(sync_manifest, repo_name, remote_state, update_mode == "pull")
+                    ):
+                        counts["unchanged"] += 1
+                        timings.append((repo_name, "unchanged", 0.0))
+                        log_task(f"⏭️ Skipped (unchanged since last sync): {repo_name}",
+                                 task="github-repo-cloner", repo=repo_name, status="unchanged")
+                        progress.advance(task)
+                        continue
+
+                    future = executor.submit(_timed_sync, repo_url, destination, mode, **sync_options)
+                    futures[future] = (repo_name, remote_state)
+
+                for future in as_completed(futures):
+                    repo_name, remote_state = futures[future]
+                    status, message, elapsed, stats = future.result()
+                    counts[status] += 1
+                    timings.append((repo_name, status, elapsed))
+                    log_task(
+                        message, task="github-repo-cloner", repo=repo_name, status=status,
+                        duration=round(elapsed, 3), **(stats or {}),
+                    )
+                    if stats:
+                        totals = mode_stats.setdefault(stats["operation"], {"repos": 0, "transferred": 0, "disk": 0})
+                        totals["repos"] += 1
+                        totals["transferred"] += stats["transferred"]
+                        totals["disk"] += stats["disk"]
+                    if status == "success":
+                        sync_manifest[repo_name] = {
+                            **remote_state,
+                            "worktree": not (stats and stats["operation"] == "fetch"),
+                        }
+                    elif status == "fail":
+                        sync_manifest.pop(repo_name, None)
+                    progress.advance(task)
+
+            progress.remove_task(task)
+
+        _save_sync_manifest(output_dir, sync_manifest)
 
         end_time = time.time()
         elapsed_time = end_time - start_time
 
+        timing_table = Table(title="⏱️ Per-repository timings", show_lines=False)
+        timing_table.add_column("Repository", style="bold")
+        timing_table.add_column("Result")
+        timing_table.add_column("Time (s)", justify="right")
+        status_labels = {
+            "success": "[green]✅ success[/green]",
+            "skip": "[yellow]⚠️ skipped[/yellow]",
+            "unchanged": "[cyan]⏭️ unchanged[/cyan]",
+            "fail": "[red]❌ failed[/red]",
+        }
+        for repo_name, status, elapsed in sorted(timings, key=lambda t: t[2], reverse=True):
+            timing_table.add_row(repo_name, status_labels[status], f"{elapsed:.2f}")
+
+        console.print()
+        console.print(timing_table)
+
+        if mode_stats:
+            mode_table = Table(title="💾 Transfer by sync mode")
+            mode_table.add_column("Mode", style="bold")
+            mode_table.add_column("Repos", justify="right")
+            mode_table.add_column("Transferred", justify="right")
+            mode_table.add_column("On disk", justify="right")
+            for operation, totals in sorted(mode_stats.items()):
+                mode_table.add_row(
+                    operation,
+                    str(totals["repos"]),
+                    _format_bytes(totals["transferred"]),
+                    _format_bytes(totals["disk"]),
+                )
+            console.print(mode_table)
+
         console.print("\n[bold cyan]📊 Clone Summary:[/bold cyan]")
-        console.print(f"✅ Successful clones: [bold green]{success_count}[/bold green]")
-        console.print(f"⚠️ Skipped (already exists): [bold yellow]{skip_count}[/bold yellow]")
-        console.print(f"❌ Failed clones: [bold red]{fail_count}[/bold red]")
+        console.print(f"✅ Successful clones: [bold green]{counts['success']}[/bold green]")
+        console.print(f"⚠️ Skipped (already exists): [bold yellow]{counts['skip']}[/bold yellow]")
+        console.print(f"⏭️ Unchanged since last sync: [bold cyan]{counts['unchanged']}[/bold cyan]")
+        console.print(f"❌ Failed clones: [bold red]{counts['fail']}[/bold red]")
+        console.print(f"🧵 Parallel jobs: [bold magenta]{jobs}[/bold magenta]")
         console.print(f"🕒 Total time: [bold magenta]{elapsed_time:.2f}[/bold magenta] seconds\n")
 
         summary_message = (
             f"📊 Clone Summary: "
-            f"✅ {success_count} successful, "
-            f"⚠️ {skip_count} skipped, "
-            f"❌ {fail_count} failed, "
+            f"✅ {counts['success']} successful, "
+            f"⚠️ {counts['skip']} skipped, "
+            f"⏭️ {counts['unchanged']} unchanged, "
+            f"❌ {counts['fail']} failed, "
+            f"🧵 {jobs} jobs, "
             f"🕒 {elapsed_time:.2f} seconds."
         )
-        log_task(summary_message)
+        log_task(
+            summary_message, task="github-repo-cloner", username=username, jobs=jobs,
+            duration=round(elapsed_time, 3), **counts,
+        )
+        if counts["fail"]:
+            return 1
 
 
 
     except requests.RequestException as e:
         console.print(f"❌ Error fetching repositories: {e}", style="bold red")
+        return 1
@@ -1,41 +1,413 @@
 from rich.console import Console
+from .. import metrics
 from ..logger import log_task
+from . import _file_mover
+from . import _organize_journal as journal_store
+
+import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
 CATEGORY = "File Management"
 DESCRIPTION = "Organize files in a directory by their extensions."
 
 console = Console()
 
+
+def _extension_folder(name):
+    ext = os.path.splitext(name)[1].lower()[1:]
+    return ext or "no_extension"
+
+
+# Files still being written by browsers/downloaders; left alone in watch mode
+PARTIAL_SUFFIXES = (".part", ".part.validator", ".crdownload", ".download", ".tmp")
+# A directory modified this recently may still change within the same mtime tick
+RACY_MTIME_NS = 2_000_000_000
+
+
+@metrics.span("organizer.plan")
+def _plan_moves(root, recursive=False, journal=None, skip_partial=False, destination=None):
+    """
+    Build the move plan with a single os.scandir pass.
+
+    DirEntry caches the file type from the directory listing, so no extra stat
+    call is needed per file. Returns a list of (source, target folder, name)
+    for every file that is not already in its extension folder. Extension
+    folders are created under `destination` (default: root); name clashes with
+    files already there, or within the plan, get a " (n)" suffix.
+
+    With a journal, directories whose mtime matches their record are not
+    listed at all, and only names the journal has not seen yet are planned.
+    The journal's directory records are refreshed in place.
+    """
+    plan = []
+    pending = [root]
+    now_ns = time.time_ns()
+    while pending:
+        current = pending.pop()
+        rel = os.path.relpath(current, root)
+        try:
+            mtime_ns = os.stat(current).st_mtime_ns
+        except FileNotFoundError:
+            continue
+
+        record = journal["dirs"].get(rel) if journal is not None else None
+        if record is not None and record["mtime_ns"] == mtime_ns:
+            if recursive:
+                pending.extend(os.path.join(current, name) for name in record["subdirs"])
+            continue
+
+        known = record["files"] if record is not None else set()
+        files, subdirs = set(), []
+        with os.scandir(current) as entries:
+            for entry in entries:
+                if entry.name.startswith(".factotum"):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.name)
+                    if recursive:
+                        pending.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    if skip_partial and entry.name.endswith(PARTIAL_SUFFIXES):
+                        continue
+                    files.add(entry.name)
+                    if entry.name in known:
+                        continue
+                    folder = os.path.join(destination or root, _extension_folder(entry.name))
+                    if current != folder:
+                        plan.append((entry.path, folder, entry.name))
+
+        if journal is not None:
+            journal["dirs"][rel] = {
+                "mtime_ns": mtime_ns if now_ns - mtime_ns > RACY_MTIME_NS else None,
+                "files": files,
+                "subdirs": sorted(subdirs),
+            }
+    plan.sort()
+    return _file_mover.resolve_collisions(plan)
+
+
+def _print_summary(root, plan, failures, stats, elapsed, dry_run):
+    from rich.table import Table
+
+    per_folder = Counter(os.path.relpath(folder, root) for _, folder, _ in plan)
+    table = Table(title="🗂️ Planned moves" if dry_run else "🗂️ Organized files")
+    table.add_column("Folder", style="bold")
+    table.add_column("Files", justify="right")
+    for folder, count in sorted(per_folder.items(), key=lambda item: (-item[1], item[0])):
+        table.add_row(f"{folder}/", str(count))
+    console.print(table)
+
+    if dry_run:
+        console.print(f"🔍 Dry run: [bold cyan]{len(plan)}[/bold cyan] file(s) would be moved. Nothing was changed.")
+        return
+
+    console.print(f"✅ Moved: [bold green]{len(plan) - len(failures)}[/bold green]")
+    if stats["copied"]:
+        rate = stats["bytes"] / stats["seconds"] / 1_000_000 if stats["seconds"] else 0
+        console.print(
+            f"🚚 Renamed {stats['renamed']}, copied {stats['copied']} across filesystems"
+            f" ({_format_bytes(stats['bytes'])} at [bold cyan]{rate:.1f} MB/s[/bold cyan])"
+        )
+    if failures:
+        console.print(f"❌ Failed: [bold red]{len(failures)}[/bold red]")
+        for source, error in failures[:10]:
+            console.print(f"   {source}: {error}", style="red")
+        if len(failures) > 10:
+            console.print(f"   ... and {len(failures) - 10} more (see factotum.log)", style="red")
+    console.print(f"🕒 Total time: [bold magenta]{elapsed:.2f}[/bold magenta] seconds")
+
+
+def _format_bytes(size):
+    if size < 1024:
+        return f"{size} B"
+    for unit in ["KiB", "MiB", "GiB"]:
+        size /= 1024
+        if size < 1024 or unit == "GiB":
+            return f"{size:.1f} {unit}"
+
+
+@metrics.span("organizer.dedup")
+def _deduplicate(root, action, jobs, dry_run):
+    """Find duplicate files under root and report, hardlink or quarantine them; returns the failures."""
+    from rich.table import Table
+    from . import _dedup
+
+    start = time.perf_counter()
+    files = _dedup.scan_files(root)
+    cache = _dedup.HashCache()
+    try:
+        groups = _dedup.find_duplicates(files, jobs=jobs, cache=cache)
+    finally:
+        cache.close()
+
+    if not groups:
+        console.print(f"🧬 No duplicates among [bold]{len(files)}[/bold] file(s).", style="green")
+        return []
+
+    wasted = sum(group[0].size * (len(group) - 1) for group in groups)
+    table = Table(title="🧬 Duplicate files")
+    table.add_column("Kept", style="bold")
+    table.add_column("Copies")
+    table.add_column("Size", justify="right")
+    for keeper, *duplicates in groups[:20]:
+        table.add_row(
+            os.path.relpath(keeper.path, root),
+            "\n".join(os.path.relpath(info.path, root) for info in duplicates),
+            _format_bytes(keeper.size),
+        )
+    console.print(table)
+    if len(groups) > 20:
+        console.print(f"   ... and {len(groups) - 20} more group(s)", style="dim")
+
+    failures = []
+    if action != "report" and not dry_run:
+        failures = _dedup.apply_action(root, groups, action)
+    copies = sum(len(group) - 1 for group in groups)
+    verb = {"hardlink": "Hardlinked", "quarantine": "Quarantined"}.get(action) if not dry_run else None
+    summary = f"{verb} {copies - len(failures)} duplicate(s)" if verb else f"Found {copies} duplicate(s)"
+    console.print(
+        f"🧬 {summary} in {len(groups)} group(s), [bold cyan]{_format_bytes(wasted)}[/bold cyan] reclaimable"
+        f" ({time.perf_counter() - start:.2f}s)"
+    )
+    if action == "quarantine" and not dry_run:
+        console.print(f"   Quarantined copies are in {os.path.join(root, _dedup.QUARANTINE_DIR)}", style="dim")
+    for path, error in failures:
+        console.print(f"❌ {path}: {error}", style="red")
+        log_task(f"Failed to {action} duplicate {path}: {error}")
+    log_task(f"{summary} in {root} ({wasted} bytes reclaimable)", task="organize-files", directory=root,
+             dedup=action, groups=len(groups), duplicates=copies, reclaimable_bytes=wasted)
+    return failures
+
+
+def _undo_last_run(root, journal, jobs):
+    """Move the files of the last run back to where they came from; returns the failures."""
+    last_run = journal.get("last_run")
+    if not last_run:
+        console.print("🤷 Nothing to undo.", style="bold yellow")
+        return []
+
+    plan, skipped = [], []
+    for source_rel, destination_rel in last_run["moves"]:
+        original = os.path.join(root, source_rel)
+        current = os.path.join(root, destination_rel)
+        if not os.path.exists(current) or os.path.exists(original):
+            skipped.append(source_rel)
+            continue
+        plan.append((current, os.path.dirname(original), os.path.basename(original)))
+
+    start = time.perf_counter()
+    failures, _ = _file_mover.execute(plan, jobs)
+    elapsed = time.perf_counter() - start
+
+    touched = {folder for _, folder, _ in plan} | {os.path.dirname(path) for path, _, _ in plan}
+    journal_store.forget_dirs(journal, root, touched)
+    journal["last_run"] = None
+    journal_store.save_journal(root, journal)
+
+    # Extension folders created by the run are removed again once empty
+    for folder in {os.path.dirname(path) for path, _, _ in plan}:
+        if folder != root:
+            try:
+                os.rmdir(folder)
+            except OSError:
+                pass
+
+    console.print(f"↩️ Restored: [bold green]{len(plan) - len(failures)}[/bold green]")
+    if skipped:
+        console.print(f"⏭️ Skipped (moved or replaced since): [bold yellow]{len(skipped)}[/bold yellow]")
+    for source, error in failures:
+        console.print(f"❌ {source}: {error}", style="red")
+        log_task(f"Failed to restore {source}: {error}")
+    console.print(f"🕒 Total time: [bold magenta]{elapsed:.2f}[/bold magenta] seconds")
+    log_task(
+        f"Undid last organize run in {root}: restored {len(plan) - len(failures)}, skipped {len(skipped)}",
+        task="organize-files", directory=root, undo=True, restored=len(plan) - len(failures),
+        skipped=len(skipped), duration=round(elapsed, 3),
+    )
+    return failures
+
+
+def _journal_state(journal):
+    """Comparable snapshot of the journal's directory records."""
+    return {
+        rel: (record["mtime_ns"], frozenset(record["files"]), tuple(record["subdirs"]))
+        for rel, record in journal["dirs"].items()
+    }
+
+
+def _watch(root, journal, recursive, jobs, interval, destination):
+    """
+    Organize new files as they arrive until interrupted.
+
+    Events only wake the loop up; the incremental planner then finds the new
+    entries. Bursts of events are debounced so a batch of downloads is moved
+    in one pass, and a full (incremental) pass runs every `interval` seconds
+    anyway in case an event was missed. The journal is only written when a
+    pass moved files or relisted a directory with new results.
+    """
+    from ._dir_watcher import create_watcher
+
+    watcher = create_watcher(poll_interval=interval)
+    console.print(
+        f"👀 Watching [bold]{root}[/bold] ({watcher.name}). Press [bold]Ctrl+C[/bold] to stop.",
+        style="cyan",
+    )
+    total = 0
+    saved = None
+    try:
+        while True:
+            plan = _plan_moves(
+                root, recursive=recursive, journal=journal, skip_partial=True, destination=destination,
+            )
+            if plan:
+                start = time.perf_counter()
+                failures, _ = _file_mover.execute(plan, jobs)
+                journal_store.record_run(journal, root, plan, failures)
+                moved = len(plan) - len(failures)
+                total += moved
+                console.print(
+                    f"📦 {time.strftime('%H:%M:%S')} moved [bold green]{moved}[/bold green] file(s)"
+                    f" in {time.perf_counter() - start:.2f}s"
+                )
+                for source, error in failures:
+                    console.print(f"❌ {source}: {error}", style="red")
+                    log_task(f"Failed to move {source}: {error}")
+                log_task(f"Watch mode moved {moved} file(s) in {root}", task="organize-files", directory=root,
+                         moved=moved, failed=len(failures), watch=True)
+            state = _journal_state(journal)
+            if state != saved:
+                journal_store.save_journal(root, journal)
+                saved = state
+
+            watched = [root]
+            if recursive:
+                watched += [os.path.join(root, rel) for rel in journal["dirs"] if rel != "."]
+            watcher.watch(watched)
+
+            if watcher.wait(interval):
+                # Debounce: keep collecting until things have been quiet for a moment
+                deadline = time.monotonic() + interval
+                while time.monotonic() < deadline and watcher.wait(min(0.5, interval)):
+                    pass
+    except KeyboardInterrupt:
+        journal_store.save_journal(root, journal)
+        console.print(f"\n👋 Stopped watching. Moved [bold]{total}[/bold] file(s) in total.", style="bold yellow")
+    finally:
+        watcher.close()
+
+
 # Function to organize files in a directory by their extensions
-def organize_files(directory: str):
+def organize_files(
+    directory: str,
+    recursive: bool = False,
+    dry_run: bool = False,
+    jobs: int = 8,
+    incremental: bool = True,
+    watch: bool = False,
+    interval: float = 2.0,
+    undo: bool = False,
+    dedup: str = "",
+    target_dir: str = "",
+):
     """
     Organize files in a directory by their extensions.
 
     Args:
         directory (str): Path to the directory to organize.
+        recursive (bool): Also pick up files from subdirectories. Defaults to False.
+        dry_run (bool): Only show what would be moved. Defaults to False.
+        jobs (int): Number of moves run at the same time. Defaults to 8.
+        incremental (bool): Only look at entries not seen by a previous run. Defaults to True.
+        watch (bool): Keep running and organize new files as they arrive. Defaults to False.
+        interval (float): Seconds between rescans in watch mode. Defaults to 2.
+        undo (bool): Move the files of the last run back. Defaults to False.
+        dedup (str): Look for duplicate files first: report, hardlink or quarantine. Defaults to off.
+        target_dir (str): Create the extension folders here instead of in the directory itself.
 
     Example:
         factotum --task organize-files --directory ./downloads
+        factotum --task organize-files --directory ./downloads --recursive --dry-run
+        factotum --task organize-files --directory ./downloads --watch
+        factotum --task organize-files --directory ./downloads --undo
+        factotum --task organize-files --directory ./downloads --dedup quarantine
+        factotum --task organize-files --directory ./downloads --target-dir /mnt/archive
 
     Description:
         Scans the given folder and moves files into subfolders based on their file extensions.
         For example, .jpg files go into an 'jpg/' folder, .pdf files into 'pdf/', etc.
+        The folder is scanned once to build a plan, then the moves run in parallel and
+        a summary is printed at the end.
+        A journal (kept in the cache directory) remembers each directory's mtime and the
+        entries already handled, so reruns skip unchanged directories and known files;
+        use --full-scan to ignore it. It also records the last run's moves for --undo.
+        Watch mode reacts to new files (inotify on Linux, polling elsewhere), waits for
+        bursts to settle and moves them in batches; partial downloads are left alone.
+        --dedup compares every file under the directory by size, then by its first and
+        last few KB, and only reads the remaining candidates in full. Hashes are cached
+        per (inode, size, mtime). Duplicates are reported, replaced by hardlinks to the
+        oldest copy, or moved to .factotum-quarantine/ before organizing.
+        Moves on the same filesystem are atomic renames; moves to another one (e.g. a
+        --target-dir on a network share) are parallel zero-copy transfers whose
+        throughput is reported. Existing files are never overwritten: clashing names
+        get a " (1)", " (2)", ... suffix.
         Helps keep your directories clean and organized automatically.
     """
-    
-    from pathlib import Path
-    import shutil
 
-    path = Path(directory)
-    if not path.exists():
+    root = os.path.abspath(directory)
+    if not os.path.isdir(root):
         print(f"Directory '{directory}' does not exist.")
+        return 1
+
+    jobs = int(jobs)
+    destination = os.path.abspath(target_dir) if target_dir else root
+    journal = journal_store.load_journal(root)
+    if not incremental:
+        journal["dirs"] = {}
+
+    if undo:
+        return 1 if _undo_last_run(root, journal, jobs) else None
+    dedup_failures = []
+    if dedup:
+        from ._dedup import ACTIONS
+
+        if dedup not in ACTIONS:
+            console.print(f"❌ Unknown dedup action '{dedup}'. Choose from: {', '.join(sorted(ACTIONS))}", style="bold red")
+            return 1
+        dedup_failures = _deduplicate(root, dedup, jobs, dry_run)
+    if watch and not dry_run:
+        _watch(root, journal, recursive, jobs, float(interval), destination)
         return
 
-    for file in path.iterdir():
-        if file.is_file():
-            ext = file.suffix.lower()[1:] or "no_extension"
-            folder = path / ext
-            folder.mkdir(exist_ok=True)
-            shutil.move(str(file), str(folder / file.name))
-            console.print(f"✅ Moved {file.name} to {folder}/", style="bold green")
-            log_task(f"Moved {file.name} to {folder}/")
\ No newline at end of file
+    start = time.perf_counter()
+    plan = _plan_moves(root, recursive=recursive, journal=journal, destination=destination)
+
+    if not plan:
+        if not dry_run:
+            journal_store.save_journal(root, journal)
+        console.print("✨ Nothing to organize.", style="bold green")
+        return 1 if dedup_failures else None
+
+    failures, stats = ([], None) if dry_run else _file_mover.execute(plan, jobs)
+    elapsed = time.perf_counter() - start
+
+    if not dry_run:
+        journal_store.record_run(journal, root, plan, failures)
+        journal_store.save_journal(root, journal)
+
+    _print_summary(destination, plan, failures, stats, elapsed, dry_run)
+
+    for source, error in failures:
+        log_task(f"Failed to move {source}: {error}", task="organize-files", path=source)
+    per_folder = Counter(os.path.basename(folder) for _, folder, _ in plan)
+    details = ", ".join(f"{folder}: {count}" for folder, count in sorted(per_folder.items()))
+    prefix = "Dry run, would move" if dry_run else "Moved"
+    log_task(
+        f"{prefix} {len(plan) - len(failures)} file(s) in {directory} ({details}) in {elapsed:.2f}s",
+        task="organize-files", directory=root, dry_run=dry_run, moved=len(plan) - len(failures),
+        failed=len(failures), duration=round(elapsed, 3),
+        bytes_copied=stats["bytes"] if stats else 0,
+    )
+    if failures or dedup_failures:
+        return 1
@@ -1,36 +1,217 @@
 from rich.console import Console
 from ..logger import log_task
 
+import math
+import os
+import string
+import sys
+import time
+
 CATEGORY = "Security"
 DESCRIPTION = "Generate a secure random password."
 
 console = Console()
 
+CHARACTER_CLASSES = {
+    "lower": string.ascii_lowercase,
+    "upper": string.ascii_uppercase,
+    "digit": string.digits,
+    "special": string.punctuation,
+}
+DEFAULT_WORDLIST = "/usr/share/dict/words"
+# Passwords generated per os.urandom draw / write in bulk mode
+BATCH_SIZE = 4096
+
+
+def _is_yes(value):
+    # --specials arrives as "y"/"n" from the command line
+    if isinstance(value, str):
+        return value.strip().lower() in {"y", "yes", "true", "1"}
+    return bool(value)
+
+
+def _random_text(alphabet, size):
+    """
+    `size` characters drawn uniformly from `alphabet`, straight from os.urandom.
+
+    Each random byte is mapped to a character with one bytes.translate call.
+    Bytes at or above the largest multiple of len(alphabet) are deleted
+    rather than wrapped around, so every character is exactly as likely
+    (rejection sampling, no modulo bias).
+    """
+    alphabet = alphabet.encode("ascii")
+    limit = 256 - 256 % len(alphabet)
+    table = bytes(alphabet[byte % len(alphabet)] for byte in range(256))
+    rejected = bytes(range(limit, 256))
+
+    text = bytearray()
+    while len(text) < size:
+        missing = size - len(text)
+        # Ask for enough bytes to survive the expected rejections in one go
+        text += os.urandom(missing * 256 // limit + 16).translate(table, rejected)
+    return text[:size].decode("ascii")
+
+
+def _random_indexes(n, count):
+    """`count` uniform integers in [0, n), 32 bits at a time with rejection sampling."""
+    limit = 2 ** 32 - 2 ** 32 % n
+    indexes = []
+    while len(indexes) < count:
+        missing = count - len(indexes)
+        values = memoryview(os.urandom(4 * (missing + 8))).cast("I")
+        indexes.extend(value % n for value in values if value < limit)
+    return indexes[:count]
+
+
+def _password_batches(alphabet, length, count, required):
+    """Yield non-empty lists of passwords; candidates missing a required class are redrawn."""
+    required = [set(characters) for characters in required]
+    remaining = count
+    while remaining:
+        size = min(BATCH_SIZE, remaining)
+        text = _random_text(alphabet, size * length)
+        batch = [text[i:i + length] for i in range(0, len(text), length)]
+        batch = [password for password in batch if all(not group.isdisjoint(password) for group in required)]
+        remaining -= len(batch)
+        # Every candidate can be rejected (short passwords, many required classes)
+        if batch:
+            yield batch
+
+
+def _passphrase_batches(words, word_count, count, separator):
+    remaining = count
+    while remaining:
+        size = min(BATCH_SIZE, remaining)
+        indexes = _random_indexes(len(words), size * word_count)
+        yield [
+            separator.join(words[index] for index in indexes[i:i + word_count])
+            for i in range(0, len(indexes), word_count)
+        ]
+        remaining -= size
+
+
+def _load_wordlist(path):
+    with open(path, "r", encoding="utf-8", errors="ignore") as file:
+        words = {line.strip() for line in file}
+    # Sorted so the same list always maps indexes to the same words
+    return sorted(word for word in words if word and word.isalpha())
+
+
+def _open_sink(output):
+    if output in ("", "-"):
+        return sys.stdout, False
+    # Created owner-only: the file holds credentials
+    fd = os.open(output, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    return os.fdopen(fd, "w", encoding="utf-8"), True
+
+
 # Function to generate a random password
-def generate_password(length: int = 12, specials: bool = False):
+def generate_password(
+    length: int = 12,
+    specials: bool = False,
+    count: int = 1,
+    require: str = "",
+    words: int = 0,
+    wordlist: str = "",
+    separator: str = "-",
+    output: str = "",
+    log: bool = True,
+):
     """
     Generate a secure random password.
 
     Args:
         length (int): The desired length of the password. Defaults to 12.
         specials (bool): Include special characters (like !@#). Use 'y' for yes. Defaults to False.
+        count (int): How many passwords to generate. Defaults to 1.
+        require (str): Comma-separated classes every password must contain: lower, upper, digit, special.
+        words (int): Generate passphrases of this many words instead of passwords.
+        wordlist (str): Word file for passphrases, one word per line. Defaults to /usr/share/dict/words.
+        separator (str): Separator between passphrase words. Defaults to '-'.
+        output (str): Write the results to this file ('-' for stdout) instead of printing them.
+        log (bool): Record a single generated password in factotum.log. Defaults to True.
 
     Example:
         factotum --task generate-password --length 16 --specials y
+        factotum --task generate-password --count 10000 --require lower,upper,digit --output creds.txt
+        factotum --task generate-password --words 5 --count 20 --no-log
 
     Description:
         Creates a random password containing uppercase and lowercase letters,
         numbers, and optionally special characters for extra security.
+        Randomness comes from the operating system's CSPRNG (os.urandom), drawn in
+        large buffers and mapped to characters without modulo bias. Passwords missing
+        a required class are discarded and redrawn. Bulk results are streamed to the
+        output in batches (files are created readable by the owner only) and are never
+        written to factotum.log; use --no-log to keep a single password out of it too.
     """
 
-    import random
-    import string
+    count = int(count)
+    if count < 1:
+        console.print("❌ --count must be at least 1.", style="bold red")
+        return 1
+
+    if int(words) > 0:
+        wordlist = wordlist or DEFAULT_WORDLIST
+        try:
+            vocabulary = _load_wordlist(wordlist)
+        except OSError as e:
+            console.print(f"❌ Could not read wordlist {wordlist}: {e}", style="bold red")
+            return 1
+        if len(vocabulary) < 2:
+            console.print(f"❌ Wordlist {wordlist} has too few words.", style="bold red")
+            return 1
+        kind = "passphrase"
+        entropy = int(words) * math.log2(len(vocabulary))
+        batches = _passphrase_batches(vocabulary, int(words), count, separator)
+    else:
+        required = [name.strip().lower().rstrip("s") for name in require.split(",") if name.strip()]
+        unknown = [name for name in required if name not in CHARACTER_CLASSES]
+        if unknown:
+            console.print(
+                f"❌ Unknown character class(es): {', '.join(unknown)}. "
+                f"Choose from: {', '.join(CHARACTER_CLASSES)}",
+                style="bold red",
+            )
+            return 1
+        if len(required) > int(length):
+            console.print("❌ The password is shorter than the number of required classes.", style="bold red")
+            return 1
+
+        characters = string.ascii_letters + string.digits
+        if _is_yes(specials) or "special" in required:
+            characters += string.punctuation
+        kind = "password"
+        entropy = int(length) * math.log2(len(characters))
+        batches = _password_batches(characters, int(length), count, [CHARACTER_CLASSES[name] for name in required])
+
+    if count == 1 and not output:
+        password = next(batches)[0]
+        message = f"Generated {kind}: {password}"
+        console.print(f"✅ {message}", style="bold green")
+        log_task(message if log else f"Generated a {kind} ({entropy:.0f} bits, not logged)", task="generate-password")
+        return
 
-    characters = string.ascii_letters + string.digits
-    if specials:
-        characters += string.punctuation
+    sink, is_file = _open_sink(output)
+    # Keep stdout clean for the passwords themselves
+    status = console if is_file else Console(stderr=True)
+    start = time.perf_counter()
+    try:
+        for batch in batches:
+            sink.write("\n".join(batch) + "\n")
+    finally:
+        if is_file:
+            sink.close()
+        else:
+            sink.flush()
+    elapsed = time.perf_counter() - start
 
-    password = ''.join(random.choice(characters) for _ in range(length))
-    message = f"Generated password: {password}"
-    console.print(f"✅ {message}", style="bold green")
-    log_task(message)
\ No newline at end of file
+    destination = output if is_file else "stdout"
+    rate = count / elapsed if elapsed else float("inf")
+    status.print(
+        f"✅ Generated [bold green]{count}[/bold green] {kind}(s) (~{entropy:.0f} bits each) to {destination}"
+        f" in {elapsed:.2f}s ({rate:,.0f}/s)",
+        style="bold",
+    )
+    log_task(f"Generated {count} {kind}(s) to {destination}", task="generate-password", count=count,
+             duration=round(elapsed, 3))
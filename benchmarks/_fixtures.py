@@ -0,0 +1,183 @@
+"""
+Offline fixtures for the tool benchmarks.
+
+Everything is served from 127.0.0.1 or created under a temporary directory:
+a static file server with ETag/Range support, stubs for the GitHub and
+CoinGecko APIs, local bare git repositories and generated file trees.
+"""
+import hashlib
+import json
+import math
+import os
+import subprocess
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class _QuietHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=b"", headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+
+
+def _serve(handler):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def static_server(root):
+    """Serve files under `root` with ETag, If-None-Match and single Range support."""
+
+    class Handler(_QuietHandler):
+        def do_GET(self):
+            path = os.path.join(root, urlparse(self.path).path.lstrip("/"))
+            if not os.path.isfile(path):
+                return self._send(404)
+            stat = os.stat(path)
+            etag = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+            if self.headers.get("If-None-Match") == etag:
+                return self._send(304, headers={"ETag": etag})
+
+            start, end, status = 0, stat.st_size - 1, 200
+            range_header = self.headers.get("Range", "")
+            if range_header.startswith("bytes="):
+                first, _, last = range_header[6:].partition("-")
+                start = int(first or 0)
+                end = int(last) if last else end
+                status = 206
+            self.send_response(status)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(end - start + 1))
+            if status == 206:
+                self.send_header("Content-Range", f"bytes {start}-{end}/{stat.st_size}")
+            self.end_headers()
+            with open(path, "rb") as file:
+                file.seek(start)
+                remaining = end - start + 1
+                while remaining > 0:
+                    chunk = file.read(min(1024 * 1024, remaining))
+                    if not chunk:
+                        break
+                    self.wfile.write(chunk)
+                    remaining -= len(chunk)
+
+    return _serve(Handler)
+
+
+def github_stub(repos):
+    """
+    Stub of the repository listing endpoints.
+
+    `repos` is a list of {"name", "clone_url"} dicts; pages honour per_page
+    and carry Link headers and ETags like the real API.
+    """
+
+    class Handler(_QuietHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            page = int(query.get("page", ["1"])[0])
+            per_page = int(query.get("per_page", ["30"])[0])
+            last = max(1, math.ceil(len(repos) / per_page))
+            data = [
+                dict(repo, pushed_at="2024-01-01T00:00:00Z", default_branch="main")
+                for repo in repos[(page - 1) * per_page:page * per_page]
+            ]
+            body = json.dumps(data).encode()
+            etag = f'"{hashlib.sha1(body).hexdigest()}"'
+            if self.headers.get("If-None-Match") == etag:
+                return self._send(304, headers={"ETag": etag})
+
+            base = f"http://{self.headers['Host']}{url.path}?per_page={per_page}&type=all"
+            links = [f'<{base}&page={page + 1}>; rel="next"'] if page < last else []
+            links.append(f'<{base}&page={last}>; rel="last"')
+            self._send(200, body, {"ETag": etag, "Link": ", ".join(links), "Content-Type": "application/json"})
+
+    return _serve(Handler)
+
+
+def coingecko_stub():
+    """Stub of simple/price and market_chart/range with deterministic prices."""
+
+    class Handler(_QuietHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            if url.path.endswith("/simple/price"):
+                coins = query["ids"][0].split(",")
+                currencies = query["vs_currencies"][0].split(",")
+                data = {
+                    coin: {vs: round(1000 + int(hashlib.md5(coin.encode()).hexdigest()[:6], 16) % 5000, 2)
+                           for vs in currencies}
+                    for coin in coins
+                }
+            elif url.path.endswith("/market_chart/range"):
+                start, end = int(float(query["from"][0])), int(float(query["to"][0]))
+                step = 86400 if end - start > 90 * 86400 else 3600
+                data = {"prices": [
+                    [ts * 1000, 100 + 10 * math.sin(ts / 86400 / 30)]
+                    for ts in range((start + step - 1) // step * step, end, step)
+                ]}
+            else:
+                return self._send(404)
+            self._send(200, json.dumps(data).encode(), {"Content-Type": "application/json"})
+
+    return _serve(Handler)
+
+
+def _git(*args, cwd=None):
+    env = dict(os.environ, GIT_AUTHOR_NAME="bench", GIT_AUTHOR_EMAIL="bench@example.com",
+               GIT_COMMITTER_NAME="bench", GIT_COMMITTER_EMAIL="bench@example.com")
+    subprocess.run(["git", *args], cwd=cwd, env=env, check=True, capture_output=True)
+
+
+def bare_repos(root, count, commits=5, files=50):
+    """Create `count` bare repositories with some history; returns the listing entries."""
+    os.makedirs(root, exist_ok=True)
+    work = os.path.join(root, "_work")
+    _git("init", "-q", "-b", "main", work)
+    for commit in range(commits):
+        for index in range(files):
+            with open(os.path.join(work, f"file{index}.txt"), "w") as file:
+                file.write(f"commit {commit} file {index}\n" * 200)
+        _git("add", "-A", cwd=work)
+        _git("commit", "-q", "-m", f"commit {commit}", cwd=work)
+
+    repos = []
+    for index in range(count):
+        path = os.path.join(root, f"repo{index}.git")
+        _git("clone", "-q", "--bare", work, path)
+        repos.append({"name": f"repo{index}", "clone_url": f"file://{path}"})
+    return repos
+
+
+def file_tree(root, count, extensions=("txt", "jpg", "pdf", "mp3", "zip", "csv", "md", "png")):
+    """Create `count` small files spread over a few extensions directly under `root`."""
+    os.makedirs(root, exist_ok=True)
+    for index in range(count):
+        name = f"file{index:06d}.{extensions[index % len(extensions)]}"
+        with open(os.path.join(root, name), "wb") as file:
+            file.write(index.to_bytes(4, "little"))
+
+
+def large_file(path, size):
+    """Write `size` bytes of incompressible data in 1 MiB chunks."""
+    with open(path, "wb") as file:
+        remaining = size
+        while remaining > 0:
+            chunk = os.urandom(min(1024 * 1024, remaining))
+            file.write(chunk)
+            remaining -= len(chunk)
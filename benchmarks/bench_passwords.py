@@ -0,0 +1,88 @@
+"""
+Measure bulk password generation throughput.
+
+Compares the old per-character approaches (random.choice, secrets.choice)
+with the batched os.urandom generator used by generate-password, with and
+without required character classes, plus passphrases from a synthetic
+7776-word list. Results are passwords per second (best of --runs).
+
+    python benchmarks/bench_passwords.py [--count 100000] [--runs 3] [--json results.json]
+"""
+import argparse
+import json
+import random
+import secrets
+import string
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from FactotumCLI.tools.password import (  # noqa: E402
+    CHARACTER_CLASSES,
+    _passphrase_batches,
+    _password_batches,
+)
+
+ALPHABET = string.ascii_letters + string.digits + string.punctuation
+LENGTH = 16
+WORDS = [f"word{i:04d}" for i in range(7776)]
+
+
+def per_char_random(count):
+    return [''.join(random.choice(ALPHABET) for _ in range(LENGTH)) for _ in range(count)]
+
+
+def per_char_secrets(count):
+    return [''.join(secrets.choice(ALPHABET) for _ in range(LENGTH)) for _ in range(count)]
+
+
+def batched(count):
+    return [p for batch in _password_batches(ALPHABET, LENGTH, count, []) for p in batch]
+
+
+def batched_required(count):
+    required = list(CHARACTER_CLASSES.values())
+    return [p for batch in _password_batches(ALPHABET, LENGTH, count, required) for p in batch]
+
+
+def passphrases(count):
+    return [p for batch in _passphrase_batches(WORDS, 5, count, "-") for p in batch]
+
+
+SCENARIOS = {
+    "random.choice (old)": per_char_random,
+    "secrets.choice": per_char_secrets,
+    "batched urandom": batched,
+    "batched + 4 classes": batched_required,
+    "passphrase x5 words": passphrases,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FactotumCLI password generation benchmark")
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    results = {}
+    for name, generate in SCENARIOS.items():
+        timings = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            generated = generate(args.count)
+            timings.append(time.perf_counter() - start)
+            assert len(generated) == args.count
+        best = min(timings)
+        results[name] = {"best_s": best, "per_second": args.count / best}
+        print(f"{name:<22} {args.count / best:>12,.0f} passwords/s   best {best * 1000:8.1f} ms")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
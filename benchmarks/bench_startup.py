@@ -0,0 +1,85 @@
+"""
+Measure FactotumCLI cold-start latency.
+
+Runs each scenario in a fresh interpreter several times and reports the best
+and median wall time, plus which tool modules got imported along the way.
+`list` and `help` must not import any tool module; a regression shows up as a
+non-empty "tool_modules" list or a jump in the timings.
+
+    python benchmarks/bench_startup.py [--runs 10] [--json results.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SCENARIOS = {
+    "import": [],
+    "list": ["--task", "list"],
+    "help": ["--task", "help", "--tool", "github-repo-cloner"],
+}
+
+# Runs the CLI and reports which FactotumCLI.tools modules ended up loaded.
+RUNNER = """
+import sys
+sys.argv = ["factotum"] + sys.argv[1:]
+from FactotumCLI import cli
+if len(sys.argv) > 1:
+    cli.main()
+print("\\n@@" + ",".join(m for m in sys.modules if m.startswith("FactotumCLI.tools.")))
+"""
+
+
+def run_scenario(argv, runs):
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    timings = []
+    tool_modules = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-c", RUNNER, *argv],
+            env=env, capture_output=True, text=True, check=True,
+        )
+        timings.append(time.perf_counter() - start)
+        marker = result.stdout.rsplit("@@", 1)[-1].strip()
+        tool_modules = [m for m in marker.split(",") if m]
+    return {
+        "best_ms": min(timings) * 1000,
+        "median_ms": statistics.median(timings) * 1000,
+        "tool_modules": tool_modules,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FactotumCLI startup benchmark")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    # Warm the manifest cache once so every timed run measures the steady state
+    run_scenario(SCENARIOS["list"], 1)
+
+    results = {name: run_scenario(argv, args.runs) for name, argv in SCENARIOS.items()}
+
+    for name, result in results.items():
+        print(
+            f"{name:<8} best {result['best_ms']:7.1f} ms   "
+            f"median {result['median_ms']:7.1f} ms   "
+            f"tool modules imported: {', '.join(result['tool_modules']) or 'none'}"
+        )
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+    if any(result["tool_modules"] for result in results.values()):
+        sys.exit("❌ A startup path imported tool modules.")
+
+
+if __name__ == "__main__":
+    main()
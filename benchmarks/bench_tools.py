@@ -0,0 +1,245 @@
+"""
+Measure each tool end to end against local fixtures (no network needed).
+
+Every scenario calls the tool function in-process, exactly as the CLI would,
+with its console output discarded. The fixtures are a throw-away cache
+directory, a local HTTP server with large bodies, stub GitHub and CoinGecko
+APIs and local bare git repositories (see _fixtures.py). Besides the wall
+time, each scenario records the tool's own metrics spans, so a regression
+can be traced to the stage that got slower.
+
+    python benchmarks/bench_tools.py [--runs 3] [--sizes 1000,100000] [--urls 500] [--json results.json]
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import _fixtures
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def measure(name, call, runs, setup=None):
+    """
+    Run `call` `runs` times (after `setup`, untimed) and collect timings, spans and
+    the number of HTTP requests of every run.
+
+    Tools return 1 when they fail; a failure is raised with the scenario name
+    rather than timed, or a tool that gave up early would look like a speedup.
+    """
+    from FactotumCLI import metrics
+
+    timings = []
+    requests = []
+    snapshot = {}
+    for _ in range(runs):
+        if setup is not None:
+            setup()
+        metrics.reset()
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            start = time.perf_counter()
+            status = call()
+            timings.append(time.perf_counter() - start)
+        if isinstance(status, int) and status != 0:
+            raise RuntimeError(f"Scenario {name} failed: the tool returned exit code {status}")
+        snapshot = metrics.snapshot("", 0, 0)
+        requests.append(snapshot["counters"].get("requests", 0))
+    return {
+        "best_s": min(timings),
+        "median_s": statistics.median(timings),
+        # A "cached" scenario should make few requests, or none
+        "requests": requests,
+        "spans": snapshot["spans"],
+    }
+
+
+def bench_organizer(work, sizes, runs):
+    from FactotumCLI.tools.organizer import organize_files
+
+    results = {}
+    for size in sizes:
+        tree = work / f"tree{size}"
+
+        def fresh_tree():
+            shutil.rmtree(tree, ignore_errors=True)
+            _fixtures.file_tree(tree, size)
+
+        # Large trees are slow to generate; one run is enough to spot a regression
+        size_runs = runs if size <= 10_000 else 1
+        name = f"organize_{size}"
+        results[name] = measure(name, lambda: organize_files(str(tree), jobs=8), size_runs, fresh_tree)
+        # Later passes over the organized tree, recursive so the extension folders (every
+        # file) are in scope: the journal should make them nearly free, a full scan lists them all.
+        # Folders changed in the last two seconds are always relisted, so the freshly organized
+        # tree is aged first and one pass records it, as it would be on a real rerun.
+        past = time.time() - 60
+        for folder, _, _ in os.walk(tree):
+            os.utime(folder, (past, past))
+        measure(f"{name}_unchanged (priming)", lambda: organize_files(str(tree), recursive=True, jobs=8), 1)
+        results[f"{name}_unchanged"] = measure(
+            f"{name}_unchanged", lambda: organize_files(str(tree), recursive=True, jobs=8), runs,
+        )
+        results[f"{name}_full_scan"] = measure(
+            f"{name}_full_scan", lambda: organize_files(str(tree), recursive=True, jobs=8, incremental=False), runs,
+        )
+        shutil.rmtree(tree, ignore_errors=True)
+    return results
+
+
+def bench_downloader(work, body_mb, url_count, runs):
+    from FactotumCLI.tools.downloader import download_webpage, download_webpages
+
+    www = work / "www"
+    (www / "many").mkdir(parents=True)
+    _fixtures.large_file(www / "big.bin", body_mb * 1024 * 1024)
+    # Small bodies, so per-request overhead and connection reuse dominate
+    for index in range(url_count):
+        _fixtures.large_file(www / "many" / f"file{index:05d}.bin", 64 * 1024)
+    server, base = _fixtures.static_server(str(www))
+    output = work / "big.bin"
+    bulk_output = work / "bulk"
+    url_file = work / "urls.txt"
+    url_file.write_text("".join(f"{base}/many/file{index:05d}.bin\n" for index in range(url_count)))
+
+    def remove_output():
+        output.unlink(missing_ok=True)
+
+    def remove_bulk_output():
+        shutil.rmtree(bulk_output, ignore_errors=True)
+
+    def download(cache):
+        return download_webpage(f"{base}/big.bin", str(output), cache=cache)
+
+    name = f"download_{body_mb}mb"
+    try:
+        results = {name: measure(name, lambda: download(False), runs, remove_output)}
+        results[name]["mb_per_s"] = body_mb / results[name]["best_s"]
+        # Prime the HTTP cache, then every run is a conditional request answered with 304
+        measure(f"{name}_cached (priming)", lambda: download(True), 1, remove_output)
+        results[f"{name}_cached"] = measure(f"{name}_cached", lambda: download(True), runs, remove_output)
+
+        bulk = measure(
+            f"download_{url_count}_urls",
+            lambda: download_webpages(str(url_file), str(bulk_output), jobs=16, per_host=16, cache=False),
+            runs, remove_bulk_output,
+        )
+        bulk["mb_per_s"] = url_count * 64 / 1024 / bulk["best_s"]
+        bulk["urls_per_s"] = url_count / bulk["best_s"]
+        results[f"download_{url_count}_urls"] = bulk
+    finally:
+        server.shutdown()
+    return results
+
+
+def bench_cloner(work, repo_count, runs):
+    from FactotumCLI.tools.github_cloner import github_repo_cloner
+
+    target = work / "clones"
+
+    def clean_target():
+        shutil.rmtree(target, ignore_errors=True)
+
+    def sync():
+        return github_repo_cloner("bench", output_dir=str(target), mode="both", repos="all")
+
+    name = f"clone_{repo_count}_repos"
+    return {
+        name: measure(name, sync, runs, clean_target),
+        # Everything is cloned and nothing was pushed since: the listing is revalidated (304)
+        # and every repository is skipped through the sync manifest, without any git call
+        f"{name}_unchanged": measure(f"{name}_unchanged", sync, runs),
+    }
+
+
+def bench_crypto(runs):
+    from FactotumCLI.config import cache_path
+    from FactotumCLI.tools.crypto import check_crypto_price, crypto_price_history
+
+    coins = ",".join(f"coin{index}" for index in range(50))
+
+    def clear_crypto_cache():
+        shutil.rmtree(cache_path("crypto"), ignore_errors=True)
+
+    def prices(ttl):
+        return check_crypto_price(coins=coins, vs_currencies="cad,usd,eur", ttl=ttl)
+
+    def history():
+        return crypto_price_history(coins="coin0,coin1,coin2,coin3,coin4", days=365)
+
+    results = {
+        "crypto_price_50": measure("crypto_price_50", lambda: prices(0), runs, clear_crypto_cache),
+        "crypto_price_50_cached": measure("crypto_price_50_cached", lambda: prices(3600), runs),
+        "crypto_history_5x365": measure("crypto_history_5x365", history, runs, clear_crypto_cache),
+    }
+    # A year of history is stored as daily points, so the first rerun still refreshes the
+    # recent tail; after that a rerun within the refresh interval needs no request at all
+    measure("crypto_history_5x365_cached (priming)", history, 1)
+    results["crypto_history_5x365_cached"] = measure("crypto_history_5x365_cached", history, runs)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FactotumCLI tool benchmarks (offline)")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--sizes", default="1000,100000", help="Comma-separated organizer tree sizes")
+    parser.add_argument("--body-mb", type=int, default=64, help="Size of the downloaded body in MiB")
+    parser.add_argument("--urls", type=int, default=500, help="Number of 64 KiB files fetched by the bulk download")
+    parser.add_argument("--repos", type=int, default=8, help="Number of bare repositories to clone")
+    parser.add_argument("--only", default="", help="Comma-separated subset: organizer,downloader,cloner,crypto")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    selected = {name for name in args.only.split(",") if name} or {"organizer", "downloader", "cloner", "crypto"}
+    work = Path(tempfile.mkdtemp(prefix="factotum-bench-"))
+    servers = []
+    try:
+        # The tools read these at import time, so they are set before any import
+        os.environ["FACTOTUM_CACHE_DIR"] = str(work / "cache")
+        os.environ["FACTOTUM_LOG_FILE"] = str(work / "factotum.log")
+        os.environ.pop("GITHUB_TOKEN", None)
+        if "cloner" in selected:
+            server, github_api = _fixtures.github_stub(_fixtures.bare_repos(str(work / "remotes"), args.repos))
+            servers.append(server)
+            os.environ["GITHUB_API_URL"] = github_api
+        if "crypto" in selected:
+            server, coingecko_api = _fixtures.coingecko_stub()
+            servers.append(server)
+            os.environ["COINGECKO_API_URL"] = coingecko_api
+            # The stub has no rate limit to respect
+            os.environ["COINGECKO_RATE"] = "0"
+
+        results = {}
+        if "organizer" in selected:
+            results.update(bench_organizer(work, [int(size) for size in args.sizes.split(",") if size], args.runs))
+        if "downloader" in selected:
+            results.update(bench_downloader(work, args.body_mb, args.urls, args.runs))
+        if "cloner" in selected:
+            results.update(bench_cloner(work, args.repos, args.runs))
+        if "crypto" in selected:
+            results.update(bench_crypto(args.runs))
+    finally:
+        for server in servers:
+            server.shutdown()
+        shutil.rmtree(work, ignore_errors=True)
+
+    for name, result in results.items():
+        extra = f"   {result['mb_per_s']:8.1f} MB/s" if "mb_per_s" in result else ""
+        if "urls_per_s" in result:
+            extra += f"   {result['urls_per_s']:8.1f} URLs/s"
+        print(f"{name:<34} best {result['best_s'] * 1000:9.1f} ms   median {result['median_s'] * 1000:9.1f} ms"
+              f"   requests {','.join(map(str, result['requests'])):>8}{extra}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
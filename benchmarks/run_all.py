@@ -0,0 +1,104 @@
+"""
+Run every benchmark and save one JSON report that can be compared across commits.
+
+Each benchmark script runs in its own interpreter (so imports done by one do
+not flatter the next) and writes its own JSON; this script merges them with
+the commit, Python version and platform they were measured on.
+
+    python benchmarks/run_all.py --output bench-$(git rev-parse --short HEAD).json
+    python benchmarks/run_all.py --quick --compare bench-abc1234.json
+
+With --compare, every timing is shown next to the one in the older report,
+and the exit code is 1 if anything got slower by more than --threshold.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parent
+
+# Timing keys compared by --compare; lower is better for all of them
+TIMING_KEYS = ("best_ms", "best_s")
+
+
+def _git_commit():
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT, capture_output=True, text=True)
+        return result.stdout.strip() + ("-dirty" if dirty.stdout.strip() else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(script, args):
+    with tempfile.NamedTemporaryFile(suffix=".json") as output:
+        subprocess.run([sys.executable, str(HERE / script), *args, "--json", output.name], check=True)
+        return json.loads(Path(output.name).read_text() or "{}")
+
+
+def compare(current, previous, threshold):
+    """Print the change of every timing; returns the names that regressed beyond `threshold`."""
+    regressions = []
+    for suite, results in current["results"].items():
+        for name, result in results.items():
+            old = previous.get("results", {}).get(suite, {}).get(name)
+            key = next((key for key in TIMING_KEYS if key in result), None)
+            if old is None or key is None or not old.get(key):
+                continue
+            change = result[key] / old[key] - 1
+            marker = "🔺" if change > threshold else "🟢" if change < -threshold else "  "
+            label = f"{suite}/{name}"
+            print(f"{marker} {label:<44} {old[key]:10.4g} -> {result[key]:10.4g} {key[5:]}   {change:+7.1%}")
+            if change > threshold:
+                regressions.append(f"{suite}/{name}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run all FactotumCLI benchmarks")
+    parser.add_argument("--output", default="benchmark-results.json", help="Where to write the combined report")
+    parser.add_argument("--quick", action="store_true", help="Smaller inputs and fewer runs, for a fast check")
+    parser.add_argument("--compare", help="Earlier report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown counted as a regression")
+    args = parser.parse_args()
+
+    runs = ["--runs", "2"] if args.quick else []
+    tool_args = ["--sizes", "1000,10000", "--body-mb", "16", "--urls", "200", "--repos", "4"] if args.quick else []
+
+    started = time.time()
+    report = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(started)),
+        "quick": args.quick,
+        "results": {
+            "startup": run_benchmark("bench_startup.py", runs),
+            "passwords": run_benchmark("bench_passwords.py", (runs + ["--count", "20000"]) if args.quick else []),
+            "tools": run_benchmark("bench_tools.py", runs + tool_args),
+        },
+    }
+    report["duration_s"] = time.time() - started
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print(f"\n📊 Results written to {args.output}")
+
+    if args.compare:
+        previous = json.loads(Path(args.compare).read_text())
+        print(f"\nCompared with {previous.get('commit') or args.compare}:")
+        if previous.get("quick") != args.quick:
+            print("⚠️  The reports were made with different --quick settings; sizes may not match.")
+        regressions = compare(report, previous, args.threshold)
+        if regressions:
+            sys.exit(f"❌ {len(regressions)} benchmark(s) slower by more than {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,9 +8,14 @@ setup(
         "requests",
         "rich",
     ],
+    extras_require={
+        "history": ["numpy"],
+        "yaml": ["pyyaml"],
+    },
     entry_points={
         "console_scripts": [
             "factotum = FactotumCLI.cli:main",
+            "factotum-client = FactotumCLI.client:main",
         ],
     },
     author="Xavier Dugal",
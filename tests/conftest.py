@@ -0,0 +1,70 @@
+"""
+Shared fixtures: every test gets its own cache directory, and stub servers
+run on 127.0.0.1 so no test touches the network.
+"""
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Read when the package is imported, so they are set before any test module imports it
+os.environ.setdefault("FACTOTUM_LOG_FILE", os.path.join(tempfile.mkdtemp(prefix="factotum-tests-"), "factotum.log"))
+os.environ.setdefault("FACTOTUM_CACHE_DIR", tempfile.mkdtemp(prefix="factotum-tests-cache-"))
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Base request handler: quiet, keep-alive, and every request is recorded on the server."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def parse_request(self):
+        ok = super().parse_request()
+        if ok:
+            with self.server.lock:
+                self.server.requests.append((self.path, dict(self.headers)))
+        return ok
+
+    def send(self, status, body=b"", headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+
+
+@pytest.fixture
+def serve():
+    """Start a stub server for a StubHandler subclass; returns (server, base URL)."""
+    servers = []
+
+    def start(handler):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        server.daemon_threads = True
+        server.requests = []
+        server.lock = threading.Lock()
+        # A short poll interval keeps shutdown() at teardown fast
+        threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        servers.append(server)
+        return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """A fresh cache directory per test."""
+    from FactotumCLI import config
+
+    path = tmp_path / "cache"
+    monkeypatch.setattr(config, "CACHE_DIR", path)
+    return path
@@ -0,0 +1,101 @@
+import json
+import os
+import threading
+import time
+from urllib.parse import unquote, urlparse
+
+import pytest
+
+from FactotumCLI.tools.downloader import download_webpages
+
+from conftest import StubHandler
+
+
+class FilesStub(StubHandler):
+    """Serves the path as the body, after `delay` seconds; /flaky fails once with 503, /missing 404s."""
+
+    delay = 0
+
+    def do_GET(self):
+        path = unquote(urlparse(self.path).path)
+        with self.server.lock:
+            self.server.active += 1
+            self.server.peak = max(self.server.peak, self.server.active)
+            first_try = path not in self.server.seen
+            self.server.seen.add(path)
+        try:
+            time.sleep(self.delay)
+            if path == "/missing":
+                return self.send(404)
+            if path == "/flaky" and first_try:
+                return self.send(503, headers={"Retry-After": "0.3"})
+            self.send(200, path.encode(), {"Content-Type": "application/octet-stream"})
+        finally:
+            with self.server.lock:
+                self.server.active -= 1
+
+
+@pytest.fixture
+def files(serve):
+    server, base = serve(FilesStub)
+    server.active = server.peak = 0
+    server.seen = set()
+    return server, base
+
+
+def _run(tmp_path, urls, **options):
+    url_file = tmp_path / "urls.txt"
+    url_file.write_text("\n".join(urls) + "\n")
+    output_dir = tmp_path / "out"
+    status = download_webpages(url_file=str(url_file), output_dir=str(output_dir), cache=False, **options)
+    records = [json.loads(line) for line in (output_dir / "manifest.jsonl").read_text().splitlines()]
+    return status, {urlparse(record["url"]).path: record for record in records}
+
+
+def test_manifest_records_every_url(files, tmp_path):
+    _, base = files
+
+    status, records = _run(tmp_path, [f"{base}/a.txt", f"{base}/missing"], retries=2)
+
+    assert status == 1
+    assert records["/a.txt"]["status"] == "ok" and records["/a.txt"]["bytes"] == len("/a.txt")
+    assert open(records["/a.txt"]["path"], "rb").read() == b"/a.txt"
+    # A 404 is not worth retrying
+    assert records["/missing"]["status"] == "error"
+    assert records["/missing"]["http_status"] == 404 and records["/missing"]["attempts"] == 1
+
+
+def test_directory_like_and_colliding_urls_get_their_own_files(files, tmp_path):
+    _, base = files
+    paths = ["/docs", "/docs/intro", "/a%20b.txt", "/a_b.txt", "/c.txt", "/c.txt/d"]
+
+    status, records = _run(tmp_path, [base + path for path in paths])
+
+    assert status is None
+    saved = {path: records[path]["path"] for path in paths}
+    assert saved["/docs"].endswith(os.path.join("docs", "index.html"))
+    assert saved["/docs/intro"].endswith(os.path.join("docs", "intro", "index.html"))
+    assert len(set(saved.values())) == len(paths)
+    for path, destination in saved.items():
+        assert open(destination, "rb").read() == unquote(path).encode()
+
+
+def test_per_host_cap(files, tmp_path, monkeypatch):
+    server, base = files
+    monkeypatch.setattr(FilesStub, "delay", 0.1)
+
+    status, records = _run(tmp_path, [f"{base}/{index}.bin" for index in range(8)], jobs=8, per_host=2)
+
+    assert status is None and len(records) == 8
+    assert server.peak == 2
+
+
+def test_retry_after_is_honoured(files, tmp_path):
+    server, base = files
+
+    status, records = _run(tmp_path, [f"{base}/flaky"], retries=2)
+
+    assert status is None
+    assert records["/flaky"]["attempts"] == 2
+    assert records["/flaky"]["elapsed"] >= 0.3
+    assert [urlparse(path).path for path, _ in server.requests] == ["/flaky", "/flaky"]
@@ -0,0 +1,169 @@
+import json
+import os
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from FactotumCLI.config import cache_path
+from FactotumCLI.tools import crypto
+
+from conftest import StubHandler
+
+KNOWN_PRICES = {"bitcoin": 90000.0, "ethereum": 4000.0, "dogecoin": 0.25}
+
+
+class CoinGeckoStub(StubHandler):
+    """simple/price: a price for every coin in KNOWN_PRICES or named coinNNN, nothing for others."""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != "/simple/price":
+            return self.send(404)
+        query = parse_qs(url.query)
+        data = {}
+        for coin in query["ids"][0].split(","):
+            if coin in KNOWN_PRICES or coin.startswith("coin"):
+                price = KNOWN_PRICES.get(coin, 1.0)
+                data[coin] = {vs: price for vs in query["vs_currencies"][0].split(",")}
+        self.send(200, json.dumps(data).encode(), {"Content-Type": "application/json"})
+
+
+@pytest.fixture
+def coingecko(serve, monkeypatch):
+    server, base = serve(CoinGeckoStub)
+    monkeypatch.setattr(crypto, "COINGECKO_API_URL", base)
+    monkeypatch.setattr(crypto, "COINGECKO_RATE", 0)
+    return server
+
+
+def _ids(server):
+    return [parse_qs(urlparse(path).query)["ids"][0] for path, _ in server.requests]
+
+
+def test_batches_keep_ids_under_limit(monkeypatch):
+    monkeypatch.setattr(crypto, "MAX_IDS_LENGTH", 50)
+    coins = [f"coin{index:03d}" for index in range(40)]
+
+    batches = list(crypto._batches(coins))
+
+    assert [coin for batch in batches for coin in batch] == coins
+    assert all(len(",".join(batch)) <= 50 for batch in batches)
+    # Six 7-character ids (plus commas) fit in 50 characters
+    assert len(batches) == 7
+
+
+def test_many_coins_take_one_request_per_batch(coingecko, monkeypatch):
+    monkeypatch.setattr(crypto, "MAX_IDS_LENGTH", 50)
+    coins = [f"coin{index:03d}" for index in range(40)]
+
+    prices = crypto._get_prices(coins, ["cad", "usd"], ttl=60)
+
+    assert len(coingecko.requests) == len(list(crypto._batches(coins)))
+    assert all(len(ids) <= 50 for ids in _ids(coingecko))
+    assert all(parse_qs(urlparse(path).query)["vs_currencies"] == ["cad,usd"] for path, _ in coingecko.requests)
+    assert prices == {(coin, vs): 1.0 for coin in coins for vs in ["cad", "usd"]}
+
+
+def test_fresh_prices_come_from_cache(coingecko):
+    crypto._get_prices(["bitcoin", "ethereum"], ["cad"], ttl=60)
+    prices = crypto._get_prices(["bitcoin", "ethereum"], ["cad"], ttl=60)
+
+    assert len(coingecko.requests) == 1
+    assert prices == {("bitcoin", "cad"): 90000.0, ("ethereum", "cad"): 4000.0}
+
+
+def test_stale_prices_are_fetched_again(coingecko):
+    crypto._get_prices(["bitcoin", "ethereum"], ["cad"], ttl=60)
+    cache_file = cache_path("crypto", "prices.json")
+    cache = json.loads(cache_file.read_text())
+    # Age only bitcoin past the TTL
+    cache["bitcoin|cad"][1] -= 120
+    cache_file.write_text(json.dumps(cache))
+
+    crypto._get_prices(["bitcoin", "ethereum"], ["cad"], ttl=60)
+
+    assert _ids(coingecko) == ["bitcoin,ethereum", "bitcoin"]
+
+
+def test_only_missing_currencies_are_requested(coingecko):
+    crypto._get_prices(["bitcoin"], ["cad"], ttl=60)
+    crypto._get_prices(["bitcoin"], ["cad", "usd"], ttl=60)
+
+    assert parse_qs(urlparse(coingecko.requests[1][0]).query)["vs_currencies"] == ["usd"]
+
+
+def test_unknown_coins_are_cached_as_not_found(coingecko, capsys):
+    prices = crypto._get_prices(["bitcoin", "nosuchcoin"], ["cad"], ttl=60)
+    assert prices[("nosuchcoin", "cad")] is None
+
+    crypto.check_crypto_price(coin="nosuchcoin", ttl=60)
+
+    assert len(coingecko.requests) == 1
+    assert "Coin 'nosuchcoin' not found" in capsys.readouterr().out
+
+
+def test_json_output(coingecko, capsys):
+    crypto.check_crypto_price(coins="bitcoin,dogecoin,nosuchcoin", vs_currencies="cad,usd", output_format="json")
+
+    assert json.loads(capsys.readouterr().out) == {
+        "bitcoin": {"cad": 90000.0, "usd": 90000.0},
+        "dogecoin": {"cad": 0.25, "usd": 0.25},
+        "nosuchcoin": {"cad": None, "usd": None},
+    }
+
+
+def test_table_output(coingecko, capsys):
+    crypto.check_crypto_price(coins="bitcoin,dogecoin", vs_currencies="cad,usd")
+
+    out = capsys.readouterr().out
+    assert "bitcoin" in out and "dogecoin" in out
+    assert "90,000.00" in out and "0.25" in out
+    assert "CAD" in out.upper() and "USD" in out.upper()
+
+
+def test_errors_return_exit_code(coingecko, monkeypatch):
+    monkeypatch.setattr(crypto, "COINGECKO_API_URL", crypto.COINGECKO_API_URL + "/missing")
+
+    assert crypto.check_crypto_price(coin="bitcoin", ttl=0) == 1
+    assert crypto.check_crypto_price(coin="bitcoin", output_format="xml") == 1
+
+
+def test_history_stats_weigh_every_day_once():
+    np = pytest.importorskip("numpy")
+    day = 86_400_000
+    # Two daily points, then a day sampled every hour at a much higher price
+    timestamps = np.array([0, day] + [2 * day + hour * 3_600_000 for hour in range(24)], dtype="<i8")
+    prices = np.array([10.0, 20.0] + [30.0 + hour for hour in range(24)], dtype="<f8")
+
+    stats = crypto._history_stats(np, timestamps, prices, window=3)
+
+    assert stats["points"] == 26 and stats["days"] == 3
+    assert stats["latest"] == 53.0
+    assert (stats["period_min"], stats["period_max"]) == (10.0, 53.0)
+    assert stats["period_mean"] == pytest.approx((10 + 20 + 53) / 3)
+
+
+def test_backfill_switches_both_columns_at_once(monkeypatch):
+    np = pytest.importorskip("numpy")
+    crypto._append_history(np, "bitcoin", "cad", [3000, 4000], [3.0, 4.0])
+
+    def crash(*args):
+        raise OSError("crashed")
+
+    # Dying before the pointer is swapped keeps the old pair of columns
+    with monkeypatch.context() as patch:
+        patch.setattr(crypto.os, "replace", crash)
+        with pytest.raises(OSError):
+            crypto._rewrite_history(np, "bitcoin", "cad", [1000, 2000, 3000, 4000], [1.0, 2.0, 3.0, 4.0])
+    timestamps, prices = crypto._load_history(np, "bitcoin", "cad")
+    assert list(timestamps) == [3000, 4000] and list(prices) == [3.0, 4.0]
+
+    crypto._rewrite_history(np, "bitcoin", "cad", [1000, 2000, 3000, 4000], [1.0, 2.0, 3.0, 4.0])
+    crypto._append_history(np, "bitcoin", "cad", [5000], [5.0])
+
+    timestamps, prices = crypto._load_history(np, "bitcoin", "cad")
+    assert list(timestamps) == [1000, 2000, 3000, 4000, 5000]
+    assert list(prices) == [1.0, 2.0, 3.0, 4.0, 5.0]
+    # Only the current generation and the pointer are left
+    pair_dir = crypto._history_dir("bitcoin", "cad")
+    assert sorted(os.listdir(pair_dir)) == sorted(["current", pair_dir.joinpath("current").read_text()])
@@ -0,0 +1,96 @@
+import hashlib
+import json
+import math
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from FactotumCLI.tools import github_cloner
+
+from conftest import StubHandler
+
+REPOS = [{"name": f"repo{index:03d}", "clone_url": f"https://example.com/repo{index:03d}.git"} for index in range(250)]
+
+
+class GitHubStub(StubHandler):
+    """Repository listing with per_page pagination, Link headers and ETags like the real API."""
+
+    repos = REPOS
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        page = int(query.get("page", ["1"])[0])
+        per_page = int(query.get("per_page", ["30"])[0])
+        last = max(1, math.ceil(len(self.repos) / per_page))
+        body = json.dumps(self.repos[(page - 1) * per_page:page * per_page]).encode()
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        if self.headers.get("If-None-Match") == etag:
+            return self.send(304, headers={"ETag": etag})
+
+        base = f"http://{self.headers['Host']}{url.path}?per_page={per_page}&type=all"
+        links = [f'<{base}&page={page + 1}>; rel="next"'] if page < last else []
+        links.append(f'<{base}&page={last}>; rel="last"')
+        self.send(200, body, {"ETag": etag, "Link": ", ".join(links), "Content-Type": "application/json"})
+
+
+@pytest.fixture
+def github(serve, monkeypatch):
+    server, base = serve(GitHubStub)
+    monkeypatch.setattr(github_cloner, "GITHUB_API_URL", base)
+    return server
+
+
+def _pages(server):
+    return sorted(int(parse_qs(urlparse(path).query)["page"][0]) for path, _ in server.requests)
+
+
+def test_listing_follows_every_page(github):
+    listing = github_cloner._fetch_repo_listing("octocat", "")
+
+    assert [repo["name"] for repo in listing] == [repo["name"] for repo in REPOS]
+    assert _pages(github) == [1, 2, 3]
+    assert all(urlparse(path).path == "/users/octocat/repos" for path, _ in github.requests)
+
+
+def test_unchanged_listing_is_revalidated(github):
+    first = github_cloner._fetch_repo_listing("octocat", "")
+    github.requests.clear()
+
+    second = github_cloner._fetch_repo_listing("octocat", "")
+
+    assert second == first
+    assert _pages(github) == [1, 2, 3]
+    assert all(headers.get("If-None-Match") for _, headers in github.requests)
+
+
+def test_changed_page_is_downloaded_again(github, monkeypatch):
+    github_cloner._fetch_repo_listing("octocat", "")
+    renamed = [dict(repo) for repo in REPOS]
+    renamed[150]["name"] = "renamed"
+    monkeypatch.setattr(GitHubStub, "repos", renamed)
+
+    listing = github_cloner._fetch_repo_listing("octocat", "")
+
+    assert listing[150]["name"] == "renamed"
+    assert len(listing) == len(REPOS)
+
+
+def test_cache_is_keyed_by_token(github):
+    github_cloner._fetch_repo_listing("octocat", "")
+    github.requests.clear()
+
+    github_cloner._fetch_repo_listing("octocat", "secret")
+
+    assert all(urlparse(path).path == "/user/repos" for path, _ in github.requests)
+    assert all(headers.get("Authorization") == "token secret" for _, headers in github.requests)
+    assert not any(headers.get("If-None-Match") for _, headers in github.requests)
+
+
+def test_single_page_listing(github, monkeypatch):
+    monkeypatch.setattr(GitHubStub, "repos", REPOS[:3])
+
+    listing = github_cloner._fetch_repo_listing("octocat", "")
+
+    assert len(listing) == 3
+    assert _pages(github) == [1]
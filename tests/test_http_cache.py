@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+from FactotumCLI.tools._http_cache import HTTPCache
+
+FRESH = {"Cache-Control": "max-age=60"}
+
+
+@pytest.fixture
+def http_cache(tmp_path):
+    cache = HTTPCache(root=str(tmp_path / "http"), max_bytes=100)
+    yield cache
+    cache.close()
+
+
+def _body(tmp_path, name, size):
+    path = tmp_path / name
+    path.write_bytes(os.urandom(size))
+    return str(path)
+
+
+def _blobs(cache):
+    return [name for _, _, names in os.walk(cache.blob_dir) for name in names]
+
+
+def test_identical_bodies_share_a_blob(http_cache, tmp_path):
+    body = _body(tmp_path, "a", 40)
+
+    first = http_cache.store("http://h/a", body, FRESH)
+    second = http_cache.store("http://h/b", body, FRESH)
+
+    assert first == second
+    assert len(_blobs(http_cache)) == 1
+    assert http_cache.total_size() == 40
+
+
+def test_least_recently_used_entry_is_evicted(http_cache, tmp_path):
+    http_cache.store("http://h/old", _body(tmp_path, "old", 60), FRESH)
+    http_cache.store("http://h/new", _body(tmp_path, "new", 60), FRESH)
+
+    assert http_cache.lookup("http://h/old") is None
+    assert http_cache.lookup("http://h/new") is not None
+    assert len(_blobs(http_cache)) == 1
+
+
+def test_oversized_body_is_not_stored(http_cache, tmp_path):
+    kept = http_cache.store("http://h/small", _body(tmp_path, "small", 50), FRESH)
+
+    assert http_cache.store("http://h/huge", _body(tmp_path, "huge", 101), FRESH) is None
+
+    assert http_cache.lookup("http://h/huge") is None
+    assert http_cache.lookup("http://h/small")["digest"] == kept
+    assert _blobs(http_cache) == [kept]
+
+
+def test_no_store_response_drops_the_entry(http_cache, tmp_path):
+    http_cache.store("http://h/a", _body(tmp_path, "a", 10), FRESH)
+
+    assert http_cache.store("http://h/a", _body(tmp_path, "b", 10), {"Cache-Control": "no-store"}) is None
+
+    assert http_cache.lookup("http://h/a") is None
+    assert _blobs(http_cache) == []
@@ -0,0 +1,122 @@
+from collections import Counter
+from urllib.parse import unquote, urlparse
+
+import pytest
+
+from FactotumCLI.tools.downloader import mirror_webpage
+
+from conftest import StubHandler
+
+SITE = {
+    "/index.html": ("text/html", b"""<html><head>
+<link rel="stylesheet" href="style.css"><script src="/app.js"></script>
+</head><body>
+<img src="img/logo.png" srcset="img/logo.png 1x, img/logo2x.png 2x">
+<a href="page2.html">next</a> <a href="https://elsewhere.example/">elsewhere</a>
+</body></html>"""),
+    "/page2.html": ("text/html", b"""<html><head><link rel="stylesheet" href="style.css"></head>
+<body><img src="img/logo.png"><img src="img/only2.png"></body></html>"""),
+    "/style.css": ("text/css", b'@import "extra.css";\nbody { background: url("img/bg.png"); }'),
+    "/extra.css": ("text/css", b".logo { background: url(img/logo.png); }"),
+    "/app.js": ("application/javascript", b"console.log('hi');"),
+    "/img/logo.png": ("image/png", b"\x89PNG logo"),
+    "/img/logo2x.png": ("image/png", b"\x89PNG logo2x"),
+    "/img/bg.png": ("image/png", b"\x89PNG bg"),
+    "/img/only2.png": ("image/png", b"\x89PNG only2"),
+}
+
+# Pages and stylesheets that are not UTF-8, declared by <meta charset> or by Content-Type
+ENCODED = {
+    "/latin1.html": ("text/html", b"""<html><head><meta charset="iso-8859-1">
+<link rel="stylesheet" href="sjis.css"></head>
+<body><p>Caf\xe9 cr\xe8me</p><img src="img/\xe9t\xe9.png"></body></html>"""),
+    "/sjis.css": ("text/css; charset=shift_jis",
+                  "/* \u65e5\u672c\u8a9e */ body { background: url(/img/bg.png); }".encode("shift_jis")),
+    "/img/\u00e9t\u00e9.png": ("image/png", b"\x89PNG ete"),
+}
+
+
+class SiteStub(StubHandler):
+    def do_GET(self):
+        path = unquote(urlparse(self.path).path)
+        if path not in SITE and path not in ENCODED:
+            return self.send(404)
+        content_type, body = SITE.get(path) or ENCODED[path]
+        self.send(200, body, {"Content-Type": content_type})
+
+
+@pytest.fixture
+def site(serve):
+    return serve(SiteStub)
+
+
+def _fetched(server):
+    return Counter(urlparse(path).path for path, _ in server.requests)
+
+
+def _saved(output_dir, path):
+    (match,) = output_dir.glob(f"*{path}")
+    return match
+
+
+def test_page_assets_are_fetched_once_and_rewritten(site, tmp_path):
+    server, base = site
+
+    assert mirror_webpage(url=f"{base}/index.html", output_dir=str(tmp_path), depth=1) is None
+
+    assert _fetched(server) == Counter({path: 1 for path in SITE})
+    index = _saved(tmp_path, "/index.html").read_text()
+    assert 'href="style.css"' in index
+    assert 'src="app.js"' in index
+    assert 'srcset="img/logo.png 1x, img/logo2x.png 2x"' in index
+    assert 'href="https://elsewhere.example/"' in index
+    assert base not in index
+    assert _saved(tmp_path, "/img/only2.png").read_bytes() == SITE["/img/only2.png"][1]
+
+
+def test_depth_zero_stays_on_the_page(site, tmp_path):
+    server, base = site
+
+    mirror_webpage(url=f"{base}/index.html", output_dir=str(tmp_path), depth=0)
+
+    fetched = _fetched(server)
+    assert "/page2.html" not in fetched and "/img/only2.png" not in fetched
+    assert fetched["/img/bg.png"] == 1 and fetched["/extra.css"] == 1
+
+
+def test_batch_shares_assets_between_pages(site, tmp_path):
+    server, base = site
+    url_file = tmp_path / "urls.txt"
+    url_file.write_text(f"{base}/index.html\n{base}/page2.html\n")
+
+    mirror_webpage(url_file=str(url_file), output_dir=str(tmp_path / "mirror"))
+
+    assert max(_fetched(server).values()) == 1
+    assert _saved(tmp_path / "mirror", "/page2.html").read_text().count('href="style.css"') == 1
+
+
+def test_byte_budget_stops_fetching(site, tmp_path):
+    server, base = site
+
+    mirror_webpage(url=f"{base}/index.html", output_dir=str(tmp_path), depth=1, max_bytes=1)
+
+    assert list(_fetched(server)) == ["/index.html"]
+
+
+def test_non_utf8_documents_keep_their_bytes(site, tmp_path):
+    server, base = site
+
+    assert mirror_webpage(url=f"{base}/latin1.html", output_dir=str(tmp_path)) is None
+
+    page = _saved(tmp_path, "/latin1.html").read_bytes()
+    assert page == ENCODED["/latin1.html"][1].replace(b"img/\xe9t\xe9.png", b"img/%C3%A9t%C3%A9.png")
+    assert _saved(tmp_path, "/img/\u00e9t\u00e9.png").read_bytes() == b"\x89PNG ete"
+    stylesheet = _saved(tmp_path, "/sjis.css").read_bytes()
+    assert stylesheet == ENCODED["/sjis.css"][1].replace(b"url(/img/bg.png)", b"url(img/bg.png)")
+    assert _fetched(server)["/img/bg.png"] == 1
+
+
+def test_missing_page_is_a_failure(site, tmp_path):
+    server, base = site
+
+    assert mirror_webpage(url=f"{base}/missing.html", output_dir=str(tmp_path)) == 1
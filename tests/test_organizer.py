@@ -0,0 +1,97 @@
+import os
+import time
+
+from FactotumCLI.tools import _dedup, organizer
+from FactotumCLI.tools._organize_journal import journal_path
+
+
+def _make_files(root, names):
+    root.mkdir(exist_ok=True)
+    for name in names:
+        (root / name).write_text(name)
+
+
+def _age(*paths):
+    # Directories modified within the last couple of seconds are always relisted
+    past = time.time() - 60
+    for path in paths:
+        os.utime(path, (past, past))
+
+
+def _scanned(monkeypatch):
+    listed = []
+    real_scandir = os.scandir
+
+    def scandir(path="."):
+        listed.append(os.fspath(path))
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", scandir)
+    return listed
+
+
+def test_unchanged_rerun_does_not_list_the_root(tmp_path, monkeypatch):
+    root = tmp_path / "downloads"
+    _make_files(root, ["a.txt", "b.jpg", "c.txt"])
+    organizer.organize_files(str(root))
+    assert sorted(os.listdir(root)) == ["jpg", "txt"]
+
+    # Our own moves changed the root, so one more pass lists it and records its mtime
+    _age(root)
+    organizer.organize_files(str(root))
+    listed = _scanned(monkeypatch)
+
+    organizer.organize_files(str(root))
+
+    assert str(root) not in listed
+    assert not os.path.exists(root / ".factotum-organize.json")
+    assert os.path.exists(journal_path(str(root)))
+
+
+def test_new_file_is_picked_up_after_skip(tmp_path):
+    root = tmp_path / "downloads"
+    _make_files(root, ["a.txt"])
+    organizer.organize_files(str(root))
+    _age(root)
+    organizer.organize_files(str(root))
+
+    (root / "new.pdf").write_text("new")
+    organizer.organize_files(str(root))
+
+    assert (root / "pdf" / "new.pdf").exists()
+    assert (root / "txt" / "a.txt").exists()
+
+
+def test_legacy_journal_is_moved_to_the_cache(tmp_path):
+    root = tmp_path / "downloads"
+    _make_files(root, ["a.txt"])
+    organizer.organize_files(str(root))
+    legacy = root / ".factotum-organize.json"
+    os.replace(journal_path(str(root)), legacy)
+
+    assert organizer.organize_files(str(root), undo=True) is None
+
+    assert (root / "a.txt").exists()
+    assert not legacy.exists()
+
+
+def _quarantine_duplicates(root):
+    groups = _dedup.find_duplicates(_dedup.scan_files(str(root)), jobs=1)
+    return _dedup.apply_action(str(root), groups, "quarantine")
+
+
+def test_quarantine_never_replaces_earlier_copies(tmp_path):
+    root = tmp_path / "downloads"
+    quarantine = root / _dedup.QUARANTINE_DIR
+    _make_files(root, [])
+    for content in ("first", "second"):
+        (root / "keep.txt").write_text(content)
+        (root / "copy.txt").write_text(content)
+        # The older file is the one kept
+        _age(root / "keep.txt")
+        assert _quarantine_duplicates(root) == []
+
+    assert (quarantine / "copy.txt").read_text() == "first"
+    assert (quarantine / "copy (1).txt").read_text() == "second"
+    assert sorted(os.listdir(root)) == [_dedup.QUARANTINE_DIR, "keep.txt"]
+